@@ -2,6 +2,10 @@
 
 import os
 import sys
+import time
+
+# Start of the program, from which startup timings are measured.
+start = time.perf_counter()
 
 # Needed for compatibility with pyinstaller.
 if getattr(sys, 'frozen', False):
@@ -16,33 +20,51 @@ import pyglet
 pyglet.options.shadow_window = False
 
 
-# ----------------------------
-# Debug
-# ---------------------------
-
-import cProfile
+import argparse
 
-pr = cProfile.Profile()
-pr.enable()
-# ---------------------------
+from src.profiling import (PROFILE_MODES,
+                           StartupTimings,
+                           create_profiler)
+from src.constants import (PROFILE_MODE_ENV_VAR,
+                           PROFILE_OUTPUT_ENV_VAR,
+                           REPLAYS_DIRECTORY,
+                           REPLAYS_ENV_VAR,
+                           STARTUP_TARGET_MS)
 
+startup_timings = StartupTimings(start)
+startup_timings.step('imports')
 
-from src.window import Window
-from src.constants import GAME_TENTATIVE_UPDATES_INTERVAL
+parser = argparse.ArgumentParser(description = "Pac-Man game.")
+parser.add_argument('--profile', choices = PROFILE_MODES, default = os.environ.get(PROFILE_MODE_ENV_VAR, 'off'),
+                    help = f"profile the game with cProfile or with low-overhead timers of each subsystem (default: ${PROFILE_MODE_ENV_VAR} or off)")
+parser.add_argument('--profile-output', default = os.environ.get(PROFILE_OUTPUT_ENV_VAR),
+                    help = f"path of the profiling results (default: ${PROFILE_OUTPUT_ENV_VAR} or a file named after the date in the working directory)")
+parser.add_argument('--record-replays', action = 'store_true', default = os.environ.get(REPLAYS_ENV_VAR, '0') != '0',
+                    help = f"record a replay of every game played in {REPLAYS_DIRECTORY} (default: ${REPLAYS_ENV_VAR} set to 1, otherwise off)")
+parser.add_argument('--startup-report', action = 'store_true',
+                    help = f"print the time taken by each step of startup when the game is closed (target: {STARTUP_TARGET_MS} ms)")
+parser.add_argument('--startup-trace',
+                    help = "path of a trace of startup, including the work done in background threads, to open with chrome://tracing or Perfetto")
+args = parser.parse_args()
 
-window = Window()
-
-pyglet.app.run(interval = GAME_TENTATIVE_UPDATES_INTERVAL)
+profiler = create_profiler(args.profile, args.profile_output)
+profiler.start()
 
 
+from src.window import Window
+from src.constants import GAME_TENTATIVE_UPDATES_INTERVAL
 
-# ----------------------------
-# Debug
-# ---------------------------
-pr.disable()
+startup_timings.step('game modules')
 
-from datetime import datetime
-dt = datetime.now().strftime("%Y-%m-%d %Hh%Mm%S")
-pr.dump_stats(f'./Profiler Results {dt}.prof')
+window = Window(startup_timings, record_replays = args.record_replays)
 
-# ---------------------------
\ No newline at end of file
+try:
+    pyglet.app.run(interval = GAME_TENTATIVE_UPDATES_INTERVAL)
+finally:
+    summary = profiler.stop()
+    if summary is not None:
+        print(summary)
+    if args.startup_report:
+        print(startup_timings.summary())
+    if args.startup_trace is not None:
+        startup_timings.dump_trace(args.startup_trace)
@@ -1,11 +1,17 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import os
+
+# The whole assets directory is shipped (sources, and asset pack if built), except the tables cached there by tools (see
+# MAZE_DISTANCES_CACHE_DIR_PATH in src/constants.py), which the game does not use.
+assets = [(path, path if os.path.isdir(path) else 'assets') for path in (os.path.join('assets', name) for name in sorted(os.listdir('assets'))
+                                                                         if name != 'cache')]
 
 a = Analysis(
     ['pacman.py'],
     pathex=['.'],
     binaries=[],
-    datas=[('assets', 'assets'), ('src/graphics/shaders', 'src/graphics/shaders')],
+    datas=[*assets, ('src/graphics/shaders', 'src/graphics/shaders')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
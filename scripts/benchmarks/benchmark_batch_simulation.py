@@ -0,0 +1,80 @@
+"""
+This script measures how many game ticks per second the vectorised BatchSimulation engine can run, summed over all its games,
+and compares it with the scalar Simulation engine using the same fixed-point movement core.
+
+Pac-Man is driven by random direction requests in every game, and a game is restarted every time it ends.
+No window is created and pyglet is never imported. NumPy is needed to run this script.
+
+Usage:
+1)   Edit the N_GAMES, N_TICKS, DIRECTION_CHANGE_PROBABILITY and SEED variables in this script.
+
+2)   Run the script:
+          python ./benchmark_batch_simulation.py
+"""
+
+
+
+
+import os
+import sys
+import random
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.engine.simulation import Simulation
+from src.engine.batch_simulation import BatchSimulation
+from src.constants import GAME_ORIGINAL_FPS
+
+
+# Numbers of games simulated in parallel by BatchSimulation.
+N_GAMES = (1, 100, 1000, 10000)
+
+# Number of ticks to simulate for each number of games, and for the scalar Simulation.
+N_TICKS = 2000
+
+# Probability, at every tick, of requesting a new random direction for Pac-Man in each game.
+DIRECTION_CHANGE_PROBABILITY = 0.05
+
+# Seed of the random generators used for inputs and for the fruit timers.
+SEED = 0
+
+
+
+
+def run_scalar():
+    rng = random.Random(SEED)
+
+    simulation = Simulation(persistent_high_score = False, fixed_point_movement = True, seed = SEED)
+
+    start = time.perf_counter()
+    for _ in range(N_TICKS):
+        if rng.random() < DIRECTION_CHANGE_PROBABILITY:
+            simulation.set_direction(rng.choice(BatchSimulation.DIRECTIONS))
+
+        if simulation.step() is not False:
+            simulation = Simulation(persistent_high_score = False, fixed_point_movement = True, seed = SEED)
+    return time.perf_counter() - start
+
+
+def run_batch(n_games):
+    rng = np.random.default_rng(SEED)
+    batch = BatchSimulation(n_games, seeds = range(SEED, SEED + n_games))
+
+    start = time.perf_counter()
+    for _ in range(N_TICKS):
+        requested = rng.random(n_games) < DIRECTION_CHANGE_PROBABILITY
+        batch.set_directions(np.where(requested, rng.integers(len(BatchSimulation.DIRECTIONS), size = n_games), -1))
+
+        batch.reset(np.flatnonzero(batch.step() == -1))
+    return time.perf_counter() - start
+
+
+elapsed = run_scalar()
+print(f"Simulation:               {N_TICKS / elapsed:9.0f} game ticks per second ({N_TICKS / elapsed / GAME_ORIGINAL_FPS:7.1f}x real time).")
+
+for n_games in N_GAMES:
+    elapsed = run_batch(n_games)
+    print(f"BatchSimulation({n_games:5d}): {N_TICKS * n_games / elapsed:9.0f} game ticks per second ({N_TICKS * n_games / elapsed / GAME_ORIGINAL_FPS:7.1f}x real time).")
@@ -0,0 +1,158 @@
+"""
+This script measures the average cost per tick of updating the ghosts (GhostsCoordinator.update),
+as well as the part of it spent by ghosts deciding where to turn (GhostAbstract._calculate_direction_at_tile_center)
+and the part spent switching between scatter, chase and frightened modes (GhostsCoordinator._update_movement_mode).
+
+Pac-Man is driven by random direction requests, and a new game is started every time the previous one ends.
+The same games are played with the decisions looked up in the tables of src/game_objects/tile_graph.py, and with a reference
+implementation of the decisions querying the maze for every candidate direction, as done before these tables. Both are played
+in turn N_ROUNDS times, and the timings of the fastest round of each are printed, so that they do not depend on which one runs first.
+The script exits with an error if both do not take the same decisions.
+
+Usage:
+1)   Edit the N_TICKS, N_ROUNDS, DIRECTION_CHANGE_PROBABILITY and SEED variables in this script.
+
+2)   Run the script:
+          python ./benchmark_ghosts.py
+"""
+
+
+
+
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.engine.simulation import Simulation
+from src.game_objects.ghosts.ghost_coordinator import GhostsCoordinator
+from src.game_objects.ghosts.ghost_abstract import GhostAbstract
+from src.directions import Vector2
+from src.constants import (GhostBehaviour,
+                           GHOSTS_FORBIDDEN_TURNING_UP_TILES)
+
+
+# Total number of ticks to simulate.
+N_TICKS = 30000
+
+# Number of times the games are played with each implementation.
+N_ROUNDS = 3
+
+# Probability, at every tick, of requesting a new random direction for Pac-Man.
+DIRECTION_CHANGE_PROBABILITY = 0.05
+
+# Seed of the random generators used for inputs and for the fruit timer.
+SEED = 0
+
+
+
+
+def _calculate_direction_at_tile_center_reference(self, maze, pacman, direction_from_current_tile):
+    # GhostAbstract._calculate_direction_at_tile_center as it was before tile_graph, checking every candidate direction against the maze.
+    target_tile = self._calculate_target_tile(pacman, maze)
+
+    current_tile = maze.get_tile_center(self._position)
+    next_tile = current_tile + direction_from_current_tile
+
+    min_distance   = float('inf')
+    best_direction = None
+    for direction in (Vector2.UP, Vector2.LEFT, Vector2.DOWN, Vector2.RIGHT):
+        if direction == -direction_from_current_tile:
+            continue
+
+        if next_tile in GHOSTS_FORBIDDEN_TURNING_UP_TILES and direction == Vector2.UP and GhostBehaviour.GOING_TO_HOUSE not in self._behaviour:
+            continue
+
+        next_next_tile = next_tile + direction
+
+        if maze.tile_is_not_walkable(next_next_tile):
+            continue
+
+        distance = Vector2.distance_squared(target_tile, next_next_tile)
+
+        if distance < min_distance:
+            min_distance = distance
+            best_direction = direction
+
+    return best_direction
+
+
+implementations = {'tile graph': GhostAbstract._calculate_direction_at_tile_center,
+                   'reference' : _calculate_direction_at_tile_center_reference}
+
+
+# Wrap methods to accumulate the time spent in them and the number of calls.
+timings = {}
+update = GhostsCoordinator.update
+update_movement_mode = GhostsCoordinator._update_movement_mode
+
+def _timed(cls, name, method):
+    timings[name] = [0, 0]
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        retval = method(*args, **kwargs)
+        timings[name][0] += time.perf_counter() - start
+        timings[name][1] += 1
+        return retval
+
+    setattr(cls, name, wrapper)
+
+
+directions = (Vector2.UP, Vector2.DOWN, Vector2.LEFT, Vector2.RIGHT)
+
+def run(implementation):
+    # Plays N_TICKS ticks deciding with implementation. Returns the time elapsed and the directions decided, in order.
+    decisions = []
+
+    def decide(*args, **kwargs):
+        direction = implementation(*args, **kwargs)
+        decisions.append(direction)
+        return direction
+
+    _timed(GhostsCoordinator, 'update', update)
+    _timed(GhostsCoordinator, '_update_movement_mode', update_movement_mode)
+    _timed(GhostAbstract, '_calculate_direction_at_tile_center', decide)
+
+    rng = random.Random(SEED)
+    simulation = Simulation(persistent_high_score = False, seed = SEED)
+
+    start = time.perf_counter()
+    for _ in range(N_TICKS):
+        if rng.random() < DIRECTION_CHANGE_PROBABILITY:
+            simulation.set_direction(rng.choice(directions))
+
+        if simulation.step() is not False:
+            simulation = Simulation(persistent_high_score = False, seed = SEED)
+
+    return time.perf_counter() - start, decisions
+
+
+# Time elapsed and timings of the fastest round of each implementation.
+fastest = {}
+all_decisions = []
+for _ in range(N_ROUNDS):
+    for name, implementation in implementations.items():
+        elapsed, decisions = run(implementation)
+        all_decisions.append(decisions)
+
+        if name not in fastest or elapsed < fastest[name][0]:
+            fastest[name] = (elapsed, dict(timings))
+
+for name, (elapsed, round_timings) in fastest.items():
+    ghosts_time, ghosts_calls = round_timings['update']
+    decisions_time, decisions_calls = round_timings['_calculate_direction_at_tile_center']
+    modes_time, modes_calls = round_timings['_update_movement_mode']
+
+    print(f"With {name} decisions:")
+    print(f"    Ghosts updated on {ghosts_calls} of {N_TICKS} ticks: {ghosts_time / ghosts_calls * 1e6:.1f} us per update, "
+          f"{ghosts_time / elapsed * 100:.0f}% of the total simulation time.")
+    print(f"    Ghost decisions: {decisions_calls} in total, {decisions_time / decisions_calls * 1e6:.2f} us per decision, "
+          f"{decisions_time / ghosts_calls * 1e6:.1f} us per update.")
+    print(f"    Mode updates: {modes_calls} in total, {modes_time / modes_calls * 1e6:.2f} us per update "
+          f"({modes_time / ghosts_time * 100:.1f}% of the ghosts update time).")
+
+if any(decisions != all_decisions[0] for decisions in all_decisions[1:]):
+    sys.exit("Decisions differ between implementations.")
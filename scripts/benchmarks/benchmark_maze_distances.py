@@ -0,0 +1,99 @@
+"""
+This script measures the cost of the shortest path tables of the maze (see src/game_objects/maze_distances.py): the time taken to compute
+them, to load them once cached on disk, and to look up a distance and a next step, compared to a breadth-first search run for each query.
+
+Queries are made between random walkable tiles, as characters moving around the maze would.
+
+Usage:
+1)   Edit the N_QUERIES, COLLIDE_WITH_DOOR and SEED variables in this script.
+
+2)   Run the script:
+          python ./benchmark_maze_distances.py
+"""
+
+
+
+
+import os
+import sys
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.game_objects import maze_distances as distances_module
+from src.game_objects.maze import Maze
+from src.constants import WARP_TUNNEL_TELEPORT_MARGIN
+
+
+# Number of pairs of tiles looked up.
+N_QUERIES = 100000
+
+# Whether the door of the ghost house can't be walked through (as for Pac-Man), or can (as for ghosts going to and out of the house).
+COLLIDE_WITH_DOOR = True
+
+# Seed of the random generator choosing the pairs of tiles.
+SEED = 0
+
+
+
+
+walkable = distances_module._walkable_grid(COLLIDE_WITH_DOOR)
+
+start = time.perf_counter()
+distances_module._compute_tables(walkable)
+compute_time = time.perf_counter() - start
+
+# First call loads the tables from the cache, or computes and saves them if not cached yet: the second one always loads them.
+distances_module.maze_distances(COLLIDE_WITH_DOOR)
+distances_module.maze_distances.cache_clear()
+start = time.perf_counter()
+maze_distances = distances_module.maze_distances(COLLIDE_WITH_DOOR)
+load_time = time.perf_counter() - start
+
+print(f"Tables of {maze_distances.distances.shape[0]} tiles ({maze_distances.distances.nbytes + maze_distances.next_steps.nbytes} bytes): "
+      f"computed in {compute_time * 1e3:.1f} ms, loaded from the cache in {load_time * 1e3:.1f} ms.")
+
+
+rng = random.Random(SEED)
+tiles = [(row, col - WARP_TUNNEL_TELEPORT_MARGIN) for row, col in np.argwhere(walkable).tolist()]
+queries = [(rng.choice(tiles), rng.choice(tiles)) for _ in range(N_QUERIES)]
+
+start = time.perf_counter()
+for tile_start, tile_end in queries:
+    maze_distances.distance(tile_start, tile_end)
+    maze_distances.next_step(tile_start, tile_end)
+lookup_time = time.perf_counter() - start
+
+
+# Search from the starting tile until reaching the end one, through the same tiles as the tables.
+maze = Maze()
+grid_cols = walkable.shape[1]
+
+def search_distance(tile_start, tile_end):
+    visited = {tile_start}
+    queue = deque(((tile_start, 0),))
+    while queue:
+        (row, col), distance = queue.popleft()
+        if (row, col) == tile_end:
+            return distance
+
+        for d_row, d_col in ((-1, 0), (0, -1), (1, 0), (0, 1)):
+            neighbour = (row + d_row, (col + d_col + WARP_TUNNEL_TELEPORT_MARGIN) % grid_cols - WARP_TUNNEL_TELEPORT_MARGIN)
+            if neighbour not in visited and not maze.tile_is_not_walkable(neighbour, COLLIDE_WITH_DOOR):
+                visited.add(neighbour)
+                queue.append((neighbour, distance + 1))
+
+    return None
+
+n_searches = N_QUERIES // 100
+start = time.perf_counter()
+for tile_start, tile_end in queries[:n_searches]:
+    search_distance(tile_start, tile_end)
+search_time = (time.perf_counter() - start) / n_searches * N_QUERIES
+
+print(f"{N_QUERIES} queries of a distance and a next step: {lookup_time / N_QUERIES * 1e6:.2f} us per query with the tables, "
+      f"{search_time / N_QUERIES * 1e6:.1f} us per distance with a breadth-first search ({search_time / lookup_time:.0f}x).")
@@ -0,0 +1,87 @@
+"""
+This script compares the floating point and the integer fixed-point movement cores of Pac-Man and ghosts.
+For each of them, it measures the average cost of moving a character by one tile center or edge
+(Character._update_position_within_tile and Character._update_position_within_tile_fixed respectively)
+and how many game ticks per second the headless Simulation engine can run.
+
+Pac-Man is driven by the same random direction requests for both cores, and a new game is started every time the previous one ends.
+Note that the two cores don't produce the same games, as the fixed-point one enters tiles towards the left or the top
+one unit later, like the arcade did.
+
+Usage:
+1)   Edit the N_TICKS, DIRECTION_CHANGE_PROBABILITY and SEED variables in this script.
+
+2)   Run the script:
+          python ./benchmark_movement.py
+"""
+
+
+
+
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.engine.simulation import Simulation
+from src.game_objects.character import Character
+from src.directions import Vector2
+
+
+# Total number of ticks to simulate for each movement core.
+N_TICKS = 30000
+
+# Probability, at every tick, of requesting a new random direction for Pac-Man.
+DIRECTION_CHANGE_PROBABILITY = 0.05
+
+# Seed of the random generators used for inputs and for the fruit timer.
+SEED = 0
+
+
+
+
+# Wrap methods to accumulate the time spent in them and the number of calls.
+timings = {}
+
+def _timed(cls, name):
+    method = getattr(cls, name)
+    timings[name] = [0, 0]
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        retval = method(*args, **kwargs)
+        timings[name][0] += time.perf_counter() - start
+        timings[name][1] += 1
+        return retval
+
+    setattr(cls, name, wrapper)
+
+_timed(Character, '_update_position_within_tile')
+_timed(Character, '_update_position_within_tile_fixed')
+
+
+def run(fixed_point_movement):
+    rng = random.Random(SEED)
+    directions = (Vector2.UP, Vector2.DOWN, Vector2.LEFT, Vector2.RIGHT)
+
+    simulation = Simulation(persistent_high_score = False, fixed_point_movement = fixed_point_movement, seed = SEED)
+
+    start = time.perf_counter()
+    for _ in range(N_TICKS):
+        if rng.random() < DIRECTION_CHANGE_PROBABILITY:
+            simulation.set_direction(rng.choice(directions))
+
+        if simulation.step() is not False:
+            simulation = Simulation(persistent_high_score = False, fixed_point_movement = fixed_point_movement, seed = SEED)
+    return time.perf_counter() - start
+
+
+for fixed_point_movement, name, method_name in ((False, 'Floating point', '_update_position_within_tile'),
+                                                (True,  'Fixed-point   ', '_update_position_within_tile_fixed')):
+    elapsed = run(fixed_point_movement)
+    moves_time, moves_calls = timings[method_name]
+
+    print(f"{name}: {moves_calls} moves, {moves_time / moves_calls * 1e6:.2f} us per move, "
+          f"{moves_time / elapsed * 100:.0f}% of the total simulation time, {N_TICKS / elapsed:.0f} ticks per second.")
@@ -0,0 +1,85 @@
+"""
+This script measures how many quads per second the Painter can render, separately for adding quads (building vertex data on the CPU)
+and for drawing them (uploading vertex data and issuing the draw call).
+
+Each frame, QUADS_PER_FRAME quads scattered over the maze with random texture regions of the atlas are added and then drawn, into a
+hidden window. glFinish is called after every draw, so that the time the GPU takes to draw is included.
+Set HEADLESS to True to run without a display (e.g. on a server), if pyglet and the GPU drivers support it.
+
+Usage:
+1)   Edit the N_FRAMES, QUADS_PER_FRAME, HEADLESS and SEED variables in this script.
+
+2)   Run the script:
+          python ./benchmark_painter.py
+"""
+
+
+
+
+import os
+import sys
+import random
+import time
+
+import pyglet
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+# Number of frames to draw.
+N_FRAMES = 2000
+
+# Number of quads added and drawn in each frame. A frame of the game draws between about 250 and 350 quads.
+QUADS_PER_FRAME = 300
+
+# Whether to create the OpenGL context without any display.
+HEADLESS = False
+
+# Seed of the random generator used for the quads.
+SEED = 0
+
+
+
+
+pyglet.options['headless'] = HEADLESS
+pyglet.options.shadow_window = False
+
+window = pyglet.window.Window(224, 288, visible = False)
+
+from src.graphics import utils
+from src.graphics.painter import Painter
+from src.constants import (SHADERS_MAX_QUADS,
+                           LAYOUT_N_ROWS_TILES,
+                           LAYOUT_N_COLS_TILES)
+
+if QUADS_PER_FRAME > SHADERS_MAX_QUADS:
+    sys.exit(f"QUADS_PER_FRAME must not exceed SHADERS_MAX_QUADS ({SHADERS_MAX_QUADS}).")
+
+utils.enable_transparency_blit()
+utils.enable_depth_testing()
+painter = Painter()
+
+rng = random.Random(SEED)
+quads = [(rng.uniform(0, LAYOUT_N_COLS_TILES), rng.uniform(0, LAYOUT_N_ROWS_TILES), 8 * rng.randrange(32), 8 * rng.randrange(32), 16, 16,
+          rng.uniform(-1, 1)) for _ in range(QUADS_PER_FRAME)]
+
+add_time = draw_time = 0
+for _ in range(N_FRAMES):
+    start = time.perf_counter()
+    for quad in quads:
+        painter.add_quad(*quad)
+    added = time.perf_counter()
+
+    pyglet.gl.glClear(pyglet.gl.GL_COLOR_BUFFER_BIT | pyglet.gl.GL_DEPTH_BUFFER_BIT)
+    painter.draw()
+    pyglet.gl.glFinish()
+    drawn = time.perf_counter()
+
+    add_time  += added - start
+    draw_time += drawn - added
+
+n_quads = N_FRAMES * QUADS_PER_FRAME
+print(f"Rendered {N_FRAMES} frames of {QUADS_PER_FRAME} quads in {add_time + draw_time:.2f} s: {n_quads / (add_time + draw_time):.0f} quads per second, "
+      f"{N_FRAMES / (add_time + draw_time):.0f} frames per second.")
+print(f"    Adding quads:  {add_time:.2f} s, {n_quads / add_time:.0f} quads per second.")
+print(f"    Drawing quads: {draw_time:.2f} s, {n_quads / draw_time:.0f} quads per second.")
@@ -0,0 +1,58 @@
+"""
+This script measures how many game ticks per second the headless Simulation engine can run.
+
+Pac-Man is driven by random direction requests, and a new game is started every time the previous one ends.
+No window is created and pyglet is never imported.
+
+Usage:
+1)   Edit the N_TICKS, DIRECTION_CHANGE_PROBABILITY and SEED variables in this script.
+
+2)   Run the script:
+          python ./benchmark_simulation.py
+"""
+
+
+
+
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.engine.simulation import Simulation
+from src.directions import Vector2
+from src.constants import GAME_ORIGINAL_FPS
+
+
+# Total number of ticks to simulate.
+N_TICKS = 50000
+
+# Probability, at every tick, of requesting a new random direction for Pac-Man.
+DIRECTION_CHANGE_PROBABILITY = 0.05
+
+# Seed of the random generators used for inputs and for the fruit timer.
+SEED = 0
+
+
+
+
+rng = random.Random(SEED)
+directions = (Vector2.UP, Vector2.DOWN, Vector2.LEFT, Vector2.RIGHT)
+
+simulation = Simulation(persistent_high_score = False, seed = SEED)
+n_games = 1
+
+start = time.perf_counter()
+for _ in range(N_TICKS):
+    if rng.random() < DIRECTION_CHANGE_PROBABILITY:
+        simulation.set_direction(rng.choice(directions))
+
+    if simulation.step() is not False:
+        simulation = Simulation(persistent_high_score = False, seed = SEED)
+        n_games += 1
+elapsed = time.perf_counter() - start
+
+print(f"Simulated {N_TICKS} ticks over {n_games} games in {elapsed:.2f} s: {N_TICKS / elapsed:.0f} ticks per second "
+      f"({N_TICKS / elapsed / GAME_ORIGINAL_FPS:.1f}x real time).")
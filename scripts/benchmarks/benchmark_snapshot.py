@@ -0,0 +1,98 @@
+"""
+This script compares the cost of branching a game with Simulation.snapshot and Simulation.restore
+against branching it with copy.deepcopy, as the comparison scripts used to do.
+
+The game is first advanced to the middle of a level, so that all ghosts are out of the house.
+The snapshot taken there is then checked to be complete: once restored into a game started with another seed, both games are advanced
+with the same random direction requests until at least one fruit appears after the snapshot, and must remain identical throughout.
+
+Usage:
+1)   Edit the N_REPETITIONS, WARMUP_TICKS, MAX_CHECK_TICKS, DIRECTION_CHANGE_PROBABILITY and SEED variables in this script.
+
+2)   Run the script:
+          python ./benchmark_snapshot.py
+"""
+
+
+
+
+import os
+import sys
+import copy
+import pickle
+import random
+import timeit
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.engine.simulation import Simulation
+from src.directions import Vector2
+
+
+# Number of times each operation is timed.
+N_REPETITIONS = 2000
+
+# Number of ticks to run before taking measurements.
+WARMUP_TICKS = 1500
+
+# Maximum number of ticks the games are compared for after the snapshot, stopping earlier once a fruit appeared and disappeared.
+MAX_CHECK_TICKS = 20000
+
+# Probability, at every tick, of requesting a new random direction for Pac-Man.
+DIRECTION_CHANGE_PROBABILITY = 0.05
+
+# Seed of the random generators used for inputs and for the fruit timer.
+SEED = 0
+
+
+
+rng = random.Random(SEED)
+directions = (Vector2.UP, Vector2.DOWN, Vector2.LEFT, Vector2.RIGHT)
+
+def step(simulations):
+    # Advances all simulations by a tick with the same direction request. Returns True once any of their games is over.
+    if rng.random() < DIRECTION_CHANGE_PROBABILITY:
+        direction = rng.choice(directions)
+        for simulation in simulations:
+            simulation.set_direction(direction)
+
+    return any([simulation.step() is not False for simulation in simulations])
+
+
+simulation = Simulation(persistent_high_score = False, seed = SEED)
+for _ in range(WARMUP_TICKS):
+    step((simulation,))
+
+state = simulation.snapshot()
+other = Simulation(persistent_high_score = False, seed = SEED + 1)
+
+timings = {'copy.deepcopy'                    : lambda: copy.deepcopy(simulation),
+           'Simulation.snapshot'              : lambda: simulation.snapshot(),
+           'Simulation.restore'               : lambda: other.restore(state),
+           'Simulation.snapshot + restore'    : lambda: other.restore(simulation.snapshot())}
+
+reference = None
+for name, function in timings.items():
+    elapsed = min(timeit.repeat(function, number = N_REPETITIONS, repeat = 3)) / N_REPETITIONS
+    reference = reference or elapsed
+    print(f"{name:<32}: {elapsed * 1e6:8.1f} us   ({reference / elapsed:6.1f}x faster than copy.deepcopy)")
+
+print(f"Pickled size of a snapshot: {len(pickle.dumps(state))} bytes, of a deepcopy: {len(pickle.dumps(simulation))} bytes.")
+
+
+# Branch the game into another one, and check that both go on identically until a fruit appeared and disappeared.
+branch = Simulation(persistent_high_score = False, seed = SEED + 1)
+branch.restore(state)
+fruit_seen = False
+for tick in range(MAX_CHECK_TICKS):
+    game_over = step((simulation, branch))
+    if simulation.snapshot() != branch.snapshot():
+        sys.exit(f"Restored game diverged from the original {tick + 1} ticks after the snapshot.")
+
+    fruit_seen = fruit_seen or simulation.snapshot().fruit_visible_counter > 0
+    if game_over or (fruit_seen and simulation.snapshot().fruit_visible_counter == 0):
+        break
+
+if not fruit_seen:
+    sys.exit(f"No fruit appeared within {tick + 1} ticks after the snapshot: edit WARMUP_TICKS, MAX_CHECK_TICKS or SEED.")
+print(f"Restored game identical to the original over {tick + 1} ticks after the snapshot, through the appearance of a fruit.")
@@ -0,0 +1,142 @@
+"""
+This script measures the time the sprites take to build the vertex data of each frame of the game, that is to look up the texture region
+of each quad drawn and add it to the Painter, separately from the time the Painter takes to upload and draw them.
+
+A game is played with random direction requests (and a new one started every time the previous one ends) into a hidden window,
+drawing every tick. The texture regions of the sprites are looked up in the tables of src/constants.py: the time looking them up through
+the functions computing them would take instead is measured as well, over the same number of lookups.
+Set HEADLESS to True to run without a display (e.g. on a server), if pyglet and the GPU drivers support it.
+
+Usage:
+1)   Edit the N_FRAMES, DIRECTION_CHANGE_PROBABILITY, HEADLESS and SEED variables in this script.
+
+2)   Run the script:
+          python ./benchmark_sprite_vertices.py
+"""
+
+
+
+
+import os
+import sys
+import random
+import time
+
+import pyglet
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+# Number of frames to draw.
+N_FRAMES = 10000
+
+# Probability, at every tick, of requesting a new random direction for Pac-Man.
+DIRECTION_CHANGE_PROBABILITY = 0.05
+
+# Whether to create the OpenGL context without any display.
+HEADLESS = False
+
+# Seed of the random generators used for inputs and for the fruit timer.
+SEED = 0
+
+
+
+
+pyglet.options['headless'] = HEADLESS
+pyglet.options.shadow_window = False
+
+window = pyglet.window.Window(224, 288, visible = False)
+
+from src.activities.game import Game
+from src.audio_events import AudioEventBus
+from src.graphics import Graphics
+from src.graphics.painter import Painter
+from src.directions import Vector2
+from src.constants import (Ghost,
+                           GhostAppearances,
+                           FontColors,
+                           SPRITE_DIRECTION_INDEX,
+                           GHOST_SPRITE_TEX_INDEX,
+                           GHOST_SPRITE_TEX_REGIONS,
+                           GHOST_SPRITE_TEX_REGION,
+                           PACMAN_MOVING_SPRITE_TEX_REGIONS,
+                           PACMAN_SPRITE_TEX_REGION,
+                           TEXT_SPRITE_TEX_REGIONS,
+                           TEXT_SPRITE_TEX_REGION)
+
+
+class TimedPainter(Painter):
+    """Class TimedPainter. Painter counting the quads added, and the time taken to upload and draw them."""
+
+    def __init__(self):
+        super().__init__()
+        self.n_quads = 0
+        self.draw_time = 0
+
+
+    def draw(self):
+        self.n_quads += self._n_quads
+        start = time.perf_counter()
+        super().draw()
+        self.draw_time += time.perf_counter() - start
+
+
+
+
+rng = random.Random(SEED)
+directions = (Vector2.UP, Vector2.DOWN, Vector2.LEFT, Vector2.RIGHT)
+
+painter = TimedPainter()
+graphics = Graphics(painter)
+new_game = lambda: Game(graphics, AudioEventBus(), persistent_high_score = False, seed = SEED)
+game = new_game()
+
+frame_time = 0
+for _ in range(N_FRAMES):
+    if rng.random() < DIRECTION_CHANGE_PROBABILITY:
+        game._simulation.set_direction(rng.choice(directions))
+
+    if game.event_update_state() is not False:
+        game = new_game()
+
+    start = time.perf_counter()
+    game.event_draw_screen()
+    frame_time += time.perf_counter() - start
+
+vertex_time = frame_time - painter.draw_time
+print(f"Drew {N_FRAMES} frames of {painter.n_quads / N_FRAMES:.0f} quads on average in {frame_time:.2f} s.")
+print(f"    Building vertex data: {vertex_time:.2f} s, {vertex_time / N_FRAMES * 1e6:.1f} us per frame, {painter.n_quads / vertex_time:.0f} quads per second.")
+print(f"    Uploading and drawing: {painter.draw_time:.2f} s, {painter.draw_time / N_FRAMES * 1e6:.1f} us per frame.")
+
+
+# Lookups of texture regions, as the sprites do them each frame, through the tables and through the functions.
+lookups = {'ghosts': [(name, appearance, direction, frame_idx) for name in Ghost for appearance in GhostAppearances
+                      for direction in directions for frame_idx in range(2)],
+           'pacman': [(direction, frame_idx) for direction in directions for frame_idx in range(1, 4)],
+           'text':   [(char, color) for color in FontColors for char in 'HIGH SCORE 1UP 0123456789']}
+
+tables = {'ghosts': lambda name, appearance, direction, frame_idx: GHOST_SPRITE_TEX_REGIONS[GHOST_SPRITE_TEX_INDEX(name, appearance, SPRITE_DIRECTION_INDEX(direction), frame_idx)],
+          'pacman': lambda direction, frame_idx: PACMAN_MOVING_SPRITE_TEX_REGIONS[4 * SPRITE_DIRECTION_INDEX(direction) + frame_idx],
+          'text':   lambda char, color: TEXT_SPRITE_TEX_REGIONS[color][char]}
+
+functions = {'ghosts': lambda name, appearance, direction, frame_idx: GHOST_SPRITE_TEX_REGION(name,
+                                                                                             appearance == GhostAppearances.FRIGHTENED_BLUE,
+                                                                                             appearance == GhostAppearances.FRIGHTENED_WHITE,
+                                                                                             appearance == GhostAppearances.TRANSPARENT,
+                                                                                             direction,
+                                                                                             frame_idx),
+             'pacman': lambda direction, frame_idx: PACMAN_SPRITE_TEX_REGION(direction, False, False, frame_idx),
+             'text':   lambda char, color: TEXT_SPRITE_TEX_REGION(char, color)}
+
+print(f"Texture region lookups, over {painter.n_quads} lookups each:")
+for name, arguments in lookups.items():
+    n_repeats = -(-painter.n_quads // len(arguments))
+    timings = []
+    for lookup in (tables[name], functions[name]):
+        start = time.perf_counter()
+        for _ in range(n_repeats):
+            for args in arguments:
+                lookup(*args)
+        timings.append((time.perf_counter() - start) / (n_repeats * len(arguments)) * painter.n_quads)
+
+    print(f"    {name:<7} tables: {timings[0]:.3f} s, functions: {timings[1]:.3f} s ({timings[1] / timings[0]:.1f}x).")
@@ -0,0 +1,114 @@
+"""
+This script measures the startup time of the game, from the start of a new Python process to the first frame drawn, with and without
+the asset pack built by scripts/build_asset_pack.py.
+
+Each run starts a new process, which goes through the same steps as the game (creating a hidden window, then the sounds,
+the graphics and the menu, and drawing its first frame) and reports the time taken by each of them. As in the game, sound effects
+are decoded in background threads meanwhile. The mean time of each step over N_RUNS runs is printed for both configurations,
+along with the target cold-start time STARTUP_TARGET_MS of src/constants.py.
+Files read at startup remain in the cache of the operating system after the first run: only the first run of all is truly cold.
+
+Usage:
+1)   Edit the N_RUNS, HEADLESS and TRACE_DIRECTORY variables in this script.
+
+2)   Build the asset pack, if not done yet:
+          python ../build_asset_pack.py
+
+3)   Run the script:
+          python ./benchmark_startup.py
+"""
+
+
+
+
+import os
+import sys
+import json
+import time
+import subprocess
+
+start = time.perf_counter()
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+# Number of processes started with each configuration.
+N_RUNS = 10
+
+# Whether to create the OpenGL context without any display.
+HEADLESS = False
+
+# Directory where a trace of the last run of each configuration is written (see StartupTimings.dump_trace in src/profiling.py),
+# or None to not write any.
+TRACE_DIRECTORY = None
+
+
+
+
+def run_startup():
+    # Body of the processes started: mirrors the startup of the game (see pacman.py and src/window.py), and prints its timings as JSON.
+    import pyglet
+    pyglet.options['headless'] = HEADLESS
+    pyglet.options.shadow_window = False
+
+    from src.profiling import StartupTimings
+    timings = StartupTimings(start)
+
+    from src.activities.menu import Menu
+    from src.graphics import Graphics
+    from src.sounds import Sounds
+    from src.audio_events import AudioEventBus
+    from src.constants import SoundEffects
+    timings.step('imports')
+
+    window = pyglet.window.Window(visible = False)
+    timings.step('window')
+    sounds = Sounds(timings)
+    timings.step('sounds')
+    graphics = Graphics()
+    timings.step('graphics')
+    audio_events = AudioEventBus()
+    audio_events.add_listener(sounds.play_event)
+    menu = Menu(graphics, audio_events)
+    timings.step('menu')
+
+    window.clear()
+    menu.event_draw_screen()
+    pyglet.gl.glFinish()
+    timings.step('first frame')
+
+    # Sound effects may still be decoding in background: the trace shows for how long after the first frame.
+    if TRACE_DIRECTORY is not None:
+        for key in SoundEffects:
+            sounds._get_effect(key)
+        timings.dump_trace(os.path.join(TRACE_DIRECTORY, f'startup trace {sys.argv[2]}.json'))
+
+    print(json.dumps(timings.steps_ms))
+
+
+if len(sys.argv) > 1 and sys.argv[1] == '--child':
+    run_startup()
+    sys.exit(0)
+
+
+from src.constants import (ASSET_PACK_PATH,
+                           ASSET_PACK_ENV_VAR,
+                           STARTUP_TARGET_MS)
+
+if not os.path.exists(ASSET_PACK_PATH):
+    sys.exit(f"No asset pack found at {ASSET_PACK_PATH}: build it with scripts/build_asset_pack.py first.")
+
+# An empty path disables the asset pack.
+for name, pack_path in (('without asset pack', ''), ('with asset pack', ASSET_PACK_PATH)):
+    environment = {**os.environ, ASSET_PACK_ENV_VAR: pack_path}
+    runs = []
+    for _ in range(N_RUNS):
+        output = subprocess.run([sys.executable, __file__, '--child', name], env = environment, capture_output = True, text = True, check = True).stdout
+        runs.append(json.loads(output.splitlines()[-1]))
+
+    print(f"Startup {name}, mean over {N_RUNS} runs:")
+    for step in runs[0]:
+        print(f"    {step:<12} {sum(run[step] for run in runs) / N_RUNS:>8.1f} ms")
+
+    totals = sorted(sum(run.values()) for run in runs)
+    print(f"    {'total':<12} {sum(totals) / N_RUNS:>8.1f} ms (min {totals[0]:.1f} ms, max {totals[-1]:.1f} ms, target {STARTUP_TARGET_MS} ms)")
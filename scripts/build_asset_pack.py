@@ -0,0 +1,55 @@
+"""
+This script builds the asset pack loaded by the game at startup (see src/asset_pack.py), holding the atlas as raw RGBA pixels,
+the sound effects as raw PCM samples, and the recordings and shaders as they are, in a single file which is memory-mapped.
+Decoding the atlas alone takes most of the startup time of the game without it.
+
+The pack must be built again after changing any asset: until then, the game loads the changed assets from their sources.
+Assets that pyglet cannot decode on the platform running the script are left out of the pack, and are also loaded from their sources.
+
+Usage:
+1)   Edit the OUTPUT_PATH variable in this script.
+
+2)   Run the script:
+          python ./build_asset_pack.py
+"""
+
+
+
+
+import os
+import sys
+import time
+
+import pyglet
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.constants import ASSET_PACK_PATH
+
+
+# Path of the asset pack written, or None for the path loaded by the game.
+OUTPUT_PATH = None
+
+
+
+
+# Decoding assets needs neither a display nor an OpenGL context.
+pyglet.options['headless'] = True
+pyglet.options.shadow_window = False
+
+from src.asset_pack import build_asset_pack
+
+output_path = OUTPUT_PATH if OUTPUT_PATH is not None else ASSET_PACK_PATH
+
+start = time.perf_counter()
+report = build_asset_pack(output_path)
+elapsed = time.perf_counter() - start
+
+print(f"{'asset':<40} {'kind':<6} {'source KB':>10} {'packed KB':>10}")
+for name, kind, source_size, packed_size in report:
+    if packed_size is None:
+        print(f"{name:<40} {kind:<6} {'left out: cannot be decoded':>21}")
+    else:
+        print(f"{name:<40} {kind:<6} {source_size / 1024:>10.1f} {packed_size / 1024:>10.1f}")
+
+print(f"Asset pack of {os.path.getsize(output_path) / 1024:.0f} KB written to {output_path} in {elapsed:.2f} s.")
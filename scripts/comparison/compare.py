@@ -129,8 +129,6 @@ if __name__ == "__main__":
     game = make_initial_game()
 
     for _ in range(400): # 400
-        game = game.deepcopy()
-
         if game.event_update_state() is True:
             break
         frame = game.draw()
@@ -1,15 +1,13 @@
 # -----------------------------------------------------------------
 # Import standard library and installed packages.
 # -----------------------------------------------------------------
-import inspect
-from copy import deepcopy as _deepcopy
+import os
+import sys
 from contextlib import contextmanager
 
 import pyglet
 pyglet.options.shadow_window = False  # See explaination in pacman.py at repo root.
-
-import numpy as np
-import cv2
+pyglet.options.headless = sys.platform.startswith('linux') and not os.environ.get('DISPLAY')  # Render through EGL when no display is available.
 
 from .abstract_frame_generator import AbstractFrameGenerator
 
@@ -18,18 +16,15 @@ from .abstract_frame_generator import AbstractFrameGenerator
 # -----------------------------------------------------------------
 # Import game objects.
 # -----------------------------------------------------------------
-import os
-import sys
-
 _GAME_ROOT_DIR = os.path.realpath(os.path.join(os.path.dirname(__file__), '../../..'))
 sys.path.insert(0, _GAME_ROOT_DIR)
 
-from src.constants import GAME_ORIGINAL_FPS, BACKGROUND_COLOR, LAYOUT_N_COLS_TILES, LAYOUT_N_ROWS_TILES, LAYOUT_PX_PER_UNIT_LENGHT
+from src.constants import (GAME_ORIGINAL_FPS,
+                           SOFTWARE_RENDERING_ENV_VAR)
 from src.activities.game import Game as _Game
 from src.graphics import Graphics
-from src.sounds import Sounds
-from src.graphics.painter import Painter
-from src.game_objects.score import _ScoreValues
+from src.graphics.offscreen import OffscreenRenderer
+from src.graphics.software_painter import SoftwarePainter
 
 sys.path.pop(0)
 del _GAME_ROOT_DIR
@@ -37,79 +32,27 @@ del _GAME_ROOT_DIR
 # -----------------------------------------------------------------
 
 # -----------------------------------------------------------------
-# Patch game objects.
+# Replace game objects.
 # -----------------------------------------------------------------
-# Patch Sounds class with all methods replaced by no-op.
-for name, _ in inspect.getmembers(Sounds, predicate=inspect.isfunction):
-    setattr(Sounds, name, lambda *args, **kwargs: None)
-
-# Patch Painter class so that deepcopy actually returns a shallow copy.
-# This is needed because textures and other OpenGL context can't be safely deepcopied.
-Painter.__deepcopy__ = lambda self, memo: self
-
-# Patch _ScoreValues to not load high-score at start of simulation and not
-# store it at its end.
-_ScoreValues._high_score_load = lambda self: 0
-_ScoreValues._high_score_save = lambda self: None
-
-# Create minimal-implementation Window class to replace the one used in the real game.
-class Window(pyglet.window.Window):
-    def __init__(self, width, height, background):
-        super().__init__(
-            width = width,
-            height = height,
-            fullscreen = False,
-            resizable = False,
-            visible = False,
-        )
-        pyglet.gl.glClearColor(*background, 1)
-        self._buffer = (pyglet.gl.GLubyte * (width * height * 3))()
-
-    def draw_frame(self, game):
-        if not isinstance(game, Game):
-            raise RuntimeError(f"Parameter 'game' must be an instance of class 'Game'. Got {type(game)}")
-
-        self.switch_to()
-        self.clear()
-        game.event_draw_screen()
-        return self._grab_frame()
-
-    def _grab_frame(self):
-        pyglet.gl.glPixelStorei(pyglet.gl.GL_PACK_ALIGNMENT, 1)
-
-        pyglet.gl.glReadPixels(
-            0, 0,
-            self.width, self.height,
-            pyglet.gl.GL_RGB,
-            pyglet.gl.GL_UNSIGNED_BYTE,
-            self._buffer
-        )
-
-        # Convert to numpy without copying.
-        frame = np.frombuffer(self._buffer, dtype=np.uint8)
-        frame = frame.reshape((self.height, self.width, 3))
-
-        # Flip vertically (OpenGL origin is bottom-left).
-        frame = np.flipud(frame)
-
-        # Convert colorspaces.
-        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-
-        return frame
-
-
 class Game(_Game):
 
     def __init__(self, level = 1):
-        super().__init__(Graphics(), Sounds())
-        self._level = level
+        # No Sounds attached, and high-score neither loaded at start of simulation nor stored at its end.
+        # With software rendering, the renderer is also the painter of all Graphics instances.
+        graphics = Graphics(_RENDERER) if _SOFTWARE_RENDERING else Graphics()
+        super().__init__(graphics, None, start_level = level, persistent_high_score = False)
 
         # Add an attribute storing if a new game update can be done.
         self._can_be_updated = True
 
-    # Add a deepcopy method to Game class for convenience.
-    def deepcopy(self):
-        return _deepcopy(self)
+    # Extend snapshot and restore to also cover whether a new game update can be done.
+    # This allows to cheaply branch games. Note that the animation counters of the graphics are not part of the state.
+    def snapshot(self):
+        return super().snapshot(), self._can_be_updated
+
+    def restore(self, state):
+        simulation_state, self._can_be_updated = state
+        super().restore(simulation_state)
 
     # Override to raise if an update can't be done.
     def event_update_state(self):
@@ -124,9 +67,10 @@ class Game(_Game):
 # -----------------------------------------------------------------
 # Module's private attributes.
 # -----------------------------------------------------------------
-_WINDOW = Window(LAYOUT_N_COLS_TILES*LAYOUT_PX_PER_UNIT_LENGHT,
-                 LAYOUT_N_ROWS_TILES*LAYOUT_PX_PER_UNIT_LENGHT,
-                 BACKGROUND_COLOR)
+# Renders frames offscreen, and provides the OpenGL context in which the Graphics of all Game instances are created.
+# With software rendering, frames are drawn on the CPU instead, and no OpenGL context is created at all.
+_SOFTWARE_RENDERING = os.environ.get(SOFTWARE_RENDERING_ENV_VAR, '0') != '0'
+_RENDERER = SoftwarePainter() if _SOFTWARE_RENDERING else OffscreenRenderer()
 
 # -----------------------------------------------------------------
 
@@ -147,7 +91,7 @@ class GameFrames(AbstractFrameGenerator):
         yield
 
     def _get_height_width(self):
-        return _WINDOW.height, _WINDOW.width
+        return _RENDERER.height, _RENDERER.width
 
     def _get_fps(self):
         return GAME_ORIGINAL_FPS
@@ -157,7 +101,7 @@ class GameFrames(AbstractFrameGenerator):
 
     def _read_frame(self):
         success = self._grab_frame()
-        return success, _WINDOW.draw_frame(self.game)
+        return success, _RENDERER.render(self.game.event_draw_screen)
 
     def _grab_frame(self):
         self._check_game_attribute()
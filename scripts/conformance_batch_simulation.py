@@ -0,0 +1,129 @@
+"""
+This script checks that the vectorised BatchSimulation engine plays exactly the same games as the scalar Simulation engine
+with fixed_point_movement, which it replicates.
+
+N_GAMES games are run in lock-step by one BatchSimulation and by N_GAMES Simulation instances, with the same seeds and the same
+random direction requests. After every tick, the whole state of each game (as returned by snapshot) and the value returned by step
+are compared, and the script stops at the first difference, printing the fields that differ.
+Games are restarted whenever they end. As random inputs rarely clear a whole maze, at the start of each level only PELLETS_KEPT pellets
+close to Pac-Man are left in both engines, so that level completions, intermissions and the following levels are checked as well.
+
+NumPy is needed to run this script.
+
+Usage:
+1)   Edit the N_GAMES, N_TICKS, START_LEVEL, PELLETS_KEPT, DIRECTION_CHANGE_PROBABILITY and SEED variables in this script.
+
+2)   Run the script:
+          python ./conformance_batch_simulation.py
+"""
+
+
+
+
+import os
+import sys
+import random
+
+import numpy as np
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.engine.simulation import Simulation
+from src.engine.batch_simulation import BatchSimulation
+from src.constants import (MazeTiles,
+                           MAZE_START_TILES,
+                           MAZE_TILES_COLS,
+                           PACMAN_START_POSITION,
+                           LevelStates)
+
+
+# Number of games run in lock-step.
+N_GAMES = 16
+
+# Number of ticks to simulate.
+N_TICKS = 20000
+
+# Level at which games start.
+START_LEVEL = 1
+
+# Number of pellets left at the start of each level, or None to play full mazes.
+PELLETS_KEPT = 3
+
+# Probability, at every tick, of requesting a new random direction for Pac-Man in each game.
+DIRECTION_CHANGE_PROBABILITY = 0.08
+
+# Seed of the random generators used for inputs and pellets kept. Game i starts with seed SEED + i, and restarted games use the following seeds.
+SEED = 0
+
+
+
+
+# Pellets on the row and the columns around Pac-Man start position, in the order of the bits of the pellet bitmap of Maze.
+pellet_tiles = [index for index, tile in enumerate(MAZE_START_TILES) if tile in (MazeTiles.PELLET, MazeTiles.POWER_PELLET)]
+pellets_near_start = [bit for bit, index in enumerate(pellet_tiles) if index // MAZE_TILES_COLS == int(PACMAN_START_POSITION.y) and
+                                                                      abs(index % MAZE_TILES_COLS - PACMAN_START_POSITION.x) <= 6]
+
+def new_simulation(seed):
+    return Simulation(start_level = START_LEVEL, persistent_high_score = False, fixed_point_movement = True, seed = seed)
+
+def print_differences(tick, idx, batch_state, batch_retval, simulation_state, simulation_retval):
+    print(f"Game {idx} differs at tick {tick}.")
+    if batch_retval != simulation_retval:
+        print(f"    step returned {batch_retval} instead of {simulation_retval}.")
+
+    for field in simulation_state._fields:
+        if getattr(batch_state, field) != getattr(simulation_state, field):
+            print(f"    {field}:\n        BatchSimulation: {getattr(batch_state, field)}\n        Simulation:      {getattr(simulation_state, field)}")
+
+
+rng = np.random.default_rng(SEED)
+pellets_rng = random.Random(SEED)
+
+seeds = range(SEED, SEED + N_GAMES)
+batch = BatchSimulation(N_GAMES, start_level = START_LEVEL, seeds = seeds)
+simulations = [new_simulation(seed) for seed in seeds]
+
+n_levels_completed = n_games_over = 0
+for tick in range(N_TICKS):
+
+    # Remove pellets at the start of levels, identically in both engines.
+    for idx, simulation in enumerate(simulations):
+        state = simulation.snapshot()
+        if PELLETS_KEPT is not None and state.level_state == LevelStates.READY and state.maze[1] > PELLETS_KEPT:
+            kept = pellets_rng.sample(pellets_near_start, PELLETS_KEPT)
+            state = state._replace(maze = (sum(1 << bit for bit in kept), PELLETS_KEPT))
+            simulation.restore(state)
+            batch.restore(idx, state)
+
+    requested = rng.random(N_GAMES) < DIRECTION_CHANGE_PROBABILITY
+    directions = np.where(requested, rng.integers(len(BatchSimulation.DIRECTIONS), size = N_GAMES), -1)
+
+    batch.set_directions(directions)
+    batch_retvals = batch.step()
+
+    for idx, simulation in enumerate(simulations):
+        if directions[idx] >= 0:
+            simulation.set_direction(BatchSimulation.DIRECTIONS[directions[idx]])
+
+        retval = simulation.step()
+
+        # BatchSimulation returns -1 instead of True and 0 instead of False.
+        retval = -1 if retval is True else int(retval)
+
+        batch_state, simulation_state = batch.snapshot(idx), simulation.snapshot()
+        if batch_state != simulation_state or batch_retvals[idx] != retval:
+            print_differences(tick, idx, batch_state, batch_retvals[idx], simulation_state, retval)
+            sys.exit(1)
+
+        if simulation_state.level_state == LevelStates.COMPLETED and simulation_state.level_state_counter == 0:
+            n_levels_completed += 1
+
+        # Restart games that are over, with a new seed.
+        if retval == -1:
+            n_games_over += 1
+            seed = SEED + N_GAMES + n_games_over
+            batch.reset([idx], [seed])
+            simulations[idx] = new_simulation(seed)
+
+print(f"BatchSimulation and Simulation are identical over {N_TICKS} ticks of {N_GAMES} games, "
+      f"with {n_levels_completed} levels completed and {n_games_over} games over.")
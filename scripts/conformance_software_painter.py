@@ -0,0 +1,166 @@
+"""
+This script checks that the SoftwarePainter, drawing on the CPU with NumPy, draws the same frames as the Painter drawing with OpenGL.
+
+N_GAMES games are played with random direction requests, each by two Game instances in lock-step: one drawing with OpenGL into
+an OffscreenRenderer, and one drawing with a SoftwarePainter. Every DRAW_EVERY ticks, a frame is drawn by both and the number of
+pixels that differ is counted. The script prints the mean time taken to render a frame by each, split between building the sprites
+(the rest of event_draw_screen, identical for both) and drawing them with the painter (including reading back the pixels for OpenGL).
+It exits with an error if any frame has more than MAX_DIFFERENT_PIXELS different pixels, saving both frames if OpenCV is installed.
+Levels start with only a few pellets left, so that level completions and the flashing of walls are also compared.
+
+NumPy is needed to run this script, and OpenGL to draw the reference frames.
+
+Usage:
+1)   Edit the N_GAMES, N_TICKS, DRAW_EVERY, START_LEVEL, MAX_DIFFERENT_PIXELS, HEADLESS and SEED variables in this script.
+
+2)   Run the script:
+          python ./conformance_software_painter.py
+"""
+
+
+
+
+import os
+import sys
+import random
+import time
+
+import numpy as np
+import pyglet
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+# Number of games played.
+N_GAMES = 4
+
+# Maximum number of ticks played in each game.
+N_TICKS = 6000
+
+# Number of ticks between two frames compared.
+DRAW_EVERY = 7
+
+# Level at which games start.
+START_LEVEL = 1
+
+# Maximum number of pixels allowed to differ in a frame. For sprites lying half-way between two pixels, a few pixels sample
+# the exact boundary between two texels of the atlas, and GPUs pick either one depending on their rounding.
+MAX_DIFFERENT_PIXELS = 16
+
+# Whether to create the OpenGL context without any display.
+HEADLESS = True
+
+# Seed of the random generators used for inputs and games. Game i is played with seed SEED + i.
+SEED = 0
+
+
+
+
+pyglet.options['headless'] = HEADLESS
+pyglet.options.shadow_window = False
+
+from pyglet.window import key
+
+from src.graphics import Graphics
+from src.graphics.painter import Painter
+from src.graphics.offscreen import OffscreenRenderer
+from src.graphics.software_painter import SoftwarePainter
+from src.activities.game import Game
+from src.constants import (LevelStates,
+                           MazeTiles,
+                           MAZE_START_TILES,
+                           MAZE_TILES_COLS,
+                           PACMAN_START_POSITION)
+
+# Pellets left at the start of each level: the ones closest to Pac-Man, so that he eats them soon enough with random inputs.
+# Pellets are stored in the maze as a bitmap, with one bit per tile starting with a pellet.
+N_PELLETS_KEPT = 6
+PELLET_TILES = [index for index, tile in enumerate(MAZE_START_TILES) if tile in (MazeTiles.PELLET, MazeTiles.POWER_PELLET)]
+KEPT_PELLET_BITS = sorted(range(len(PELLET_TILES)),
+                          key = lambda bit: abs(PELLET_TILES[bit] // MAZE_TILES_COLS + 0.5 - PACMAN_START_POSITION.y) +
+                                            abs(PELLET_TILES[bit] %  MAZE_TILES_COLS + 0.5 - PACMAN_START_POSITION.x))[:N_PELLETS_KEPT]
+KEPT_PELLETS_BITMAP = sum(1 << bit for bit in KEPT_PELLET_BITS)
+
+
+def save_frames(idx, tick, frames):
+    try:
+        import cv2
+    except ImportError:
+        return
+
+    for name, frame in zip(('opengl', 'software'), frames):
+        cv2.imwrite(f'./frame_game_{idx}_tick_{tick}_{name}.png', frame)
+
+
+def timed(function, times, name):
+    # Returns function wrapped so that the time spent in it is added to times[name].
+    def timed_function(*args):
+        start = time.perf_counter()
+        retval = function(*args)
+        times[name] += time.perf_counter() - start
+        return retval
+
+    return timed_function
+
+
+renderer = OffscreenRenderer()
+software_painter = SoftwarePainter()
+
+# Time spent rendering frames, in event_draw_screen, and in the draw method of the painter (called by event_draw_screen and render).
+gl_times       = {'frame': 0, 'event_draw_screen': 0, 'draw': 0}
+software_times = {'frame': 0, 'event_draw_screen': 0, 'draw': 0}
+software_painter.draw = timed(software_painter.draw, software_times, 'draw')
+
+n_frames = 0
+for idx in range(N_GAMES):
+    seed = SEED + idx
+    rng = random.Random(seed)
+
+    gl_painter = Painter()
+    gl_painter.draw = timed(gl_painter.draw, gl_times, 'draw')
+
+    games = [Game(Graphics(gl_painter), None, START_LEVEL, persistent_high_score = False, seed = seed),
+             Game(Graphics(software_painter), None, START_LEVEL, persistent_high_score = False, seed = seed)]
+
+    for tick in range(N_TICKS):
+        if rng.random() < 0.05:
+            symbol = rng.choice((key.UP, key.DOWN, key.LEFT, key.RIGHT))
+            for game in games:
+                game.event_key_pressed(symbol, 0)
+
+        retvals = [game.event_update_state() for game in games]
+
+        # Only keep a few pellets at the start of each level.
+        state = games[0].snapshot()
+        if state.level_state == LevelStates.READY and state.maze[1] > N_PELLETS_KEPT:
+            state = state._replace(maze = (KEPT_PELLETS_BITMAP, N_PELLETS_KEPT))
+            for game in games:
+                game.restore(state)
+
+        if tick % DRAW_EVERY == 0:
+            start = time.perf_counter()
+            gl_frame = renderer.render(timed(games[0].event_draw_screen, gl_times, 'event_draw_screen'))
+            drawn = time.perf_counter()
+            software_frame = software_painter.render(timed(games[1].event_draw_screen, software_times, 'event_draw_screen'))
+            software_drawn = time.perf_counter()
+
+            gl_times      ['frame'] += drawn - start
+            software_times['frame'] += software_drawn - drawn
+            n_frames += 1
+
+            n_different_pixels = np.count_nonzero((gl_frame != software_frame).any(axis = 2))
+            if n_different_pixels > MAX_DIFFERENT_PIXELS:
+                print(f"Game {idx} differs at tick {tick}: {n_different_pixels} different pixels.")
+                save_frames(idx, tick, (gl_frame, software_frame))
+                sys.exit(1)
+
+        if retvals[0] is True:
+            break
+
+print(f"Painter and SoftwarePainter drew {n_frames} matching frames over {N_GAMES} games.")
+for name, times in (('OpenGL', gl_times), ('SoftwarePainter', software_times)):
+    # Sprites are built by event_draw_screen outside of the draw method of the painter. The rest of the frame is spent drawing them,
+    # including waiting for the pixels and reading them back for OpenGL, as the draw method of Painter returns before they are drawn.
+    sprites = times['event_draw_screen'] - times['draw']
+    print(f"Mean time to render a frame with {name}: {1000 * times['frame'] / n_frames:.3f} ms, of which "
+          f"{1000 * sprites / n_frames:.3f} ms building sprites and {1000 * (times['frame'] - sprites) / n_frames:.3f} ms drawing them.")
@@ -0,0 +1,60 @@
+"""
+This script re-simulates recorded games from their replay files, as fast as possible and without any window,
+and checks that each of them reaches the same final score and level as when it was played.
+
+When the game is started with --record-replays (or with the environment variable PACMAN_RECORD_REPLAYS set to 1), a replay file
+is recorded for every game played, in the directory REPLAYS_DIRECTORY defined in src/constants.py.
+Games that were interrupted (e.g. by closing the window) have no recorded result, and are only re-simulated.
+Games are re-simulated one tick at a time by Simulation, at about 10 000 ticks per second for games played in the window:
+a full 256-level game takes a few minutes.
+
+Usage:
+1)   Edit the REPLAYS_PATTERN variable in this script.
+
+2)   Run the script:
+          python ./play_replays.py
+"""
+
+
+
+
+import os
+import sys
+import glob
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.engine.replay import ReplayReader
+from src.constants import (REPLAYS_DIRECTORY,
+                           REPLAY_FILE_EXTENSION)
+
+
+# Glob pattern of the replay files to play.
+REPLAYS_PATTERN = os.path.join(REPLAYS_DIRECTORY, '*' + REPLAY_FILE_EXTENSION)
+
+
+
+
+n_mismatches = 0
+for path in sorted(glob.glob(REPLAYS_PATTERN)):
+    reader = ReplayReader(path)
+
+    start = time.perf_counter()
+    simulation, n_ticks = reader.play()
+    elapsed = time.perf_counter() - start
+
+    score, level = simulation.score.score, simulation.level
+    if reader.final_score is None:
+        result = "no recorded result"
+    elif (score, level) == (reader.final_score, reader.final_level):
+        result = "OK"
+    else:
+        result = f"MISMATCH, recorded score {reader.final_score} and level {reader.final_level}"
+        n_mismatches += 1
+
+    print(f"{os.path.basename(path)}: {n_ticks} ticks in {elapsed:.2f} s ({n_ticks / elapsed:.0f} ticks per second), "
+          f"score {score}, level {level}: {result}.")
+
+if n_mismatches:
+    sys.exit(1)
@@ -0,0 +1,118 @@
+"""
+This script renders a recorded game to a video file, as fast as possible and without showing any window.
+
+The game is re-simulated from its replay file (see src/engine/replay.py), and every tick is drawn offscreen by an OffscreenRenderer
+and written to the video at the original frame rate of the game. Intermissions, which are not part of replays, are skipped.
+With HEADLESS set, no display is needed (e.g. on a Linux server), as the OpenGL context is created through EGL.
+With SOFTWARE_RENDERING set, frames are drawn on the CPU by a SoftwarePainter instead, and OpenGL is not used at all.
+With AUDIO_PATH set, the audio of the game is also written to a WAV file, mixed from the audio events recorded during the game
+(see src/audio_events.py) without any audio device. It lasts exactly as long as the video, and both can be merged with e.g.:
+          ffmpeg -i replay.mp4 -i replay.wav -c:v copy -c:a aac replay_with_audio.mp4
+
+NumPy and OpenCV are needed to run this script.
+
+Usage:
+1)   Edit the REPLAY_PATH, VIDEO_PATH, VIDEO_FOURCC, AUDIO_PATH, HEADLESS and SOFTWARE_RENDERING variables in this script.
+
+2)   Run the script:
+          python ./render_replay.py
+"""
+
+
+
+
+import os
+import sys
+import glob
+import time
+
+import cv2
+import pyglet
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.constants import (REPLAYS_DIRECTORY,
+                           REPLAY_FILE_EXTENSION,
+                           GAME_ORIGINAL_FPS)
+
+
+# Path of the replay file to render, or None to render the most recent replay in REPLAYS_DIRECTORY.
+REPLAY_PATH = None
+
+# Path of the video file written.
+VIDEO_PATH = './replay.mp4'
+
+# Codec of the video, as a FourCC code supported by OpenCV.
+VIDEO_FOURCC = 'mp4v'
+
+# Path of the WAV file written with the audio of the game, or None to not render audio.
+AUDIO_PATH = './replay.wav'
+
+# Whether to create the OpenGL context without any display.
+HEADLESS = True
+
+# Whether to draw frames on the CPU, without OpenGL.
+SOFTWARE_RENDERING = False
+
+
+
+
+pyglet.options['headless'] = HEADLESS
+pyglet.options.shadow_window = False
+
+from src.engine.replay import ReplayReader
+from src.graphics import Graphics
+from src.graphics.offscreen import OffscreenRenderer
+from src.graphics.software_painter import SoftwarePainter
+from src.activities.game import Game
+from src.audio_events import AudioEventBus
+from src.sounds import render_wav
+
+if REPLAY_PATH is None:
+    replays = glob.glob(os.path.join(REPLAYS_DIRECTORY, '*' + REPLAY_FILE_EXTENSION))
+    if not replays:
+        sys.exit(f"No replay found in {REPLAYS_DIRECTORY}.")
+    REPLAY_PATH = max(replays, key = os.path.getmtime)
+
+reader = ReplayReader(REPLAY_PATH)
+
+# Graphics must be created once the OpenGL context of the renderer exists. A SoftwarePainter is both the renderer and the painter.
+if SOFTWARE_RENDERING:
+    renderer = SoftwarePainter()
+    graphics = Graphics(renderer)
+else:
+    renderer = OffscreenRenderer()
+    graphics = Graphics()
+
+audio_events = AudioEventBus(record = True)
+game = Game(graphics, audio_events, reader.start_level, persistent_high_score = False, seed = reader.seed,
+            fixed_point_movement = reader.fixed_point_movement)
+
+def draws():
+    for direction in reader:
+        if direction is not None:
+            game.simulation.set_direction(direction)
+
+        game.event_update_state()
+        audio_events.notify_tick()
+        yield game.event_draw_screen
+
+video = cv2.VideoWriter(VIDEO_PATH, cv2.VideoWriter_fourcc(*VIDEO_FOURCC), GAME_ORIGINAL_FPS, (renderer.width, renderer.height))
+
+n_frames = 0
+start = time.perf_counter()
+for frame in renderer.render_frames(draws()):
+    video.write(frame)
+    n_frames += 1
+elapsed = time.perf_counter() - start
+
+video.release()
+
+if AUDIO_PATH is not None:
+    start = time.perf_counter()
+    render_wav(AUDIO_PATH, audio_events.timeline, audio_events.tick)
+    audio_elapsed = time.perf_counter() - start
+
+print(f"Rendered {n_frames} frames of {os.path.basename(REPLAY_PATH)} to {VIDEO_PATH} in {elapsed:.2f} s: {n_frames / elapsed:.0f} frames per second.")
+if AUDIO_PATH is not None:
+    print(f"Rendered its audio to {AUDIO_PATH} in {audio_elapsed:.2f} s.")
@@ -16,8 +16,9 @@ class Activity(ABC):
         return
 
     @abstractmethod
-    def event_draw_screen(self):
-        """Redraws the activity in the window."""
+    def event_draw_screen(self, interpolation = 1):
+        """Redraws the activity in the window. interpolation is the fraction of game update elapsed since the last one,
+        allowing moving objects to be drawn between their last two states."""
         return
 
     @abstractmethod
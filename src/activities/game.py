@@ -1,84 +1,49 @@
 # -*- coding: utf-8 -*-
 
-from random import randint
-
 from pyglet.window import key
 
 from src.activities.activity import Activity
 from src.directions import Vector2
+from src.engine.simulation import Simulation
 
-from src.game_objects.pacman import PacMan
-from src.game_objects.maze import Maze
-from src.game_objects.score import Score
-from src.game_objects.ghosts.ghost_coordinator import GhostsCoordinator
-
-from src.constants import (MazeTiles,
-                           ScoreActions,
-                           STARTING_LIVES_PACMAN,
-                           EXTRA_LIFE_POINTS_REQUIREMENT,
-                           FRUIT_SPAWN_THRESHOLDS,
-                           FRUIT_SPAWN_POSITION,
-                           FRUIT_TIME_ACTIVE_RANGE,
-                           FRIGHT_TIME_AND_FLASHES,
-                           LevelStates,
-                           LEVEL_STATES_DURATION,
+from src.constants import (LevelStates,
                            DynamicUIElements,
-                           UpdatableUIElements,
                            LEVEL_WITH_INTERMISSIONS,
-                           GAME_COMPLETED_LEVEL)
+                           RECORDINGS_DETAILS,
+                           RECORDING_CACHE_PREFETCH_INTERMISSIONS)
 
 
 class Game(Activity):
-    """Class Game. Implements screen update, reaction to key presses
-    and releases and game engine when the program is showing the game."""
+    """Class Game. Implements screen update and reaction to key presses
+    and releases when the program is showing the game. The game engine itself
+    is delegated to a Simulation, to which Graphics and Sounds are attached."""
     
-    def __init__(self, graphics, sounds):
-        """Override of method from Activity class, instancing all game objects."""
-        super().__init__(graphics, sounds)
+    # Direction requested to Pac-Man by each key.
+    KEY_DIRECTIONS = {key.UP: Vector2.UP, key.DOWN: Vector2.DOWN, key.LEFT: Vector2.LEFT, key.RIGHT: Vector2.RIGHT}
 
-        self._score = Score()
-        
-        self._lives = STARTING_LIVES_PACMAN
-        self._extra_life_awarded = False
+    def __init__(self, graphics, sounds, start_level = 1, persistent_high_score = True, seed = None, fixed_point_movement = False):
+        """Override of method from Activity class, instancing the game engine."""
+        super().__init__(graphics, sounds)
 
-        # Create private attributes to hold level state and duration of the state.
-        self._level_state = None
-        self._level_state_counter = 0
+        self._simulation = Simulation(graphics, sounds, start_level, persistent_high_score, fixed_point_movement, seed)
 
-        # Create attributes that will be initialized in _reset_level.
-        self._level  = 0
-        self._maze   = None
-        self._pacman = None
-        self._ghosts = None
-        self._fright_counter = None
-        self._fruit_visible_counter = 0
+        # Positions of Pac-Man and ghosts before the last update, to draw them in between.
+        self._previous_positions = None
 
-        self._set_level_state(LevelStates.FIRST_WELCOME)
-        self._sounds.notify_first_welcome()
-        self._reset_level(new = True)
+        # Last level whose intermission was prefetched.
+        self._prefetched_level = None
 
 
     def notify_destruction(self):
         """Override of method from Activity class, returning the values needed by GameCompleted to function."""
-        return {'score': self._score, 'lives': self._lives, 'level': self._level}
-
-
-    def _reset_level(self, new):
-        if new:
-            self._level  += 1
-            self._maze   = Maze()
-            self._ghosts = GhostsCoordinator()
-        
-        self._pacman = PacMan()
-        self._fright_counter = 0
-        self._fruit_visible_counter = 0
-        self._graphics.reset_level()
+        return {'score': self._simulation.score, 'lives': self._simulation.lives, 'level': self._simulation.level}
 
 
-    def event_draw_screen(self):
+    def event_draw_screen(self, interpolation = 1):
         """Override of method from Activity class, drawing the game state on the screen."""
+        simulation = self._simulation
 
-        match self._level_state:
+        match simulation.level_state:
             case LevelStates.FIRST_WELCOME:
                 ui_elements = DynamicUIElements.READY_TEXT | DynamicUIElements.PLAYER_ONE_TEXT
             case LevelStates.READY:
@@ -94,210 +59,77 @@ class Game(Activity):
             case LevelStates.PLAYING | LevelStates.PAUSE_BEFORE_DEATH | LevelStates.PAUSE_BEFORE_COMPLETED:
                 ui_elements = DynamicUIElements.PACMAN | DynamicUIElements.GHOSTS | DynamicUIElements.FRUIT | DynamicUIElements.ACTION_SCORES
                 
-        if self._fruit_visible_counter <= 0:
+        if not simulation.fruit_visible:
             ui_elements &= (~DynamicUIElements.FRUIT)
 
-        self._graphics.draw_game(self._maze, self._pacman, self._ghosts, self._score, self._lives, self._level, ui_elements)
+        pacman_position, ghosts_positions = self._interpolated_positions(interpolation)
+        self._graphics.draw_game(simulation.maze, simulation.pacman, simulation.ghosts, simulation.score, simulation.lives, simulation.level, ui_elements,
+                                 pacman_position, ghosts_positions)
         
 
     def event_key_pressed(self, symbol, modifiers):
         """Override of method from Activity class, reacting to key presses."""
-        if symbol == key.UP:
-            self._pacman.direction = Vector2.UP
-        elif symbol == key.DOWN:
-            self._pacman.direction = Vector2.DOWN
-        elif symbol == key.LEFT:
-            self._pacman.direction = Vector2.LEFT
-        elif symbol == key.RIGHT:
-            self._pacman.direction = Vector2.RIGHT
-
+        if symbol in Game.KEY_DIRECTIONS:
+            self._simulation.set_direction(Game.KEY_DIRECTIONS[symbol])
 
 
     def event_update_state(self):
         """Override of method from Activity class, updating the state of the activity."""
-        
-        # Update level state, without updating graphics.
-        match self._level_state:
-            case LevelStates.PLAYING:
-                self._update_game_not_graphics()
+        self._previous_positions = self._positions()
+        retval = self._simulation.step()
 
-            case LevelStates.PAUSE_AFTER_EATING:
-                self._ghosts.update(self._level, True, self._maze, self._pacman, update_only_transparent = True)
-
-        # Update graphics states.
-        match self._level_state:
-            case LevelStates.FIRST_WELCOME | LevelStates.READY:
-                ui_elements = UpdatableUIElements.UI | UpdatableUIElements.SCORE
-            case LevelStates.PLAYING:
-                ui_elements = UpdatableUIElements.PACMAN | UpdatableUIElements.GHOSTS | UpdatableUIElements.MAZE | UpdatableUIElements.UI | UpdatableUIElements.SCORE
-            case LevelStates.DEATH | LevelStates.COMPLETED | LevelStates.PAUSE_BEFORE_COMPLETED:
-                ui_elements = UpdatableUIElements.PACMAN | UpdatableUIElements.MAZE | UpdatableUIElements.UI | UpdatableUIElements.SCORE
-            case LevelStates.PAUSE_AFTER_EATING:
-                ui_elements = UpdatableUIElements.MAZE | UpdatableUIElements.UI | UpdatableUIElements.SCORE
-            case LevelStates.PAUSE_BEFORE_DEATH:
-                ui_elements = UpdatableUIElements.GHOSTS | UpdatableUIElements.MAZE | UpdatableUIElements.UI | UpdatableUIElements.SCORE
-            case LevelStates.GAME_OVER:
-                ui_elements = UpdatableUIElements.UI | UpdatableUIElements.SCORE
-            case LevelStates.INTERMISSION:
-                ui_elements = None
-        self._graphics.update(self._pacman, ui_elements)
-        
-        # Transition to new level state if needed.      
-        change_state = self._level_state_counter <= 0
-        self._level_state_counter -= 1
-        
-        match self._level_state:
-            case LevelStates.PLAYING:
-                self._calculate_new_game_state()
+        if RECORDING_CACHE_PREFETCH_INTERMISSIONS and self._simulation.level != self._prefetched_level:
+            self._prefetch_intermission(self._simulation.level)
 
-            case LevelStates.FIRST_WELCOME:
-                if change_state:
-                    self._set_level_state(LevelStates.READY)
-                    self._lives -= 1
+        return retval
 
-            case LevelStates.READY:
-                if change_state:
-                    self._set_level_state(LevelStates.PLAYING)
-                    self._pacman.state_set_moving()
 
-            case LevelStates.DEATH:
-                if change_state:
-                    self._lives -= 1
-                    if self._lives >= 0:
-                        self._set_level_state(LevelStates.READY)
-                        self._reset_level(new = False)
-                    else:
-                        self._set_level_state(LevelStates.GAME_OVER)
-
-            case LevelStates.COMPLETED:
-                if change_state:
-                    if self._level in LEVEL_WITH_INTERMISSIONS:
-                        self._set_level_state(LevelStates.INTERMISSION)
-                    else:
-                        self._set_level_state(LevelStates.READY)
-                        self._reset_level(new = True)
-                        if self._level == GAME_COMPLETED_LEVEL:
-                            return self._level
-
-            case LevelStates.INTERMISSION:
-                old_level = self._level
-                self._set_level_state(LevelStates.READY)
-                self._reset_level(new = True)
-                return old_level
+    def _prefetch_intermission(self, level):
+        # The intermission following level is decoded in background while the level is played.
+        self._prefetched_level = level
+        if level not in LEVEL_WITH_INTERMISSIONS:
+            return
 
-            case LevelStates.GAME_OVER:
-                if change_state:
-                    return True # Tell Window class we need to change activity.
-
-            case LevelStates.PAUSE_AFTER_EATING:
-                if change_state:
-                    self._set_level_state(LevelStates.PLAYING)
-                    self._ghosts.notify_clear_was_just_eaten()
-
-                    # Test if collision with another ghost happened in the same spot. If so, function will autoatically change _level_state again.
-                    self._calculate_new_game_state()
-
-            case LevelStates.PAUSE_BEFORE_DEATH:
-                if change_state:
-                    self._set_level_state(LevelStates.DEATH)
-                    self._pacman.state_set_death()
-                    self._ghosts.notify_life_lost()
-                    self._sounds.notify_life_lost()
-            
-            case LevelStates.PAUSE_BEFORE_COMPLETED:
-                if change_state:
-                    self._set_level_state(LevelStates.COMPLETED)
-                    self._graphics.notify_level_end()
-
-        return False
-        
+        details = RECORDINGS_DETAILS[LEVEL_WITH_INTERMISSIONS[level]]
+        height, width = details['frame_shape']
+        self._graphics.recording_prefetch(details['path'], width, height)
 
 
-    def _update_game_not_graphics(self):
-        fright = False
-        if self._fright_counter > 0:
-            self._fright_counter -= 1
-            fright = True
+    def _positions(self):
+        return self._simulation.pacman.position, tuple(ghost.position for ghost in self._simulation.ghosts)
 
-        if self._fruit_visible_counter > 0:
-            self._fruit_visible_counter -= 1
 
-        self._pacman.update(self._level, fright, self._maze)
-        self._ghosts.update(self._level, fright, self._maze, self._pacman, update_only_transparent = False)
+    def _interpolated_positions(self, interpolation):
+        # Returns None to draw current positions.
+        if interpolation >= 1 or self._previous_positions is None:
+            return None, None
 
-        self._sounds.queue_correct_siren(self._maze.n_pellets_remaining, fright, self._ghosts.any_ghost_retreating)
+        previous_pacman, previous_ghosts = self._previous_positions
+        current_pacman,  current_ghosts  = self._positions()
 
+        pacman_position  = _interpolate(previous_pacman, current_pacman, interpolation)
+        ghosts_positions = tuple(_interpolate(previous, current, interpolation) for previous, current in zip(previous_ghosts, current_ghosts))
+        return pacman_position, ghosts_positions
 
-    def _calculate_new_game_state(self):
-        pacman_new_position = self._pacman.position
 
-        # Check if eaten a fruit.
-        if self._fruit_visible_counter:
-            pacman_old_position = self._pacman.old_position
+    def snapshot(self):
+        """Returns the state of the game engine. See Simulation.snapshot."""
+        return self._simulation.snapshot()
 
-            was_on_fruit = (pacman_old_position.y == pacman_new_position.y == FRUIT_SPAWN_POSITION.y) and \
-                           ((pacman_old_position.x <= FRUIT_SPAWN_POSITION.x <= pacman_new_position.x) or \
-                            (pacman_new_position.x <= FRUIT_SPAWN_POSITION.x <= pacman_old_position.x))
-            if was_on_fruit:
-                self._fruit_eaten()
 
-        # Check if eaten a pellet.
-        pellet_type = self._maze.eat_check_pellet(pacman_new_position)
-        if pellet_type is not None:
-            self._pellet_eaten(pellet_type)
+    def restore(self, state):
+        """Restores the state of the game engine. See Simulation.restore."""
+        self._simulation.restore(state)
 
-        # End level if completed.
-        if self._maze.completed:
-            self._set_level_state(LevelStates.PAUSE_BEFORE_COMPLETED)
-            self._pacman.state_become_round()
-            self._sounds.stop()
 
-        # Check if collided with any ghosts.
-        life_lost, any_eaten, position = self._ghosts.check_collision(self._maze, self._pacman) 
-        if any_eaten:
-            score = self._score.add_to_score(ScoreActions.EAT_GHOST)
-            self._set_level_state(LevelStates.PAUSE_AFTER_EATING)
-            self._graphics.notify_ghost_eaten(score, position)
-            self._sounds  .notify_ghost_eaten()
-        if life_lost:
-            self._set_level_state(LevelStates.PAUSE_BEFORE_DEATH)
-            self._sounds.stop()
+    simulation = property(lambda self: self._simulation)
 
-        # Update lives if score high enough.
-        if not self._extra_life_awarded and self._score.score >= EXTRA_LIFE_POINTS_REQUIREMENT:
-            self._lives += 1
-            self._extra_life_awarded = True
-            self._sounds.notify_extra_life()
 
 
-    def _pellet_eaten(self, pellet_type):
-        self._pacman.add_penalty(pellet_type)
-        self._ghosts.notify_pellet_eaten()
-        self._score.add_to_score(ScoreActions.EAT_PELLET if pellet_type == MazeTiles.PELLET else ScoreActions.EAT_POWER_PELLET)
-        self._sounds.notify_pellet_eaten()
 
-        if pellet_type == MazeTiles.POWER_PELLET:
-            fright_duration, fright_flashes = FRIGHT_TIME_AND_FLASHES(self._level)
+def _interpolate(previous, current, interpolation):
+    # Characters jumping by more than a tile (warp tunnel, new life or level) are drawn at their current position.
+    if abs(current.x - previous.x) + abs(current.y - previous.y) > 1:
+        return current
 
-            self._fright_counter = fright_duration
-            self._score.notify_fright_on()
-            self._ghosts.notify_fright_on(fright_duration)
-            self._graphics.notify_fright_on(fright_duration, fright_flashes)
-
-        if self._maze.n_pellets_remaining in FRUIT_SPAWN_THRESHOLDS:
-            self._fruit_visible_counter = randint(*FRUIT_TIME_ACTIVE_RANGE)
-
-
-    def _fruit_eaten(self):
-        self._fruit_visible_counter = 0
-        score = self._score.add_to_score(ScoreActions.EAT_FRUIT, self._level)
-        self._graphics.notify_fruit_eaten(score)
-        self._sounds  .notify_fruit_eaten()
-
-
-    def _set_level_state(self, new_state):
-        if new_state not in LevelStates:
-            raise ValueError('Invalid state provided to Game._set_level_state')
-        
-        self._level_state = new_state
-        self._level_state_counter = LEVEL_STATES_DURATION[new_state]
\ No newline at end of file
+    return previous + (current - previous) * interpolation
@@ -29,7 +29,7 @@ class GameCompleted(Activity):
         self._must_switch_to_menu = False
 
 
-    def event_draw_screen(self):
+    def event_draw_screen(self, interpolation = 1):
         """Override of method from Activity class, drawing the ui and congratulations message."""
         self._graphics.draw_game_completed(self._score, lives = 0, level = self._level)
     
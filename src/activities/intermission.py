@@ -17,7 +17,7 @@ class Intermission(Recording):
         self._sounds.notify_intermission()
         
 
-    def event_draw_screen(self):
+    def event_draw_screen(self, interpolation = 1):
         """Redraws the activity in the window."""
         super().event_draw_screen(level_to_draw_fruits = self._game_level)
 
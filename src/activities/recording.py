@@ -25,7 +25,7 @@ class Recording(Activity):
         self._graphics.recording_free()
 
         
-    def event_draw_screen(self, **kwargs):
+    def event_draw_screen(self, interpolation = 1, **kwargs):
         """Redraws the activity in the window."""
         self._graphics.recording_draw(self._frame_idx, **kwargs)
 
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import sys
+import json
+import mmap
+import ctypes
+import struct
+import threading
+import functools
+
+import pyglet
+
+from src.constants import (ASSET_PACK_PATH,
+                           ASSET_PACK_ENV_VAR,
+                           GRAPHICS_ATLAS_PATH,
+                           WINDOW_ICON_PATH,
+                           SOUND_EFFECTS_PATHS,
+                           RECORDINGS_DETAILS,
+                           SHADERS_VERT_PATH,
+                           SHADERS_GEOM_PATH,
+                           SHADERS_FRAG_PATH)
+
+
+# An asset pack starts with a header (magic bytes, version of the format, size of the index), followed by the index as JSON,
+# and by the contents of all assets, each starting at a multiple of _ALIGNMENT bytes from the start of the file.
+_MAGIC = b'PACMANPK'
+_VERSION = 1
+_HEADER = struct.Struct('<8sII')
+_ALIGNMENT = 64
+
+# Directory relative to which the assets are named in the index, so that the pack does not depend on the working directory.
+_ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pack opened by the first asset loaded, or False if there is none or it is disabled. Assets may be loaded from several threads.
+_pack = None
+_pack_lock = threading.Lock()
+
+
+
+
+def _asset_name(path):
+    return os.path.relpath(os.path.abspath(path), _ROOT_PATH).replace(os.sep, '/')
+
+
+@functools.cache
+def _packed_sound_class():
+    # Defined on first use, as importing pyglet.media loads the audio libraries, which takes a while.
+    class PackedSound(pyglet.media.StaticSource):
+        """Class PackedSound. Sound whose PCM samples are read directly from the pack, instead of decoding a file."""
+
+        def __init__(self, data, audio_format):
+            self.audio_format = audio_format
+            self._data = data
+            self._duration = len(data) / audio_format.bytes_per_second
+
+    return PackedSound
+
+
+def _source_stamp(path):
+    # Size and modification time of the source of an asset, used to detect assets changed after the pack was built.
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+
+
+class AssetPack:
+    """Class AssetPack. Single file holding the assets of the game ready to use: images as raw RGBA pixels, sounds as raw PCM samples,
+    and other files (recordings, shaders) as they are. It is memory-mapped, so that only the parts of it actually used are read,
+    and images are handed to OpenGL straight from the mapping.
+    Assets whose source changed since the pack was built are ignored, so that the pack never hides an edit of the sources."""
+
+    def __init__(self, path):
+        """Constructor for the class AssetPack. Raises ValueError if the file is not an asset pack of the current format."""
+        with open(path, 'rb') as file:
+            # Copy-on-write, so that ctypes arrays can be created over the mapping. The file itself is never modified.
+            self._mmap = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_COPY)
+
+        magic, version, index_size = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f'{path} is not an asset pack of version {_VERSION}')
+
+        self._index = json.loads(self._mmap[_HEADER.size:_HEADER.size + index_size])
+
+        # Executables built with pyinstaller ship the pack along with the sources it was built from, which cannot change afterwards, and
+        # extract them at each run without keeping their modification times: their stamps are not checked.
+        self._check_sources = not getattr(sys, 'frozen', False)
+
+
+    def _entry(self, path, kind):
+        # Returns the index entry of the asset at path, or None if the pack does not hold an up-to-date copy of it.
+        entry = self._index.get(_asset_name(path))
+        if entry is None or entry['kind'] != kind:
+            return None
+
+        if self._check_sources:
+            try:
+                if _source_stamp(path) != entry['source']:
+                    return None
+            except OSError:
+                pass
+
+        return entry
+
+
+    def _view(self, entry):
+        return memoryview(self._mmap)[entry['offset']:entry['offset'] + entry['size']]
+
+
+    def image(self, path):
+        """Returns the image at path as an ImageData whose pixels are those in the pack, without copying them, or None."""
+        entry = self._entry(path, 'image')
+        if entry is None:
+            return None
+
+        data = (ctypes.c_ubyte * entry['size']).from_buffer(self._mmap, entry['offset'])
+        return pyglet.image.ImageData(entry['width'], entry['height'], 'RGBA', data)
+
+
+    def sound(self, path):
+        """Returns the sound at path as a StaticSource whose samples are those in the pack, or None."""
+        entry = self._entry(path, 'sound')
+        if entry is None:
+            return None
+
+        audio_format = pyglet.media.codecs.AudioFormat(entry['channels'], entry['sample_size'], entry['sample_rate'])
+        return _packed_sound_class()(self._view(entry), audio_format)
+
+
+    def file(self, path):
+        """Returns a binary file object over the contents of the file at path stored in the pack, or None."""
+        entry = self._entry(path, 'file')
+        if entry is None:
+            return None
+
+        return io.BytesIO(self._view(entry))
+
+
+
+
+def _get_pack():
+    # Opens the pack on first use. Missing or outdated packs are not an error: assets are then loaded from their sources.
+    global _pack
+    with _pack_lock:
+        if _pack is None:
+            path = os.environ.get(ASSET_PACK_ENV_VAR, ASSET_PACK_PATH)
+            try:
+                _pack = AssetPack(path) if path else False
+            except (OSError, ValueError):
+                _pack = False
+
+    return _pack or None
+
+
+def load_image(path):
+    """Returns the image at path, from the asset pack if possible."""
+    pack = _get_pack()
+    image = pack.image(path) if pack is not None else None
+    return image if image is not None else pyglet.image.load(path)
+
+
+def load_sound(path):
+    """Returns the sound at path fully decoded, from the asset pack if possible."""
+    pack = _get_pack()
+    sound = pack.sound(path) if pack is not None else None
+    return sound if sound is not None else pyglet.media.load(path, streaming = False)
+
+
+def open_binary(path):
+    """Returns a binary file object over the file at path, from the asset pack if possible. It must be closed by the caller."""
+    pack = _get_pack()
+    file = pack.file(path) if pack is not None else None
+    return file if file is not None else open(path, 'rb')
+
+
+def read_pcm(sound):
+    """Returns the PCM samples of a sound returned by load_sound, as bytes in the format sound.audio_format."""
+    source = sound.get_queue_source()
+    data = bytearray()
+    while (audio_data := source.get_audio_data(1 << 20)) is not None:
+        data += audio_data.data
+
+    return bytes(data)
+
+
+
+
+def _pack_image(path):
+    image = pyglet.image.load(path).get_image_data()
+    # Rows from bottom to top, as expected by OpenGL, so that the pixels can be uploaded as they are.
+    data = image.get_data('RGBA', image.width * 4)
+    return data, {'width': image.width, 'height': image.height}
+
+
+def _pack_sound(path):
+    sound = pyglet.media.load(path, streaming = False)
+    audio_format = sound.audio_format
+    return read_pcm(sound), {'channels': audio_format.channels, 'sample_size': audio_format.sample_size, 'sample_rate': audio_format.sample_rate}
+
+
+def _pack_file(path):
+    with open(path, 'rb') as file:
+        return file.read(), {}
+
+
+def build_asset_pack(path = ASSET_PACK_PATH):
+    """Writes to path the asset pack of all assets of the game, decoding images and sounds with pyglet. Assets which cannot be
+    decoded on this platform (e.g. the .ico icon, without a decoder for it) are left out, and loaded from their sources.
+    Returns a list of (asset name, kind, size of the source, size in the pack), with None sizes for assets left out."""
+    assets = [(GRAPHICS_ATLAS_PATH, 'image'), (WINDOW_ICON_PATH, 'image')]
+    assets += [(sound_path, 'sound') for sound_path in SOUND_EFFECTS_PATHS.values()]
+    assets += [(details['path'], 'file') for details in RECORDINGS_DETAILS.values()]
+    assets += [(shader_path, 'file') for shader_path in (SHADERS_VERT_PATH, SHADERS_GEOM_PATH, SHADERS_FRAG_PATH)]
+    packers = {'image': _pack_image, 'sound': _pack_sound, 'file': _pack_file}
+
+    index, blobs, report = {}, [], []
+    offset = 0
+    for asset_path, kind in assets:
+        name = _asset_name(asset_path)
+        try:
+            data, details = packers[kind](asset_path)
+        except Exception:
+            report.append((name, kind, None, None))
+            continue
+
+        index[name] = {'kind': kind, 'offset': offset, 'size': len(data), 'source': _source_stamp(asset_path), **details}
+        blobs.append(data)
+        report.append((name, kind, os.path.getsize(asset_path), len(data)))
+        offset += -(-len(data) // _ALIGNMENT) * _ALIGNMENT
+
+    # Offsets were computed from the start of the data: shift them past the header and index, whose size depends on them.
+    # Adding a fixed margin to the offsets changes the size of the index by at most a few bytes per entry, hence the loop.
+    data_start = 0
+    while True:
+        shifted = {name: {**entry, 'offset': entry['offset'] + data_start} for name, entry in index.items()}
+        index_bytes = json.dumps(shifted, separators = (',', ':')).encode()
+        required_start = -(-(_HEADER.size + len(index_bytes)) // _ALIGNMENT) * _ALIGNMENT
+        if required_start <= data_start:
+            break
+        data_start = required_start
+
+    # Written to a temporary file first, so that a running game never maps a pack being written.
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, len(index_bytes)))
+        file.write(index_bytes)
+        for (name, entry), data in zip(shifted.items(), blobs):
+            file.write(bytes(entry['offset'] - file.tell()))
+            file.write(data)
+    os.replace(temporary_path, path)
+
+    return report
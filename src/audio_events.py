@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+from src.constants import (AudioEvents,
+                           SoundEffects,
+                           THR_PELLETS_SIREN_SOUNDS)
+
+
+
+class AudioEventBus:
+    """Class AudioEventBus. Receives the sound notifications of the game, and turns them into audio events (tick, event, effect),
+    with event one of AudioEvents and effect one of SoundEffects (or None when stopping effects). Events are passed to each listener
+    added (e.g. Sounds.play_event, playing them live), and recorded in a timeline if record is True (e.g. to render the audio of
+    a game offline with render_wav in src/sounds.py). Ticks are counted with notify_tick, called after each game tick: events of
+    tick t happen t game ticks after the start. It does not depend on pyglet, so that headless games can record their audio."""
+
+    def __init__(self, record = False):
+        """Constructor for the class AudioEventBus."""
+        self._listeners = []
+        self._timeline  = [] if record else None
+        self._tick = 0
+
+        self._munch_counter = 0
+        self._current_loop_effect = None
+
+
+    def add_listener(self, listener):
+        """Adds listener, called with (tick, event, effect) for each audio event."""
+        self._listeners.append(listener)
+
+
+    def notify_tick(self):
+        self._tick += 1
+
+
+    def _emit(self, event, effect = None):
+        if self._timeline is not None:
+            self._timeline.append((self._tick, event, effect))
+
+        for listener in self._listeners:
+            listener(self._tick, event, effect)
+
+
+    def stop(self, only_sirens = False):
+        self._current_loop_effect = None
+        self._emit(AudioEvents.STOP_LOOP if only_sirens else AudioEvents.STOP_ALL)
+
+
+    def _play_once(self, key):
+        self._emit(AudioEvents.PLAY, key)
+
+
+    def _play_repeat(self, key):
+        # Check if already playing.
+        if key == self._current_loop_effect:
+            return
+
+        self._emit(AudioEvents.PLAY_LOOP, key)
+        self._current_loop_effect = key
+
+
+    def notify_pellet_eaten(self):
+        key = SoundEffects.MUNCH_2 if self._munch_counter % 2 else SoundEffects.MUNCH_1
+        self._munch_counter += 1
+
+        self._play_once(key)
+
+
+    def notify_fruit_eaten(self):
+        self._play_once(SoundEffects.EAT_FRUIT)
+
+
+    def notify_ghost_eaten(self):
+        self._play_once(SoundEffects.EAT_GHOST)
+
+
+    def notify_extra_life(self):
+        self._play_once(SoundEffects.EXTRA_LIFE)
+
+
+    def notify_life_lost(self):
+        self._play_once(SoundEffects.LIFE_LOST)
+
+
+    def notify_first_welcome(self):
+        self._play_once(SoundEffects.GAME_START_MUSIC)
+
+
+    def notify_intermission(self):
+        self._play_repeat(SoundEffects.INTERMISSION_MUSIC)
+
+
+    def notify_game_completed(self):
+        self._play_once(SoundEffects.GAME_COMPLETED)
+
+
+    def queue_correct_siren(self, n_pellets, fright_on, any_ghost_retreating):
+        expected_siren = None
+
+        if any_ghost_retreating:
+            expected_siren = SoundEffects.GHOST_RETREATING
+        elif fright_on:
+            expected_siren = SoundEffects.FRIGHT_ON
+        else:
+            for siren_source, threshold in THR_PELLETS_SIREN_SOUNDS:
+                if n_pellets <= threshold:
+                    expected_siren = siren_source
+                    break
+
+        self._play_repeat(expected_siren)
+
+
+    # Defining properties for some private attributes.
+    # timeline is the list of (tick, event, effect) recorded, or None if not recording.
+    tick     = property(lambda self: self._tick)
+    timeline = property(lambda self: self._timeline)
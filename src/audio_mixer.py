@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+import operator
+import functools
+import itertools
+import threading
+from array import array
+
+import pyglet
+
+
+# Format of the samples mixed: mono, signed 16 bits, in the native byte order (little-endian on all platforms supported by pyglet).
+_SAMPLE_TYPECODE = 'h'
+_SAMPLE_MIN = -(1 << 15)
+_SAMPLE_MAX = (1 << 15) - 1
+
+
+
+
+def convert_pcm(data, audio_format, sample_rate):
+    """Returns the PCM samples in data, of audio_format (a pyglet AudioFormat), as an array of mono 16 bits samples at sample_rate.
+    Conversions are done once when effects are loaded, so that the mixer only ever adds samples together."""
+    match audio_format.sample_size:
+        case 8:
+            samples = array(_SAMPLE_TYPECODE, ((byte - 128) << 8 for byte in data))
+        case 16:
+            samples = array(_SAMPLE_TYPECODE, data)
+        case 32:
+            # Most significant half of each sample.
+            samples = array(_SAMPLE_TYPECODE, data)[1::2]
+        case _:
+            raise ValueError(f'Unsupported sample size of {audio_format.sample_size} bits')
+
+    channels = audio_format.channels
+    if channels > 1:
+        samples = array(_SAMPLE_TYPECODE, (sum(frame) // channels for frame in zip(*(samples[c::channels] for c in range(channels)))))
+
+    if audio_format.sample_rate != sample_rate:
+        n_samples = len(samples) * sample_rate // audio_format.sample_rate
+        samples = array(_SAMPLE_TYPECODE, (samples[idx * audio_format.sample_rate // sample_rate] for idx in range(n_samples)))
+
+    return samples
+
+
+
+
+class _Voice:
+    """Class _Voice. Effect being played by a voice of the mixer, from the sample at offset."""
+
+    def __init__(self, samples, loop, start_position):
+        if loop and not samples:
+            raise ValueError('Looping effects must have samples')
+
+        self.samples = samples
+        self.loop = loop
+        self.start_position = start_position   # Position in the stream at which the effect started.
+        self.offset = 0
+
+
+    def read(self, n_samples):
+        # Returns the next n_samples samples, or fewer if the effect ends before.
+        if not self.loop:
+            part = self.samples[self.offset:self.offset + n_samples]
+            self.offset += len(part)
+            return part
+
+        part = array(_SAMPLE_TYPECODE)
+        while len(part) < n_samples:
+            loop_part = self.samples[self.offset:self.offset + n_samples - len(part)]
+            part += loop_part
+            self.offset = (self.offset + len(loop_part)) % len(self.samples)
+        return part
+
+
+    ended = property(lambda self: not self.loop and self.offset >= len(self.samples))
+
+
+
+
+class AudioMixer:
+    """Class AudioMixer. Mixes effects played by a fixed number of voices into a single stream of mono 16 bits samples, played by
+    a single pyglet Player. Each voice plays at most one effect at a time, and starting an effect on a voice replaces the one it plays.
+    Effects start at the game tick requesting them, plus latency_ticks: the stream is mixed in chunks, whose size depends on the audio
+    driver, ahead of being played, and scheduling effects ahead lets effects requested in consecutive ticks start exactly one tick
+    apart within a chunk. Whenever the game and the stream drift apart (e.g. when the window stalls), effects start as soon as possible.
+    Effects are requested from the main thread, and the stream is mixed from the thread of the audio driver."""
+
+    def __init__(self, n_voices, sample_rate, tick_interval, latency_ticks):
+        """Constructor for the class AudioMixer. tick_interval is the duration of a game tick, in seconds."""
+        self._sample_rate = sample_rate
+        self._samples_per_tick = sample_rate * tick_interval
+        self._latency_samples = round(latency_ticks * self._samples_per_tick)
+
+        self._voices = [None] * n_voices   # _Voice playing on each voice, or None.
+        self._lock = threading.Lock()
+
+        # Commands to apply once the stream reaches their position, as (position, sequence number, method, arguments), sorted.
+        self._commands = []
+        self._sequence = itertools.count()
+
+        self._anchor = None      # (tick, position in the stream) at which effects requested during that tick start.
+        self._position = 0       # Number of samples mixed so far.
+
+
+    def play(self, samples, voices, tick, loop = False):
+        """Starts playing samples (as returned by convert_pcm) at game tick tick, on the first of voices not playing anything when
+        the effect starts, or on the one which started playing first if all are."""
+        self._schedule(tick, self._start_voice, tuple(voices), samples, loop)
+
+
+    def stop(self, voices, tick):
+        """Stops the effects played by voices at game tick tick, including the ones started during that tick before."""
+        self._schedule(tick, self._stop_voices, tuple(voices))
+
+
+    def _schedule(self, tick, method, *arguments):
+        with self._lock:
+            position = self._tick_position(tick)
+            bisect.insort(self._commands, (position, next(self._sequence), method, arguments))
+
+
+    def _tick_position(self, tick):
+        # Position in the stream at which effects of tick start. Ticks are mapped to positions relative to an anchor, moved
+        # whenever this position is no longer in the range in which effects can start exactly on time.
+        if self._anchor is not None:
+            anchor_tick, anchor_position = self._anchor
+            position = anchor_position + round((tick - anchor_tick) * self._samples_per_tick)
+            if self._position <= position <= self._position + 2 * self._latency_samples:
+                return position
+
+        self._anchor = (tick, self._position + self._latency_samples)
+        return self._anchor[1]
+
+
+    def _start_voice(self, voices, samples, loop, position):
+        idx = min(voices, key = lambda idx: -1 if self._voices[idx] is None else self._voices[idx].start_position)
+        self._voices[idx] = _Voice(samples, loop, position)
+
+
+    def _stop_voices(self, voices, position):
+        for idx in voices:
+            self._voices[idx] = None
+
+
+    def mix(self, n_samples):
+        """Returns the next n_samples samples of the stream, as bytes."""
+        chunk = array(_SAMPLE_TYPECODE)
+
+        with self._lock:
+            end = self._position + n_samples
+            while self._position < end:
+                # Commands scheduled in the past (requested while the stream was not played) are applied as soon as possible.
+                while self._commands and self._commands[0][0] <= self._position:
+                    _, _, method, arguments = self._commands.pop(0)
+                    method(*arguments, self._position)
+
+                stop = min(self._commands[0][0], end) if self._commands else end
+                chunk += self._mix_voices(stop - self._position)
+                self._position = stop
+
+        return chunk.tobytes()
+
+
+    def _mix_voices(self, n_samples):
+        parts = []
+        for idx, voice in enumerate(self._voices):
+            if voice is not None:
+                parts.append(voice.read(n_samples))
+                if voice.ended:
+                    self._voices[idx] = None
+
+        if not parts:
+            return array(_SAMPLE_TYPECODE, bytes(2 * n_samples))
+        if len(parts) == 1 and len(parts[0]) == n_samples:
+            return parts[0]
+
+        mixed = [0] * n_samples
+        for part in parts:
+            mixed[:len(part)] = map(operator.add, mixed, part)
+
+        if max(mixed) > _SAMPLE_MAX or min(mixed) < _SAMPLE_MIN:
+            mixed = [min(max(sample, _SAMPLE_MIN), _SAMPLE_MAX) for sample in mixed]
+
+        return array(_SAMPLE_TYPECODE, mixed)
+
+
+    def create_source(self):
+        """Returns a pyglet Source streaming the mix endlessly, to be played by a Player."""
+        return _mixer_source_class()(self)
+
+
+    sample_rate = property(lambda self: self._sample_rate)
+
+
+
+
+@functools.cache
+def _mixer_source_class():
+    # Defined on first use, as importing pyglet.media loads the audio libraries, which takes a while.
+    class MixerSource(pyglet.media.Source):
+        """Class MixerSource. Endless pyglet Source of the samples mixed by an AudioMixer."""
+
+        def __init__(self, mixer):
+            self.audio_format = pyglet.media.codecs.AudioFormat(channels = 1, sample_size = 16, sample_rate = mixer.sample_rate)
+            self._mixer = mixer
+            self._offset = 0
+
+
+        def get_audio_data(self, num_bytes, compensation_time = 0.0):
+            n_samples = max(int(num_bytes) // 2, 1)
+            data = self._mixer.mix(n_samples)
+
+            timestamp = self._offset / self.audio_format.sample_rate
+            self._offset += n_samples
+            return pyglet.media.codecs.AudioData(data, len(data), timestamp, n_samples / self.audio_format.sample_rate, [])
+
+
+        def is_precise(self):
+            return True
+
+    return MixerSource
@@ -0,0 +1,1087 @@
+# -*- coding: utf-8 -*-
+
+from random import Random
+
+import numpy as np
+
+from src.engine.simulation import SimulationState
+from src.game_objects.maze import Maze
+from src.game_objects.fixed_point import (UNITS_SHIFT,
+                                          UNITS_PER_TILE,
+                                          UNITS_OFFSET_MASK,
+                                          UNITS_TILE_CENTER,
+                                          to_units,
+                                          from_units,
+                                          pacman_speed_units,
+                                          ghosts_speed_units)
+
+from src.directions import Vector2
+from src.constants import (MazeTiles,
+                           MAZE_START_TILES,
+                           MAZE_TILES_COLS,
+                           MAZE_TILES_ROWS,
+                           MAZE_START_NUM_PELLET,
+                           WARP_TUNNEL_ROW,
+                           WARP_TUNNEL_COL_LEFT,
+                           WARP_TUNNEL_COL_RIGHT,
+                           WARP_TUNNEL_TELEPORT_MARGIN,
+                           PacManStates,
+                           PACMAN_START_POSITION,
+                           PACMAN_PELLET_PENALTIES,
+                           CruiseElroyLevel,
+                           CRUISE_ELROY_PELLETS_THR,
+                           LevelStates,
+                           LEVEL_STATES_DURATION,
+                           SCORE_POINTS_EAT_PELLET,
+                           SCORE_POINTS_EAT_POWER_PELLET,
+                           SCORE_POINTS_EAT_GHOST_BASE,
+                           SCORE_POINTS_EAT_FRUIT,
+                           STARTING_LIVES_PACMAN,
+                           EXTRA_LIFE_POINTS_REQUIREMENT,
+                           FRUIT_SPAWN_THRESHOLDS,
+                           FRUIT_SPAWN_POSITION,
+                           FRUIT_TIME_ACTIVE_RANGE,
+                           FRIGHT_TIME_AND_FLASHES,
+                           Ghost,
+                           GhostBehaviour,
+                           GHOSTS_START_POSITIONS,
+                           GHOSTS_START_DIRECTIONS,
+                           GHOSTS_START_BEHAVIOUR,
+                           GHOSTS_FORBIDDEN_TURNING_UP_TILES,
+                           GHOSTS_SCATTER_MODE_TARGET_TILES,
+                           GHOSTS_EATEN_TARGET_TILE,
+                           GHOSTS_EATEN_TARGET_Y_IN_HOUSE,
+                           SCATTER_CHASE_ALTERNATIONS,
+                           DOT_COUNTER_LIMIT,
+                           DOT_GLOBAL_COUNTER_LIMIT,
+                           DOTS_NOT_EATEN_TIMER_THR,
+                           PRNG_ROM_MEM,
+                           PRNG_ROM_DIRECTION_BITS,
+                           PRNG_BITS_TO_DIRECTION,
+                           LEVEL_WITH_INTERMISSIONS,
+                           GAME_COMPLETED_LEVEL)
+
+
+# Directions are stored as integer codes indexing _DIRECTIONS, ordered by preference of ghosts in case of equal distances.
+# Code _NONE stands for no direction, and is also used as Vector2.ZERO when a ghost decides from its current tile.
+_DIRECTIONS = (Vector2.UP, Vector2.LEFT, Vector2.DOWN, Vector2.RIGHT)
+_UP, _LEFT, _DOWN, _RIGHT, _NONE = range(5)
+_CODE_OF_DIRECTION = {direction: code for code, direction in enumerate(_DIRECTIONS)}
+_DX      = np.array([0, -1, 0, 1, 0])
+_DY      = np.array([-1, 0, 1, 0, 0])
+_REVERSE = np.array([_DOWN, _RIGHT, _UP, _LEFT, _NONE])
+_CLOCKWISE = np.array([_UP, _RIGHT, _DOWN, _LEFT])
+_CLOCKWISE_INDEX = np.array([0, 3, 2, 1])
+
+# Flags of GhostBehaviour as plain integers.
+_CHASE, _SCATTER, _FRIGHTENED, _IN_HOUSE, _EXITING_HOUSE, _GOING_TO_HOUSE, _ENTERING_HOUSE = (int(flag) for flag in GhostBehaviour)
+_HOUSE_FLAGS = _IN_HOUSE | _EXITING_HOUSE | _GOING_TO_HOUSE | _ENTERING_HOUSE
+
+# Level states as plain integers, and their durations. Infinite durations are replaced by a counter that never reaches zero.
+_FIRST_WELCOME, _READY, _PLAYING, _DEATH, _COMPLETED, _INTERMISSION, _GAME_OVER, \
+    _PAUSE_AFTER_EATING, _PAUSE_BEFORE_DEATH, _PAUSE_BEFORE_COMPLETED = (int(state) for state in LevelStates)
+_INFINITE_COUNTER = 1 << 62
+_STATE_DURATION = np.zeros(max(LevelStates) + 1, dtype = np.int64)
+for _state, _duration in LEVEL_STATES_DURATION.items():
+    _STATE_DURATION[_state] = _duration if _duration != float('inf') else _INFINITE_COUNTER
+
+_SPAWNING, _MOVING, _STUCK, _TURNING, _DEAD = (int(state) for state in PacManStates)
+
+
+# Rules depending on the level, tabulated once from the functions in src.constants for every level up to the last one of the game.
+_MAX_LEVEL = GAME_COMPLETED_LEVEL
+_LEVELS = range(1, _MAX_LEVEL + 1)
+
+def _tabulate(function, dtype):
+    table = np.array([function(level) for level in _LEVELS], dtype = dtype)
+    return np.concatenate((table[:1], table)) # Index 0 is never used, it is only there so that levels can be used as indices directly.
+
+_PACMAN_SPEED     = _tabulate(lambda level: [pacman_speed_units(level, fright) for fright in (False, True)], np.int64)
+_GHOSTS_SPEED     = _tabulate(lambda level: [[[[[ghosts_speed_units(level, fright, in_warp_tunnel, going_to_house, in_or_exiting_house, cruise_elroy)
+                                                 for cruise_elroy in CruiseElroyLevel]
+                                                for in_or_exiting_house in (False, True)]
+                                               for going_to_house in (False, True)]
+                                              for in_warp_tunnel in (False, True)]
+                                             for fright in (False, True)], np.int64)
+_MODE_END_TIME    = _tabulate(lambda level: [duration for _, duration in SCATTER_CHASE_ALTERNATIONS(level)], np.float64).cumsum(axis = 1)
+_MODE             = _tabulate(lambda level: [int(mode) for mode, _ in SCATTER_CHASE_ALTERNATIONS(level)], np.int64)
+_FRIGHT_TIME      = _tabulate(lambda level: FRIGHT_TIME_AND_FLASHES(level)[0], np.float64)
+_ELROY_THR        = _tabulate(CRUISE_ELROY_PELLETS_THR, np.int64)
+_DOT_LIMIT        = _tabulate(lambda level: [DOT_COUNTER_LIMIT(ghost, level) for ghost in Ghost], np.int64)
+_DOTS_TIMER       = _tabulate(DOTS_NOT_EATEN_TIMER_THR, np.float64)
+_FRUIT_POINTS     = _tabulate(SCORE_POINTS_EAT_FRUIT, np.int64)
+_HAS_INTERMISSION = _tabulate(lambda level: level in LEVEL_WITH_INTERMISSIONS, np.bool_)
+
+# Global dot counter limits, with Blinky never using it as it never waits in the house.
+_DOT_GLOBAL_LIMIT = np.array([-1] + [DOT_GLOBAL_COUNTER_LIMIT[ghost] for ghost in (Ghost.PINKY, Ghost.INKY, Ghost.CLYDE)])
+
+
+# Static tables of the maze, padded on all sides so that characters in the warp tunnel and the tiles around them can be looked up.
+_PAD_ROWS = 3
+_PAD_COLS = 6
+
+def _padded_grid(function):
+    return np.array([[function(row, col) for col in range(-_PAD_COLS, MAZE_TILES_COLS + _PAD_COLS)]
+                                         for row in range(-_PAD_ROWS, MAZE_TILES_ROWS + _PAD_ROWS)])
+
+_NOT_WALKABLE = np.stack([_padded_grid(lambda row, col, door = door: Maze().tile_is_not_walkable((row, col), door)) for door in (False, True)])
+_FORBIDDEN_UP = _padded_grid(lambda row, col: Vector2(col + 0.5, row + 0.5) in GHOSTS_FORBIDDEN_TURNING_UP_TILES)
+
+# Pellets are indexed in the same order as the bits of the bitmap of Maze.
+_PELLET_TILES   = [index for index, tile in enumerate(MAZE_START_TILES) if tile in (MazeTiles.PELLET, MazeTiles.POWER_PELLET)]
+_PELLET_OF_TILE = _padded_grid(lambda row, col: _PELLET_TILES.index(row * MAZE_TILES_COLS + col)
+                                                if 0 <= row < MAZE_TILES_ROWS and 0 <= col < MAZE_TILES_COLS and row * MAZE_TILES_COLS + col in _PELLET_TILES else -1)
+_PELLET_IS_POWER = np.array([MAZE_START_TILES[index] == MazeTiles.POWER_PELLET for index in _PELLET_TILES])
+_PELLET_BIT_VALUES = [1 << bit for bit in range(MAZE_START_NUM_PELLET)]
+
+# Pseudo-random directions of frightened ghosts, for each index of the PRNG.
+_PRNG_DIRECTION = np.array([_CODE_OF_DIRECTION[PRNG_BITS_TO_DIRECTION[bits]] for bits in PRNG_ROM_DIRECTION_BITS])
+_PRNG_MEM_SIZE = len(PRNG_ROM_MEM)
+
+# Positions in fixed_point units, and targets in half tiles.
+_PACMAN_START = (to_units(PACMAN_START_POSITION.x), to_units(PACMAN_START_POSITION.y))
+_GHOSTS_START_X = np.array([to_units(GHOSTS_START_POSITIONS[ghost].x) for ghost in Ghost])[:, None]
+_GHOSTS_START_Y = np.array([to_units(GHOSTS_START_POSITIONS[ghost].y) for ghost in Ghost])[:, None]
+_GHOSTS_START_DIRECTION = np.array([_CODE_OF_DIRECTION[GHOSTS_START_DIRECTIONS[ghost]] for ghost in Ghost])[:, None]
+_GHOSTS_START_BEHAVIOUR = np.array([int(GHOSTS_START_BEHAVIOUR[ghost]) for ghost in Ghost])[:, None]
+_GHOSTS_START_X_HALVES = [int(GHOSTS_START_POSITIONS[ghost].x * 2) for ghost in Ghost]
+_HOUSE_EXIT_HALVES = (int(GHOSTS_START_POSITIONS[Ghost.PINKY].x * 2), int(GHOSTS_START_POSITIONS[Ghost.BLINKY].y * 2))
+_HOUSE_ENTRANCE_HALVES = (int(GHOSTS_START_POSITIONS[Ghost.BLINKY].x * 2), int(GHOSTS_START_POSITIONS[Ghost.BLINKY].y * 2))
+_HOUSE_ENTER_Y_HALVES = int(GHOSTS_EATEN_TARGET_Y_IN_HOUSE * 2)
+_SCATTER_TARGET_HALVES = [(int(GHOSTS_SCATTER_MODE_TARGET_TILES[ghost].x * 2), int(GHOSTS_SCATTER_MODE_TARGET_TILES[ghost].y * 2)) for ghost in Ghost]
+_EATEN_TARGET_HALVES = (int(GHOSTS_EATEN_TARGET_TILE.x * 2), int(GHOSTS_EATEN_TARGET_TILE.y * 2))
+_FRUIT_UNITS = (to_units(FRUIT_SPAWN_POSITION.x), to_units(FRUIT_SPAWN_POSITION.y))
+_CLYDE_SHY_DISTANCE_SQUARED = 64 * UNITS_PER_TILE ** 2
+_WARP_EDGES = (-WARP_TUNNEL_TELEPORT_MARGIN * UNITS_PER_TILE, (MAZE_TILES_COLS + WARP_TUNNEL_TELEPORT_MARGIN) * UNITS_PER_TILE)
+
+
+def _floor_tile(units):
+    # Tile used by the fixed-point movement core.
+    return units >> UNITS_SHIFT
+
+def _trunc_tile(units):
+    # Tile used by the rest of the game, which truncates floating point positions with int().
+    return np.where(units >= 0, units >> UNITS_SHIFT, -((-units) >> UNITS_SHIFT))
+
+def _not_walkable(row, col, collide_with_door = True):
+    return _NOT_WALKABLE[np.asarray(collide_with_door, dtype = np.int64), row + _PAD_ROWS, col + _PAD_COLS]
+
+def _round_to_halves(units):
+    # Same as Vector2.round_to_nearest_half, in half tiles. Both round halves to even.
+    return np.round(units / (UNITS_PER_TILE // 2)).astype(np.int64)
+
+def _trunc_half_tile(halves):
+    # Same as int() on a coordinate expressed in half tiles.
+    return np.where(halves >= 0, halves // 2, -((-halves) // 2))
+
+
+def _move_within_tile(x, y, direction, distance, collide_with_door):
+    # Vectorised counterpart of Character._update_position_within_tile_fixed, returning the new coordinates instead of setting them.
+    horizontal = _DX[direction] != 0
+    sign = _DX[direction] + _DY[direction]
+    coord = np.where(horizontal, x, y)
+    other_tile = _floor_tile(np.where(horizontal, y, x))
+
+    # Clip distance so that it won't go past the next tile center or edge.
+    offset = coord & UNITS_OFFSET_MASK
+    max_distance = np.where(sign > 0, np.where(offset < UNITS_TILE_CENTER, UNITS_TILE_CENTER - offset, UNITS_PER_TILE - offset),
+                                      np.where(offset > UNITS_TILE_CENTER, offset - UNITS_TILE_CENTER, offset + 1))
+    new_distance = np.minimum(max_distance, distance)
+    residual_distance = distance - new_distance
+    coord = coord + sign * new_distance
+
+    # Check if movement will cause a collision, looking at the tile half a tile ahead. If so, clip instead of moving into wall.
+    collision_coord = np.where(sign > 0, coord + UNITS_TILE_CENTER, coord - UNITS_TILE_CENTER - 1)
+    tile, collision_tile = _floor_tile(coord), _floor_tile(collision_coord)
+    in_wall = _not_walkable(np.where(horizontal, other_tile, tile), np.where(horizontal, tile, other_tile), collide_with_door)
+    collision = ~in_wall & _not_walkable(np.where(horizontal, other_tile, collision_tile), np.where(horizontal, collision_tile, other_tile), collide_with_door)
+    coord = np.where(in_wall, coord - sign * UNITS_TILE_CENTER, coord)
+    coord = np.where(collision, (coord & ~UNITS_OFFSET_MASK) + UNITS_TILE_CENTER, coord)
+    is_stuck = in_wall | collision
+
+    # Perform warping if needed.
+    left_warp_edge, right_warp_edge = _WARP_EDGES
+    tile = _floor_tile(coord)
+    warp = horizontal & (other_tile == WARP_TUNNEL_ROW) & ((tile <= WARP_TUNNEL_COL_LEFT) | (tile >= WARP_TUNNEL_COL_RIGHT))
+    coord = np.where(warp & (coord > right_warp_edge), left_warp_edge + (coord - right_warp_edge), coord)
+    coord = np.where(warp & (coord < left_warp_edge), right_warp_edge - (left_warp_edge - coord), coord)
+
+    # Calculate if at new position we are at a tile center or edge.
+    offset = coord & UNITS_OFFSET_MASK
+    is_at_tile_center = offset == UNITS_TILE_CENTER
+    is_at_tile_edge   = offset == np.where(sign > 0, 0, UNITS_OFFSET_MASK)
+
+    return np.where(horizontal, coord, x), np.where(horizontal, y, coord), residual_distance, is_stuck, is_at_tile_center, is_at_tile_edge
+
+
+
+
+
+class BatchSimulation:
+    """Class BatchSimulation. Game engine advancing n_games independent games in lock-step, each one equivalent to a
+    Simulation with fixed_point_movement set to True. The state of all games is held in structure-of-arrays NumPy buffers,
+    and each tick is computed with vectorised operations over all games at once.
+    It is meant for AI training and parameter sweeps, hence no Graphics or Sounds can be attached."""
+
+    # Pac-Man directions are requested with the index of the direction in this tuple.
+    DIRECTIONS = _DIRECTIONS
+
+    def __init__(self, n_games, start_level = 1, seeds = None):
+        """Constructor for the class BatchSimulation. Each game draws the duration of its fruits from its own random generator,
+        seeded with the corresponding element of seeds (or randomly if seeds is None), as the seed of a Simulation. Its state is part of the snapshots of the game."""
+        self._n_games = n_games
+        self._start_level = start_level
+        self._fruit_rngs = [Random(seed) for seed in (seeds if seeds is not None else [None] * n_games)]
+
+        integers = lambda *shape: np.zeros(shape + (n_games,), dtype = np.int64)
+        booleans = lambda *shape: np.zeros(shape + (n_games,), dtype = np.bool_)
+
+        # Game.
+        self._level = integers()
+        self._lives = integers()
+        self._extra_life_awarded = booleans()
+        self._level_state = integers()
+        self._level_state_counter = integers()
+        self._fright_counter = np.zeros(n_games, dtype = np.float64) # Fright durations are not whole numbers of ticks.
+        self._fruit_visible_counter = integers()
+        self._score = integers()
+        self._ghost_eaten_same_fright = integers()
+        self._pellets = np.zeros((n_games, MAZE_START_NUM_PELLET), dtype = np.bool_)
+        self._n_pellets = integers()
+
+        # Pac-Man.
+        self._pacman_x = integers()
+        self._pacman_y = integers()
+        self._pacman_old_x = integers()
+        self._pacman_old_y = integers()
+        self._pacman_direction = integers()
+        self._pacman_direction_input = integers()
+        self._pacman_state = integers()
+        self._pacman_penalty = integers()
+
+        # Ghosts, one row per ghost.
+        self._ghosts_x = integers(len(Ghost))
+        self._ghosts_y = integers(len(Ghost))
+        self._ghosts_direction = integers(len(Ghost))
+        self._ghosts_direction_next = integers(len(Ghost))
+        self._ghosts_direction_next_next = integers(len(Ghost))
+        self._ghosts_behaviour = integers(len(Ghost))
+        self._ghosts_reverse_direction_signal = booleans(len(Ghost))
+        self._ghosts_going_from_tile_edge_to_center = booleans(len(Ghost))
+        self._ghosts_cruise_elroy_level = integers(len(Ghost))
+        self._ghosts_was_just_eaten = booleans(len(Ghost))
+
+        # Ghosts coordinator.
+        self._died_this_level = booleans()
+        self._mode_timer = integers()
+        self._rng_index = integers()
+        self._time_since_dot_eaten = integers()
+        self._dot_counter_ghosts = integers(len(Ghost))
+        self._dot_counter_global = integers()
+        self._dot_counter_global_enable = booleans()
+
+        # Values shared by the methods updating a tick.
+        self._fright = booleans()
+        self._clyde_in_house = booleans()
+
+        self.reset(np.arange(n_games))
+
+
+    def reset(self, indices, seeds = None):
+        """Starts a new game in each of the games at the given indices. If seeds is not None, the random generators of these games
+        are seeded again with its elements, otherwise they go on with their current sequence."""
+        indices = np.asarray(indices, dtype = np.int64)
+        if seeds is not None:
+            for index, seed in zip(indices, seeds):
+                self._fruit_rngs[index].seed(seed)
+
+        self._score[indices] = 0
+        self._ghost_eaten_same_fright[indices] = -1 # No fright yet.
+        self._lives[indices] = STARTING_LIVES_PACMAN
+        self._extra_life_awarded[indices] = False
+        self._level[indices] = self._start_level - 1
+
+        self._set_level_state(indices, _FIRST_WELCOME)
+        self._reset_level(indices, new = True)
+
+
+    def _reset_level(self, indices, new):
+        if new:
+            self._level[indices] += 1
+            self._pellets[indices] = True
+            self._n_pellets[indices] = MAZE_START_NUM_PELLET
+
+            self._died_this_level[indices] = False
+            self._reset_ghosts(indices)
+            self._dot_counter_ghosts[:, indices] = 0
+            self._dot_counter_global[indices] = 0
+            self._dot_counter_global_enable[indices] = False
+
+        self._pacman_x[indices], self._pacman_y[indices] = _PACMAN_START
+        self._pacman_old_x[indices], self._pacman_old_y[indices] = _PACMAN_START
+        self._pacman_direction[indices] = _LEFT
+        self._pacman_direction_input[indices] = _NONE
+        self._pacman_state[indices] = _SPAWNING
+        self._pacman_penalty[indices] = 0
+
+        self._fright_counter[indices] = 0
+        self._fruit_visible_counter[indices] = 0
+
+
+    def _reset_ghosts(self, indices):
+        self._mode_timer[indices] = 0
+        self._rng_index[indices] = 0
+        self._time_since_dot_eaten[indices] = 0
+
+        self._ghosts_x[:, indices] = _GHOSTS_START_X
+        self._ghosts_y[:, indices] = _GHOSTS_START_Y
+        self._ghosts_direction[:, indices] = _GHOSTS_START_DIRECTION
+        self._ghosts_direction_next[:, indices] = _NONE
+        self._ghosts_direction_next_next[:, indices] = _NONE
+        self._ghosts_direction_next[Ghost.BLINKY, indices] = _LEFT
+        self._ghosts_direction_next_next[Ghost.BLINKY, indices] = _LEFT
+        self._ghosts_behaviour[:, indices] = _GHOSTS_START_BEHAVIOUR
+        self._ghosts_reverse_direction_signal[:, indices] = False
+        self._ghosts_going_from_tile_edge_to_center[:, indices] = False
+        self._ghosts_cruise_elroy_level[:, indices] = CruiseElroyLevel.NULL
+        self._ghosts_was_just_eaten[:, indices] = False
+
+
+    def set_directions(self, directions):
+        """Requests Pac-Man to move along a direction in each game. directions holds, for each game, the index of the direction
+        in BatchSimulation.DIRECTIONS, or any other value (e.g. -1) to leave the game without request."""
+        directions = np.asarray(directions)
+        requested = (directions >= 0) & (directions < len(_DIRECTIONS))
+        self._pacman_direction_input[requested] = directions[requested]
+
+
+    def snapshot(self, index):
+        """Returns the whole state of the game at index as a SimulationState, which can be compared with the one of a Simulation
+        or restored into it. As high scores are not tracked, the high score is the score of the game itself."""
+        level_state_counter = int(self._level_state_counter[index])
+        if level_state_counter > _INFINITE_COUNTER // 2:
+            level_state_counter = float('inf')
+
+        ghost_eaten_same_fright = self._ghost_eaten_same_fright[index]
+        score = (int(self._score[index]), int(self._score[index]), None if ghost_eaten_same_fright < 0 else int(ghost_eaten_same_fright))
+
+        bitmap = sum(bit for bit, present in zip(_PELLET_BIT_VALUES, self._pellets[index].tolist()) if present)
+        maze = (bitmap, int(self._n_pellets[index]))
+
+        direction = lambda code: _DIRECTIONS[code] if code != _NONE else None
+        pacman = (from_units(int(self._pacman_x[index])), from_units(int(self._pacman_y[index])),
+                  from_units(int(self._pacman_old_x[index])), from_units(int(self._pacman_old_y[index])),
+                  direction(self._pacman_direction[index]), direction(self._pacman_direction_input[index]),
+                  PacManStates(self._pacman_state[index]), int(self._pacman_penalty[index]))
+
+        ghosts = tuple((from_units(int(self._ghosts_x[ghost, index])), from_units(int(self._ghosts_y[ghost, index])),
+                        direction(self._ghosts_direction[ghost, index]), direction(self._ghosts_direction_next[ghost, index]),
+                        direction(self._ghosts_direction_next_next[ghost, index]), GhostBehaviour(self._ghosts_behaviour[ghost, index]),
+                        bool(self._ghosts_reverse_direction_signal[ghost, index]), bool(self._ghosts_going_from_tile_edge_to_center[ghost, index]),
+                        CruiseElroyLevel(self._ghosts_cruise_elroy_level[ghost, index]), bool(self._ghosts_was_just_eaten[ghost, index]))
+                       for ghost in Ghost)
+        coordinator = (bool(self._died_this_level[index]), int(self._mode_timer[index]), int(self._rng_index[index]),
+                       int(self._time_since_dot_eaten[index]), tuple(self._dot_counter_ghosts[:, index].tolist()),
+                       int(self._dot_counter_global[index]), bool(self._dot_counter_global_enable[index]), ghosts)
+
+        return SimulationState(int(self._level[index]), int(self._lives[index]), bool(self._extra_life_awarded[index]),
+                               LevelStates(self._level_state[index]), level_state_counter, float(self._fright_counter[index]),
+                               int(self._fruit_visible_counter[index]), score, maze, pacman, coordinator, self._fruit_rngs[index].getstate())
+
+
+    def restore(self, index, state):
+        """Restores the state of the game at index from a SimulationState returned by BatchSimulation.snapshot or Simulation.snapshot.
+        The latter must come from a Simulation with fixed_point_movement, so that positions are whole numbers of units."""
+        self._level[index], self._lives[index], self._extra_life_awarded[index], self._level_state[index], level_state_counter, \
+            self._fright_counter[index], self._fruit_visible_counter[index], score, maze, pacman, coordinator, random_state = state
+        self._fruit_rngs[index].setstate(random_state)
+
+        self._level_state_counter[index] = level_state_counter if level_state_counter != float('inf') else _INFINITE_COUNTER
+        self._score[index], _, ghost_eaten_same_fright = score
+        self._ghost_eaten_same_fright[index] = ghost_eaten_same_fright if ghost_eaten_same_fright is not None else -1
+
+        bitmap, self._n_pellets[index] = maze
+        self._pellets[index] = [bool(bitmap & bit) for bit in _PELLET_BIT_VALUES]
+
+        code = lambda direction: _CODE_OF_DIRECTION[direction] if direction is not None else _NONE
+        x, y, old_x, old_y, direction, direction_input, self._pacman_state[index], self._pacman_penalty[index] = pacman
+        self._pacman_x[index], self._pacman_y[index] = to_units(x), to_units(y)
+        self._pacman_old_x[index], self._pacman_old_y[index] = to_units(old_x), to_units(old_y)
+        self._pacman_direction[index], self._pacman_direction_input[index] = code(direction), code(direction_input)
+
+        self._died_this_level[index], self._mode_timer[index], self._rng_index[index], self._time_since_dot_eaten[index], \
+            self._dot_counter_ghosts[:, index], self._dot_counter_global[index], self._dot_counter_global_enable[index], ghosts = coordinator
+        for ghost, (x, y, direction, direction_next, direction_next_next, self._ghosts_behaviour[ghost, index],
+                    self._ghosts_reverse_direction_signal[ghost, index], self._ghosts_going_from_tile_edge_to_center[ghost, index],
+                    self._ghosts_cruise_elroy_level[ghost, index], self._ghosts_was_just_eaten[ghost, index]) in zip(Ghost, ghosts):
+            self._ghosts_x[ghost, index], self._ghosts_y[ghost, index] = to_units(x), to_units(y)
+            self._ghosts_direction[ghost, index] = code(direction)
+            self._ghosts_direction_next[ghost, index] = code(direction_next)
+            self._ghosts_direction_next_next[ghost, index] = code(direction_next_next)
+
+
+    def run(self, n_ticks):
+        """Advances all games by n_ticks. Returns the values returned by step at the last tick."""
+        results = None
+        for _ in range(n_ticks):
+            results = self.step()
+
+        return results
+
+
+    def step(self):
+        """Advances all games by one tick. Returns an array holding, for each game, what Simulation.step would return:
+        0 while the game goes on, -1 when the game is over, or the level just completed if it is followed by an intermission or ends the game."""
+        results = np.zeros(self._n_games, dtype = np.int64)
+        level_state = self._level_state.copy()
+
+        # Update level state.
+        playing = np.flatnonzero(level_state == _PLAYING)
+        self._update_game(playing)
+
+        pause_after_eating = np.flatnonzero(level_state == _PAUSE_AFTER_EATING)
+        self._fright[pause_after_eating] = True
+        self._update_ghosts(pause_after_eating, update_only_transparent = True)
+
+        # Transition to new level state if needed.
+        change_state = self._level_state_counter <= 0
+        self._level_state_counter -= 1
+
+        indices = np.flatnonzero((level_state == _FIRST_WELCOME) & change_state)
+        self._set_level_state(indices, _READY)
+        self._lives[indices] -= 1
+
+        indices = np.flatnonzero((level_state == _READY) & change_state)
+        self._set_level_state(indices, _PLAYING)
+        self._pacman_state[indices] = _MOVING
+
+        indices = np.flatnonzero((level_state == _DEATH) & change_state)
+        self._lives[indices] -= 1
+        alive = self._lives[indices] >= 0
+        self._set_level_state(indices[alive], _READY)
+        self._reset_level(indices[alive], new = False)
+        self._set_level_state(indices[~alive], _GAME_OVER)
+
+        indices = np.flatnonzero((level_state == _COMPLETED) & change_state)
+        intermission = _HAS_INTERMISSION[np.minimum(self._level[indices], _MAX_LEVEL)]
+        self._set_level_state(indices[intermission], _INTERMISSION)
+        indices = indices[~intermission]
+        self._set_level_state(indices, _READY)
+        self._reset_level(indices, new = True)
+        indices = indices[self._level[indices] == GAME_COMPLETED_LEVEL]
+        results[indices] = self._level[indices]
+
+        indices = np.flatnonzero(level_state == _INTERMISSION)
+        results[indices] = self._level[indices]
+        self._set_level_state(indices, _READY)
+        self._reset_level(indices, new = True)
+
+        results[(level_state == _GAME_OVER) & change_state] = -1
+
+        pause_after_eating = np.flatnonzero((level_state == _PAUSE_AFTER_EATING) & change_state)
+        self._set_level_state(pause_after_eating, _PLAYING)
+        self._ghosts_was_just_eaten[:, pause_after_eating] = False
+
+        indices = np.flatnonzero((level_state == _PAUSE_BEFORE_DEATH) & change_state)
+        self._set_level_state(indices, _DEATH)
+        self._pacman_state[indices] = _DEAD
+        self._notify_life_lost(indices)
+
+        indices = np.flatnonzero((level_state == _PAUSE_BEFORE_COMPLETED) & change_state)
+        self._set_level_state(indices, _COMPLETED)
+
+        # Test if collision with another ghost happened in the same spot as the ghost just eaten.
+        self._calculate_new_game_state(np.union1d(playing, pause_after_eating))
+
+        return results
+
+
+    def _set_level_state(self, indices, new_state):
+        self._level_state[indices] = new_state
+        self._level_state_counter[indices] = _STATE_DURATION[new_state]
+
+
+    def _update_game(self, indices):
+        fright = self._fright_counter[indices] > 0
+        self._fright_counter[indices[fright]] -= 1
+        self._fright[indices] = fright
+
+        fruit_visible = indices[self._fruit_visible_counter[indices] > 0]
+        self._fruit_visible_counter[fruit_visible] -= 1
+
+        self._update_pacman(indices)
+        self._update_ghosts(indices, update_only_transparent = False)
+
+
+    def _calculate_new_game_state(self, indices):
+        pacman_x = self._pacman_x[indices]
+        pacman_y = self._pacman_y[indices]
+
+        # Check if eaten a fruit.
+        fruit_x, fruit_y = _FRUIT_UNITS
+        old_x = self._pacman_old_x[indices]
+        was_on_fruit = (self._fruit_visible_counter[indices] > 0) & (self._pacman_old_y[indices] == fruit_y) & (pacman_y == fruit_y) & \
+                       (((old_x <= fruit_x) & (fruit_x <= pacman_x)) | ((pacman_x <= fruit_x) & (fruit_x <= old_x)))
+        eaten = indices[was_on_fruit]
+        self._fruit_visible_counter[eaten] = 0
+        self._score[eaten] += _FRUIT_POINTS[np.minimum(self._level[eaten], _MAX_LEVEL)]
+
+        # Check if eaten a pellet.
+        pellet = _PELLET_OF_TILE[_trunc_tile(pacman_y) + _PAD_ROWS, _trunc_tile(pacman_x) + _PAD_COLS]
+        has_pellet = pellet >= 0
+        has_pellet[has_pellet] = self._pellets[indices[has_pellet], pellet[has_pellet]]
+        self._pellet_eaten(indices[has_pellet], pellet[has_pellet])
+
+        # End level if completed.
+        completed = indices[self._n_pellets[indices] == 0]
+        self._set_level_state(completed, _PAUSE_BEFORE_COMPLETED)
+        self._pacman_state[completed] = _SPAWNING
+
+        # Check if collided with any ghosts.
+        life_lost, any_eaten = self._check_collision(indices)
+
+        eaten = indices[any_eaten]
+        self._score[eaten] += SCORE_POINTS_EAT_GHOST_BASE * (2 ** self._ghost_eaten_same_fright[eaten])
+        self._ghost_eaten_same_fright[eaten] += 1
+        self._set_level_state(eaten, _PAUSE_AFTER_EATING)
+        self._set_level_state(indices[life_lost], _PAUSE_BEFORE_DEATH)
+
+        # Update lives if score high enough.
+        extra_life = indices[~self._extra_life_awarded[indices] & (self._score[indices] >= EXTRA_LIFE_POINTS_REQUIREMENT)]
+        self._lives[extra_life] += 1
+        self._extra_life_awarded[extra_life] = True
+
+
+    def _pellet_eaten(self, indices, pellet):
+        self._pellets[indices, pellet] = False
+        self._n_pellets[indices] -= 1
+
+        power = _PELLET_IS_POWER[pellet]
+        self._pacman_penalty[indices] += np.where(power, PACMAN_PELLET_PENALTIES[MazeTiles.POWER_PELLET], PACMAN_PELLET_PENALTIES[MazeTiles.PELLET])
+        self._notify_pellet_eaten(indices)
+        self._score[indices] += np.where(power, SCORE_POINTS_EAT_POWER_PELLET, SCORE_POINTS_EAT_PELLET)
+
+        power = indices[power]
+        fright_duration = _FRIGHT_TIME[np.minimum(self._level[power], _MAX_LEVEL)]
+        self._fright_counter[power] = fright_duration
+        self._ghost_eaten_same_fright[power] = 0
+        self._notify_fright_on(power, fright_duration)
+
+        for index in indices[np.isin(self._n_pellets[indices], FRUIT_SPAWN_THRESHOLDS)]:
+            self._fruit_visible_counter[index] = self._fruit_rngs[index].randint(*FRUIT_TIME_ACTIVE_RANGE)
+
+
+    # ----------------------------------------------------------------
+    # Pac-Man.
+    # ----------------------------------------------------------------
+
+    def _update_pacman(self, indices):
+        state = self._pacman_state[indices]
+
+        # Ignore any request to change direction while spawning or dead.
+        self._pacman_direction_input[indices[(state == _SPAWNING) | (state == _DEAD)]] = _NONE
+        indices = indices[(state == _MOVING) | (state == _STUCK) | (state == _TURNING)]
+
+        # Pac-Man is not allowed to change direction if he is already turning.
+        not_turning = indices[self._pacman_state[indices] != _TURNING]
+        turning = self._update_pacman_direction(not_turning)
+        self._pacman_state[not_turning[turning]] = _TURNING
+
+        # Try to move, and update state based on if Pac-Man is stuck or not, only if not still turning.
+        is_stuck, turning = self._update_pacman_position(indices)
+        self._pacman_state[indices[~turning]] = np.where(is_stuck[~turning], _STUCK, _MOVING)
+
+
+    def _update_pacman_direction(self, indices):
+        direction = self._pacman_direction[indices]
+        direction_input = self._pacman_direction_input[indices]
+
+        # If nothing to do, reset and return.
+        nothing = (direction_input == _NONE) | (direction_input == direction)
+        self._pacman_direction_input[indices[nothing]] = _NONE
+
+        # If turn allowed in that direction, do it.
+        row = _trunc_tile(self._pacman_y[indices] + _DY[direction_input] * UNITS_PER_TILE)
+        col = _trunc_tile(self._pacman_x[indices] + _DX[direction_input] * UNITS_PER_TILE)
+        turning = ~nothing & ~_not_walkable(row, col)
+        self._pacman_direction[indices[turning]] = direction_input[turning]
+        self._pacman_direction_input[indices[turning]] = _NONE
+
+        # If turn will be allowed soon (one-cell forwards), allow anticipating it.
+        row = _trunc_tile(self._pacman_y[indices] + (_DY[direction] + _DY[direction_input]) * UNITS_PER_TILE)
+        col = _trunc_tile(self._pacman_x[indices] + (_DX[direction] + _DX[direction_input]) * UNITS_PER_TILE)
+        self._pacman_direction_input[indices[~nothing & ~turning & _not_walkable(row, col)]] = _NONE
+
+        return turning
+
+
+    def _update_pacman_position(self, indices):
+        self._pacman_old_x[indices] = self._pacman_x[indices]
+        self._pacman_old_y[indices] = self._pacman_y[indices]
+
+        state = self._pacman_state[indices]
+        is_stuck = state == _STUCK
+        turning  = state == _TURNING
+
+        # Update penalty to movement speed.
+        penalty = self._pacman_penalty[indices] > 0
+        self._pacman_penalty[indices[penalty]] -= 1
+
+        distance = _PACMAN_SPEED[np.minimum(self._level[indices], _MAX_LEVEL), self._fright[indices].astype(np.int64)]
+
+        # When turning, specific movement logic needed to bring Pac-Man back to center of corridor.
+        moving = ~penalty & turning
+        selected = indices[moving]
+        x, y, direction, step = self._pacman_x[selected], self._pacman_y[selected], self._pacman_direction[selected], distance[moving]
+        horizontal = _DX[direction] != 0
+        x = x + _DX[direction] * step
+        y = y + _DY[direction] * step
+
+        coord = np.where(horizontal, y, x)
+        offset = ((coord >> UNITS_SHIFT) << UNITS_SHIFT) + UNITS_TILE_CENTER - coord
+        centered = np.abs(offset) <= step
+        coord = np.where(centered, coord + offset, np.where(offset >= 0, coord + step, coord - step))
+        self._pacman_x[selected] = np.where(horizontal, x, coord)
+        self._pacman_y[selected] = np.where(horizontal, coord, y)
+        is_stuck[moving] = False
+        turning[moving] = ~centered
+
+        # Otherwise, move until stuck or until the whole distance has been travelled.
+        moving = ~penalty & (state != _TURNING)
+        is_stuck[moving] = False
+        selected = np.flatnonzero(moving)
+        residual_distance = distance[moving]
+        while selected.size:
+            games = indices[selected]
+            self._pacman_x[games], self._pacman_y[games], residual_distance, stuck, _, _ = \
+                _move_within_tile(self._pacman_x[games], self._pacman_y[games], self._pacman_direction[games], residual_distance, True)
+
+            is_stuck[selected] = stuck
+            keep = (residual_distance > 0) & ~stuck
+            selected, residual_distance = selected[keep], residual_distance[keep]
+
+        return is_stuck, turning
+
+
+    # ----------------------------------------------------------------
+    # Ghosts coordinator.
+    # ----------------------------------------------------------------
+
+    def _update_ghosts(self, indices, update_only_transparent):
+        if not update_only_transparent:
+            self._update_movement_mode(indices[~self._fright[indices]])
+            self._time_since_dot_eaten[indices] += 1
+
+            # Check if ghost needs to leave house.
+            self._check_leave_house(indices)
+
+        # Update all ghosts.
+        self._clyde_in_house[indices] = (self._ghosts_behaviour[Ghost.CLYDE, indices] & _IN_HOUSE) != 0
+        for ghost in Ghost:
+            selected = indices
+            if update_only_transparent:
+                behaviour = self._ghosts_behaviour[ghost, indices]
+                transparent = (behaviour & (_GOING_TO_HOUSE | _ENTERING_HOUSE)) != 0
+                selected = indices[transparent & ~self._ghosts_was_just_eaten[ghost, indices]]
+
+            self._update_ghost(ghost, selected)
+
+
+    def _update_movement_mode(self, indices):
+        # If fright is off, remove it from all ghosts.
+        self._ghosts_behaviour[:, indices] &= ~_FRIGHTENED
+
+        # Update timer, and calculate current mode based on its value.
+        self._mode_timer[indices] += 1
+        level = np.minimum(self._level[indices], _MAX_LEVEL)
+        mode_idx = (self._mode_timer[indices, None] > _MODE_END_TIME[level]).sum(axis = 1)
+        self._request_mode(indices, _MODE[level, mode_idx])
+
+
+    def _request_mode(self, indices, mode):
+        # Only reverse direction if actual switch between scatter and chase modes.
+        behaviour = self._ghosts_behaviour[:, indices]
+        switch = (behaviour & mode) == 0
+        self._ghosts_behaviour[:, indices] = np.where(switch, behaviour & ~(_CHASE | _SCATTER) | mode, behaviour)
+        self._ghosts_reverse_direction_signal[:, indices] |= switch
+
+
+    def _set_house_behaviour(self, ghost, indices, behaviour):
+        self._ghosts_behaviour[ghost, indices] = self._ghosts_behaviour[ghost, indices] & ~_HOUSE_FLAGS | behaviour
+
+
+    def _notify_fright_on(self, indices, fright_duration):
+        # Ghosts going to the house when power pellet eaten are not frightened once they reach it.
+        behaviour = self._ghosts_behaviour[:, indices]
+        self._ghosts_behaviour[:, indices] = np.where((behaviour & _GOING_TO_HOUSE) == 0, behaviour | _FRIGHTENED, behaviour)
+        self._ghosts_reverse_direction_signal[:, indices] = True
+
+        self._ghosts_behaviour[:, indices[fright_duration <= 0]] &= ~_FRIGHTENED
+
+
+    def _notify_pellet_eaten(self, indices):
+        self._time_since_dot_eaten[indices] = 0
+
+        global_enable = self._dot_counter_global_enable[indices]
+        self._dot_counter_global[indices[global_enable]] += 1
+
+        # Otherwise, the dot counter of the first ghost in the house is incremented.
+        remaining = indices[~global_enable]
+        for ghost in Ghost.PINKY, Ghost.INKY, Ghost.CLYDE:
+            in_house = (self._ghosts_behaviour[ghost, remaining] & _IN_HOUSE) != 0
+            self._dot_counter_ghosts[ghost, remaining[in_house]] += 1
+            remaining = remaining[~in_house]
+
+
+    def _notify_life_lost(self, indices):
+        self._died_this_level[indices] = True
+        self._reset_ghosts(indices)
+
+        self._dot_counter_global[indices] = 0
+        self._dot_counter_global_enable[indices] = True
+
+
+    def _check_leave_house(self, indices):
+        level = np.minimum(self._level[indices], _MAX_LEVEL)
+
+        for ghost in Ghost:
+            in_house = (self._ghosts_behaviour[ghost, indices] & _IN_HOUSE) != 0
+            selected, selected_level = indices[in_house], level[in_house]
+
+            timer_expired = self._time_since_dot_eaten[selected] >= _DOTS_TIMER[selected_level]
+            self._time_since_dot_eaten[selected[timer_expired]] = 0
+            self._set_house_behaviour(ghost, selected[timer_expired], _EXITING_HOUSE)
+            selected, selected_level = selected[~timer_expired], selected_level[~timer_expired]
+
+            # If global dot counter enabled, don't perform the check with regular dot counters.
+            global_enable = self._dot_counter_global_enable[selected]
+            leaving = selected[global_enable][self._dot_counter_global[selected[global_enable]] == _DOT_GLOBAL_LIMIT[ghost]]
+            self._set_house_behaviour(ghost, leaving, _EXITING_HOUSE)
+            self._dot_counter_global_enable[leaving] = (ghost != Ghost.CLYDE)
+
+            selected, selected_level = selected[~global_enable], selected_level[~global_enable]
+            leaving = selected[self._dot_counter_ghosts[ghost, selected] >= _DOT_LIMIT[selected_level, ghost]]
+            self._set_house_behaviour(ghost, leaving, _EXITING_HOUSE)
+
+
+    def _check_collision(self, indices):
+        pacman_row = _trunc_tile(self._pacman_y[indices])
+        pacman_col = _trunc_tile(self._pacman_x[indices])
+
+        life_lost = np.zeros(indices.size, dtype = np.bool_)
+        any_eaten = np.zeros(indices.size, dtype = np.bool_)
+        for ghost in Ghost:
+            behaviour = self._ghosts_behaviour[ghost, indices]
+            collision = (pacman_row == _trunc_tile(self._ghosts_y[ghost, indices])) & (pacman_col == _trunc_tile(self._ghosts_x[ghost, indices])) & \
+                        ((behaviour & (_GOING_TO_HOUSE | _ENTERING_HOUSE)) == 0) & ~any_eaten
+
+            # A frightened ghost is eaten, and no other collision is checked after it.
+            eaten = collision & ((behaviour & _FRIGHTENED) != 0)
+            games = indices[eaten]
+            self._set_house_behaviour(ghost, games, _GOING_TO_HOUSE)
+            self._ghosts_behaviour[ghost, games] &= ~_FRIGHTENED
+            self._ghosts_was_just_eaten[ghost, games] = True
+
+            any_eaten |= eaten
+            life_lost = (life_lost | collision) & ~eaten
+
+        return life_lost & ~any_eaten, any_eaten
+
+
+    # ----------------------------------------------------------------
+    # Ghosts.
+    # ----------------------------------------------------------------
+
+    def _update_ghost(self, ghost, indices):
+        fright = self._fright[indices].astype(np.int64)
+        level = np.minimum(self._level[indices], _MAX_LEVEL)
+        residual_distance = previous_speed = None
+
+        while indices.size:
+            behaviour = self._ghosts_behaviour[ghost, indices]
+            x, y = self._ghosts_x[ghost, indices], self._ghosts_y[ghost, indices]
+
+            # Distance that can still be travelled depends on the tile (whether in warp tunnel or not).
+            row, col = _trunc_tile(y), _trunc_tile(x)
+            in_warp_tunnel = (row == WARP_TUNNEL_ROW) & ((col <= WARP_TUNNEL_COL_LEFT) | (col >= WARP_TUNNEL_COL_RIGHT))
+            going_to_house = (behaviour & _GOING_TO_HOUSE) != 0
+            in_or_exiting_house = (behaviour & (_IN_HOUSE | _EXITING_HOUSE)) != 0
+            if ghost == Ghost.BLINKY:
+                self._update_cruise_elroy_level(indices, level)
+            cruise_elroy = self._ghosts_cruise_elroy_level[ghost, indices]
+            speed = _GHOSTS_SPEED[level, fright, in_warp_tunnel.astype(np.int64), going_to_house.astype(np.int64),
+                                  in_or_exiting_house.astype(np.int64), cruise_elroy]
+
+            residual_distance = speed if previous_speed is None else residual_distance * speed // previous_speed
+            previous_speed = speed
+
+            keep = residual_distance != 0
+            indices, fright, level, behaviour, x, y, residual_distance, previous_speed = \
+                (array[keep] for array in (indices, fright, level, behaviour, x, y, residual_distance, previous_speed))
+
+            # Update position clipping to closest half-tile.
+            collide_with_door = (behaviour & (_EXITING_HOUSE | _ENTERING_HOUSE)) == 0
+            self._ghosts_x[ghost, indices], self._ghosts_y[ghost, indices], residual_distance, _, is_at_tile_center, is_at_tile_edge = \
+                _move_within_tile(x, y, self._ghosts_direction[ghost, indices], residual_distance, collide_with_door)
+
+            self._update_ghost_behaviour(ghost, indices, behaviour, is_at_tile_center, is_at_tile_edge)
+
+            keep = residual_distance != 0
+            indices, fright, level, residual_distance, previous_speed = \
+                (array[keep] for array in (indices, fright, level, residual_distance, previous_speed))
+
+
+    def _update_cruise_elroy_level(self, indices, level):
+        first_thr, second_thr = _ELROY_THR[level].T
+        pellets_remaining = self._n_pellets[indices]
+
+        cruise_elroy = np.where(pellets_remaining <= second_thr, CruiseElroyLevel.SECOND,
+                                np.where(pellets_remaining <= first_thr, CruiseElroyLevel.FIRST, CruiseElroyLevel.NULL))
+        cruise_elroy[self._died_this_level[indices] & self._clyde_in_house[indices]] = CruiseElroyLevel.NULL
+        self._ghosts_cruise_elroy_level[Ghost.BLINKY, indices] = cruise_elroy
+
+
+    def _update_ghost_behaviour(self, ghost, indices, behaviour, is_at_tile_center, is_at_tile_edge):
+        # Update direction attributes based on behaviours, in the same order of priority as GhostAbstract._update_behaviour.
+        remaining = np.ones(indices.size, dtype = np.bool_)
+        for flags, method in ((_IN_HOUSE,       self._behaviour_in_house),
+                              (_EXITING_HOUSE,  self._behaviour_exiting_house),
+                              (_GOING_TO_HOUSE, self._behaviour_going_to_house),
+                              (_ENTERING_HOUSE, self._behaviour_entering_house),
+                              (_FRIGHTENED,     self._behaviour_frightened),
+                              (_CHASE | _SCATTER, self._behaviour_reach_target_tile)):
+            selected = remaining & ((behaviour & flags) != 0)
+            remaining &= ~selected
+            if selected.any():
+                method(ghost, indices[selected], is_at_tile_center[selected], is_at_tile_edge[selected])
+
+        # Update variable describing whether going from edge to center of a tile.
+        self._ghosts_going_from_tile_edge_to_center[ghost, indices[is_at_tile_center]] = False
+        self._ghosts_going_from_tile_edge_to_center[ghost, indices[~is_at_tile_center & is_at_tile_edge]] = True
+
+
+    def _behaviour_in_house(self, ghost, indices, is_at_tile_center, is_at_tile_edge):
+        self._ghosts_direction_next[ghost, indices] = self._ghosts_direction_next_next[ghost, indices] = _NONE
+
+        # Switch direction, but only if not already switched to avoid oscillations.
+        switch = indices[is_at_tile_edge & ~self._ghosts_going_from_tile_edge_to_center[ghost, indices]]
+        self._ghosts_direction[ghost, switch] = _REVERSE[self._ghosts_direction[ghost, switch]]
+
+
+    def _behaviour_exiting_house(self, ghost, indices, is_at_tile_center, is_at_tile_edge):
+        self._ghosts_direction_next[ghost, indices] = self._ghosts_direction_next_next[ghost, indices] = _NONE
+        round_x = _round_to_halves(self._ghosts_x[ghost, indices])
+        round_y = _round_to_halves(self._ghosts_y[ghost, indices])
+        exit_x, exit_y = _HOUSE_EXIT_HALVES
+
+        left  = round_x > exit_x
+        right = round_x < exit_x
+        up    = ~left & ~right & is_at_tile_edge
+        out   = ~left & ~right & ~is_at_tile_edge & is_at_tile_center & (round_y == exit_y)
+        self._ghosts_direction[ghost, indices[left]]  = _LEFT
+        self._ghosts_direction[ghost, indices[right]] = _RIGHT
+        self._ghosts_direction[ghost, indices[up]]    = _UP
+
+        out = indices[out]
+        self._ghosts_behaviour[ghost, out] &= ~_EXITING_HOUSE
+        self._ghosts_direction[ghost, out] = self._ghosts_direction_next[ghost, out] = self._ghosts_direction_next_next[ghost, out] = _LEFT
+
+
+    def _behaviour_going_to_house(self, ghost, indices, is_at_tile_center, is_at_tile_edge):
+        round_x = _round_to_halves(self._ghosts_x[ghost, indices])
+        round_y = _round_to_halves(self._ghosts_y[ghost, indices])
+
+        entering = (round_x == _HOUSE_ENTRANCE_HALVES[0]) & (round_y == _HOUSE_ENTRANCE_HALVES[1]) & is_at_tile_edge
+        games = indices[entering]
+        self._set_house_behaviour(ghost, games, _ENTERING_HOUSE)
+        self._ghosts_direction[ghost, games] = _DOWN
+        self._ghosts_direction_next[ghost, games] = self._ghosts_direction_next_next[ghost, games] = _NONE
+
+        self._behaviour_reach_target_tile(ghost, indices[~entering], is_at_tile_center[~entering], is_at_tile_edge[~entering])
+
+
+    def _behaviour_entering_house(self, ghost, indices, is_at_tile_center, is_at_tile_edge):
+        self._ghosts_direction_next[ghost, indices] = self._ghosts_direction_next_next[ghost, indices] = _NONE
+        round_x = _round_to_halves(self._ghosts_x[ghost, indices])
+        round_y = _round_to_halves(self._ghosts_y[ghost, indices])
+
+        arrived = is_at_tile_edge & (round_y == _HOUSE_ENTER_Y_HALVES)
+        games = indices[arrived]
+        match ghost:
+            case Ghost.BLINKY | Ghost.PINKY:
+                self._set_house_behaviour(ghost, games, _EXITING_HOUSE)
+                self._ghosts_direction[ghost, games] = _UP
+            case Ghost.INKY:
+                self._ghosts_direction[ghost, games] = _LEFT
+            case Ghost.CLYDE:
+                self._ghosts_direction[ghost, games] = _RIGHT
+
+        self._set_house_behaviour(ghost, indices[arrived & (round_x == _GHOSTS_START_X_HALVES[ghost])], _EXITING_HOUSE)
+
+
+    def _behaviour_frightened(self, ghost, indices, is_at_tile_center, is_at_tile_edge):
+        games = indices[is_at_tile_center]
+        self._ghosts_direction[ghost, games] = self._ghosts_direction_next[ghost, games]
+        self._ghosts_direction_next[ghost, games] = self._ghosts_direction_next_next[ghost, games]
+        self._ghosts_direction_next_next[ghost, games] = _NONE
+
+        games = indices[~is_at_tile_center & is_at_tile_edge]
+        reversed_direction = self._maybe_reverse_direction(ghost, games)
+
+        games = games[~reversed_direction]
+        self._ghosts_direction_next[ghost, games] = self._frightened_ghost_random_direction(ghost, games)
+        self._ghosts_direction_next_next[ghost, games] = _NONE
+
+
+    def _behaviour_reach_target_tile(self, ghost, indices, is_at_tile_center, is_at_tile_edge):
+        direction_next = self._ghosts_direction_next[ghost, indices]
+        reverse_direction_signal = self._ghosts_reverse_direction_signal[ghost, indices]
+        going_from_tile_edge_to_center = self._ghosts_going_from_tile_edge_to_center[ghost, indices]
+
+        # Sanitize direction_next and direction_next_next if they had been invalidated, as done by GhostAbstract._behaviour_reach_target_tile.
+        invalid = direction_next == _NONE
+        between = ~is_at_tile_center & ~is_at_tile_edge
+        both      = invalid & (is_at_tile_center | (between & going_from_tile_edge_to_center))
+        from_here = invalid & is_at_tile_edge & ~reverse_direction_signal
+        ahead     = invalid & between & ~going_from_tile_edge_to_center & ~reverse_direction_signal
+
+        games = indices[both | from_here]
+        self._ghosts_direction_next[ghost, games] = self._calculate_direction_at_tile_center(ghost, games, np.full(games.size, _NONE))
+        games = indices[both]
+        self._ghosts_direction_next_next[ghost, games] = self._calculate_direction_at_tile_center(ghost, games, self._ghosts_direction_next[ghost, games])
+        games = indices[ahead]
+        self._ghosts_direction_next[ghost, games] = self._calculate_direction_at_tile_center(ghost, games, self._ghosts_direction[ghost, games])
+
+        games = indices[is_at_tile_center]
+        self._ghosts_direction[ghost, games] = self._ghosts_direction_next[ghost, games]
+        self._ghosts_direction_next[ghost, games] = self._ghosts_direction_next_next[ghost, games]
+        self._ghosts_direction_next_next[ghost, games] = _NONE
+
+        games = indices[~is_at_tile_center & is_at_tile_edge]
+        reversed_direction = self._maybe_reverse_direction(ghost, games)
+
+        # After reversing, _direction_next_next will be recalculated once we step back in the previous tile (next iteration).
+        reversed_games = games[reversed_direction]
+        self._ghosts_direction_next[ghost, reversed_games] = \
+            self._calculate_direction_at_tile_center(ghost, reversed_games, self._ghosts_direction[ghost, reversed_games])
+
+        # When entering new tile, ghost must decide what it will do in next tile along this direction.
+        games = games[~reversed_direction]
+        self._ghosts_direction_next_next[ghost, games] = \
+            self._calculate_direction_at_tile_center(ghost, games, self._ghosts_direction_next[ghost, games])
+
+
+    def _maybe_reverse_direction(self, ghost, indices):
+        reverse = self._ghosts_reverse_direction_signal[ghost, indices]
+
+        games = indices[reverse]
+        self._ghosts_reverse_direction_signal[ghost, games] = False
+        self._ghosts_direction[ghost, games] = _REVERSE[self._ghosts_direction[ghost, games]]
+
+        # Invalidate the future directions.
+        self._ghosts_direction_next[ghost, games] = self._ghosts_direction_next_next[ghost, games] = _NONE
+
+        return reverse
+
+
+    def _calculate_direction_at_tile_center(self, ghost, indices, direction_from_current_tile):
+        target_x, target_y = self._calculate_target_tile(ghost, indices)
+
+        # Tile at whose center the decision is taken, and legal directions there (see tile_graph.ghost_exits).
+        row = _trunc_tile(self._ghosts_y[ghost, indices]) + _DY[direction_from_current_tile]
+        col = _trunc_tile(self._ghosts_x[ghost, indices]) + _DX[direction_from_current_tile]
+        can_turn_up_anywhere = (self._ghosts_behaviour[ghost, indices] & _GOING_TO_HOUSE) != 0
+        forbidden_up = _FORBIDDEN_UP[row + _PAD_ROWS, col + _PAD_COLS] & ~can_turn_up_anywhere
+
+        # Direction is chosen so that euclidean distance between next next tile and target tile is minimized.
+        # In case of equivalency, preference is in this order (from most preferred to least): up, left, down, right.
+        distances = np.empty((len(_DIRECTIONS), indices.size), dtype = np.float64)
+        for code in range(len(_DIRECTIONS)):
+            next_row, next_col = row + _DY[code], col + _DX[code]
+            distance = (target_x - (2 * next_col + 1)) ** 2 + (target_y - (2 * next_row + 1)) ** 2
+            legal = (direction_from_current_tile != _REVERSE[code]) & ~_not_walkable(next_row, next_col)
+            if code == _UP:
+                legal &= ~forbidden_up
+            distances[code] = np.where(legal, distance, np.inf)
+
+        best_direction = distances.argmin(axis = 0)
+        best_direction[np.isinf(distances.min(axis = 0))] = _NONE
+        return best_direction
+
+
+    def _calculate_target_tile(self, ghost, indices):
+        # Targets are returned in half tiles, so that tile centers are whole numbers.
+        behaviour = self._ghosts_behaviour[ghost, indices]
+        scatter_x, scatter_y = _SCATTER_TARGET_HALVES[ghost]
+        target_x = np.full(indices.size, scatter_x)
+        target_y = np.full(indices.size, scatter_y)
+
+        personal = ((behaviour & _CHASE) != 0) | (self._ghosts_cruise_elroy_level[ghost, indices] != CruiseElroyLevel.NULL)
+        personal &= (behaviour & _GOING_TO_HOUSE) == 0
+        if personal.any():
+            games = indices[personal]
+            pacman_x = 2 * _trunc_tile(self._pacman_x[games]) + 1
+            pacman_y = 2 * _trunc_tile(self._pacman_y[games]) + 1
+            pacman_direction = self._pacman_direction[games]
+            pacman_up = pacman_direction == _UP
+
+            match ghost:
+                case Ghost.BLINKY:
+                    personal_x, personal_y = pacman_x, pacman_y
+                case Ghost.PINKY:
+                    personal_x = pacman_x + 8 * _DX[pacman_direction] - 8 * pacman_up
+                    personal_y = pacman_y + 8 * _DY[pacman_direction]
+                case Ghost.INKY:
+                    in_front_x = pacman_x + 4 * _DX[pacman_direction] - 4 * pacman_up
+                    in_front_y = pacman_y + 4 * _DY[pacman_direction]
+                    personal_x = 2 * in_front_x - (2 * _trunc_tile(self._ghosts_x[Ghost.BLINKY, games]) + 1)
+                    personal_y = 2 * in_front_y - (2 * _trunc_tile(self._ghosts_y[Ghost.BLINKY, games]) + 1)
+                case Ghost.CLYDE:
+                    # If distance from Pac-Man is larger than 8 tiles.
+                    far = (self._ghosts_x[ghost, games] - self._pacman_x[games]) ** 2 + \
+                          (self._ghosts_y[ghost, games] - self._pacman_y[games]) ** 2 > _CLYDE_SHY_DISTANCE_SQUARED
+                    personal_x = np.where(far, pacman_x, scatter_x)
+                    personal_y = np.where(far, pacman_y, scatter_y)
+
+            target_x[personal] = personal_x
+            target_y[personal] = personal_y
+
+        going_to_house = (behaviour & _GOING_TO_HOUSE) != 0
+        target_x[going_to_house], target_y[going_to_house] = _EATEN_TARGET_HALVES
+
+        return target_x, target_y
+
+
+    def _frightened_ghost_random_direction(self, ghost, indices):
+        self._rng_index[indices] = (self._rng_index[indices] * 5 + 1) % _PRNG_MEM_SIZE
+        starting_idx = _CLOCKWISE_INDEX[_PRNG_DIRECTION[self._rng_index[indices]]]
+
+        row = _trunc_tile(self._ghosts_y[ghost, indices])
+        col = _trunc_tile(self._ghosts_x[ghost, indices])
+        reverse_direction = _REVERSE[self._ghosts_direction[ghost, indices]]
+
+        # The first direction clockwise from the random one which is legal is chosen.
+        chosen = np.full(indices.size, _NONE)
+        for offset in range(len(_CLOCKWISE)):
+            direction = _CLOCKWISE[(starting_idx + offset) % len(_CLOCKWISE)]
+            legal = (chosen == _NONE) & (direction != reverse_direction) & \
+                    ~_not_walkable(_trunc_half_tile(2 * row + 1 + 2 * _DY[direction]), _trunc_half_tile(2 * col + 1 + 2 * _DX[direction]))
+            chosen[legal] = direction[legal]
+
+        if (chosen == _NONE).any():
+            raise RuntimeError("No valid direction found in BatchSimulation._frightened_ghost_random_direction")
+
+        return chosen
+
+
+    # Defining properties for some private attributes. Positions are returned in tiles, with shape (n_games, 2) for Pac-Man
+    # and (4, n_games, 2) for ghosts, ordered as in Ghost.
+    n_games             = property(lambda self: self._n_games)
+    level               = property(lambda self: self._level)
+    lives               = property(lambda self: self._lives)
+    level_state         = property(lambda self: self._level_state)
+    score               = property(lambda self: self._score)
+    pellets             = property(lambda self: self._pellets)
+    n_pellets_remaining = property(lambda self: self._n_pellets)
+    pacman_position     = property(lambda self: np.stack((self._pacman_x, self._pacman_y), axis = -1) / UNITS_PER_TILE)
+    ghosts_position     = property(lambda self: np.stack((self._ghosts_x, self._ghosts_y), axis = -1) / UNITS_PER_TILE)
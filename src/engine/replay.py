@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+import struct
+
+from src.engine.simulation import Simulation
+from src.directions import Vector2
+
+
+# Binary replay format. All integers are little-endian.
+# - Header: magic bytes, format version, flags (bit 0 set if recorded with fixed_point_movement), starting level and seed of the game.
+# - Body: sequence of 2-bytes records (input, run length), meaning that for run length consecutive ticks the given input was requested
+#   before the tick. Input is the index of the direction in _DIRECTIONS, or _NO_INPUT. Run length is between 1 and _MAX_RUN_LENGTH.
+# - Optional end: record (_END_OF_REPLAY, 0) followed by the final score and level, written when the game ends.
+# Records are only ever appended and flushed as soon as written, so a file cut at any point is still a valid replay of the ticks it holds.
+_MAGIC = b'PMRP'
+_VERSION = 1
+_FLAG_FIXED_POINT_MOVEMENT = 0b00000001
+
+_HEADER = struct.Struct('<4sBBHQ')
+_RECORD = struct.Struct('<BB')
+_END    = struct.Struct('<IH')
+
+_DIRECTIONS = (Vector2.UP, Vector2.LEFT, Vector2.DOWN, Vector2.RIGHT)
+_NO_INPUT = len(_DIRECTIONS)
+_END_OF_REPLAY = 0xFF
+_MAX_RUN_LENGTH = 0xFF
+
+
+
+
+class ReplayWriter:
+    """Class ReplayWriter. Records the direction requested before each tick of a Simulation into a replay file,
+    together with what is needed to start the same game again: seed, starting level and movement core."""
+
+    def __init__(self, path, seed, start_level = 1, fixed_point_movement = False):
+        """Constructor for the class ReplayWriter, creating the file at path and writing its header."""
+        self._file = open(path, 'wb')
+        flags = _FLAG_FIXED_POINT_MOVEMENT if fixed_point_movement else 0
+        self._write(_HEADER.pack(_MAGIC, _VERSION, flags, start_level, seed))
+
+        self._direction_requested = None
+        self._run_input  = None
+        self._run_length = 0
+
+
+    def request_direction(self, direction):
+        """Notifies that direction was requested to Pac-Man. Only the last direction requested before a tick is kept, as done by PacMan."""
+        if direction not in _DIRECTIONS:
+            raise ValueError('Invalid direction provided to ReplayWriter.request_direction')
+
+        self._direction_requested = direction
+
+
+    def tick(self):
+        """Notifies that the Simulation is about to advance by one tick, recording the direction requested since the previous one."""
+        replay_input = _DIRECTIONS.index(self._direction_requested) if self._direction_requested is not None else _NO_INPUT
+        self._direction_requested = None
+
+        if replay_input == self._run_input and self._run_length < _MAX_RUN_LENGTH:
+            self._run_length += 1
+            return
+
+        self._write_run()
+        self._run_input  = replay_input
+        self._run_length = 1
+
+
+    def close(self, score = None, level = None):
+        """Writes the pending ticks and closes the file. If score and level are given, they are stored as the final result of the game,
+        which ReplayReader exposes for verification. Calling close more than once has no effect."""
+        if self._file.closed:
+            return
+
+        self._write_run()
+        if score is not None and level is not None:
+            self._write(_RECORD.pack(_END_OF_REPLAY, 0) + _END.pack(score, level))
+
+        self._file.close()
+
+
+    def _write_run(self):
+        if self._run_length:
+            self._write(_RECORD.pack(self._run_input, self._run_length))
+
+    def _write(self, data):
+        self._file.write(data)
+        self._file.flush()
+
+
+    closed = property(lambda self: self._file.closed)
+
+
+
+
+class ReplayReader:
+    """Class ReplayReader. Reads a replay file written by ReplayWriter. Iterating over it yields, for each recorded tick,
+    the direction requested before it (or None), reading the file lazily so that replays of any length use constant memory."""
+
+    def __init__(self, path):
+        """Constructor for the class ReplayReader, reading the header of the file at path."""
+        self._path = path
+
+        with open(path, 'rb') as file:
+            header = file.read(_HEADER.size)
+
+        if len(header) < _HEADER.size:
+            raise ValueError(f'File is too short to be a replay: {path}')
+
+        magic, version, flags, self._start_level, self._seed = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f'Unsupported replay file: {path}')
+
+        self._fixed_point_movement = bool(flags & _FLAG_FIXED_POINT_MOVEMENT)
+
+        # Final result of the game, only known once the whole file has been read.
+        self._final_score = None
+        self._final_level = None
+
+
+    def __iter__(self):
+        with open(self._path, 'rb') as file:
+            file.seek(_HEADER.size)
+
+            # A record cut by a crash while writing is ignored.
+            while len(record := file.read(_RECORD.size)) == _RECORD.size:
+                replay_input, run_length = _RECORD.unpack(record)
+
+                if replay_input == _END_OF_REPLAY:
+                    end = file.read(_END.size)
+                    if len(end) == _END.size:
+                        self._final_score, self._final_level = _END.unpack(end)
+                    return
+
+                direction = _DIRECTIONS[replay_input] if replay_input != _NO_INPUT else None
+                for _ in range(run_length):
+                    yield direction
+
+
+    def new_simulation(self, **kwargs):
+        """Returns a new Simulation starting the recorded game. Keyword arguments are passed to Simulation."""
+        return Simulation(start_level = self._start_level, fixed_point_movement = self._fixed_point_movement, seed = self._seed, **kwargs)
+
+
+    def play(self, simulation = None):
+        """Re-simulates the recorded game as fast as possible, on simulation if given or on a new headless Simulation otherwise.
+        Returns the simulation and the number of ticks played."""
+        if simulation is None:
+            simulation = self.new_simulation(persistent_high_score = False)
+
+        n_ticks = 0
+        for direction in self:
+            if direction is not None:
+                simulation.set_direction(direction)
+
+            simulation.step()
+            n_ticks += 1
+
+        return simulation, n_ticks
+
+
+    # Defining properties for some private attributes.
+    seed                 = property(lambda self: self._seed)
+    start_level          = property(lambda self: self._start_level)
+    fixed_point_movement = property(lambda self: self._fixed_point_movement)
+    final_score          = property(lambda self: self._final_score)
+    final_level          = property(lambda self: self._final_level)
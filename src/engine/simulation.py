@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+
+from random import Random
+from collections import namedtuple
+
+from src.game_objects.pacman import PacMan
+from src.game_objects.maze import Maze
+from src.game_objects.score import Score
+from src.game_objects.ghosts.ghost_coordinator import GhostsCoordinator
+from src.game_objects.level_profile import level_profile
+
+from src.constants import (MazeTiles,
+                           ScoreActions,
+                           STARTING_LIVES_PACMAN,
+                           EXTRA_LIFE_POINTS_REQUIREMENT,
+                           FRUIT_SPAWN_THRESHOLDS,
+                           FRUIT_SPAWN_POSITION,
+                           FRUIT_TIME_ACTIVE_RANGE,
+                           LevelStates,
+                           LEVEL_STATES_DURATION,
+                           UpdatableUIElements,
+                           LEVEL_WITH_INTERMISSIONS,
+                           GAME_COMPLETED_LEVEL)
+
+
+# Named tuple holding the whole state of a Simulation, as returned by Simulation.snapshot.
+# Fields score, maze, pacman and ghosts hold the tuples returned by the snapshot method of the corresponding game object,
+# and random_state the state of the generator drawing the duration of fruits (as returned by Random.getstate).
+SimulationState = namedtuple('SimulationState', ['level', 'lives', 'extra_life_awarded', 'level_state', 'level_state_counter',
+                                                 'fright_counter', 'fruit_visible_counter', 'score', 'maze', 'pacman', 'ghosts',
+                                                 'random_state'])
+
+
+class _NullObserver:
+    """Class _NullObserver. Stands in for Graphics or Sounds when these are not attached to a Simulation,
+    silently accepting any notification."""
+
+    def __getattr__(self, name):
+        # Special methods are looked up by copy and pickle, and must not be silently replaced.
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        return _NullObserver._no_op
+
+    @staticmethod
+    def _no_op(*args, **kwargs):
+        return
+
+
+class Simulation:
+    """Class Simulation. Game engine advancing Pac-Man, ghosts, maze and score by one tick at a time.
+    It has no dependency on pyglet, so it can run faster than real time without any window.
+    Graphics and Sounds instances can optionally be attached to receive notifications of game events.
+    With fixed_point_movement, Pac-Man and ghosts move using the integer movement core instead of floating point coordinates.
+    The only randomness of the game, the duration of fruits, is drawn from a generator seeded with seed, so that a game
+    is fully determined by its seed and the directions requested at each tick."""
+
+    def __init__(self, graphics = None, sounds = None, start_level = 1, persistent_high_score = True, fixed_point_movement = False, seed = None):
+        """Constructor for the class Simulation, instancing all game objects. If seed is None, a random seed is used."""
+        self._graphics = graphics if graphics is not None else _NullObserver()
+        self._sounds   = sounds   if sounds   is not None else _NullObserver()
+
+        self._score = Score(persistent_high_score)
+        self._fixed_point_movement = fixed_point_movement
+
+        # Generator drawing the duration of fruits. It is part of the state of the game, so that snapshots restored into another instance
+        # draw the same durations.
+        self._seed   = seed
+        self._random = Random(seed)
+
+        self._lives = STARTING_LIVES_PACMAN
+        self._extra_life_awarded = False
+
+        # Create private attributes to hold level state and duration of the state.
+        self._level_state = None
+        self._level_state_counter = 0
+
+        # Create attributes that will be initialized in _reset_level.
+        self._level  = start_level - 1
+        self._maze   = None
+        self._pacman = None
+        self._ghosts = None
+        self._fright_counter = None
+        self._fruit_visible_counter = 0
+
+        self._set_level_state(LevelStates.FIRST_WELCOME)
+        self._sounds.notify_first_welcome()
+        self._reset_level(new = True)
+
+
+    def _reset_level(self, new):
+        if new:
+            self._level  += 1
+            self._maze   = Maze()
+            self._ghosts = GhostsCoordinator(self._fixed_point_movement)
+
+        self._pacman = PacMan(self._fixed_point_movement)
+        self._fright_counter = 0
+        self._fruit_visible_counter = 0
+        self._graphics.reset_level()
+
+
+    def set_direction(self, direction):
+        """Requests Pac-Man to move along direction, which must be one of Vector2.UP, DOWN, LEFT or RIGHT."""
+        self._pacman.direction = direction
+
+
+    def snapshot(self):
+        """Returns the whole state of the game as a SimulationState made only of immutable values.
+        The state of Graphics and Sounds is not included."""
+        return SimulationState(self._level, self._lives, self._extra_life_awarded, self._level_state, self._level_state_counter,
+                               self._fright_counter, self._fruit_visible_counter, self._score.snapshot(),
+                               self._maze.snapshot(), self._pacman.snapshot(), self._ghosts.snapshot(), self._random.getstate())
+
+
+    def restore(self, state):
+        """Restores the state of the game from a SimulationState returned by Simulation.snapshot.
+        The same state can be restored any number of times, including on another Simulation instance."""
+        self._level, self._lives, self._extra_life_awarded, self._level_state, self._level_state_counter, \
+            self._fright_counter, self._fruit_visible_counter, score, maze, pacman, ghosts, random_state = state
+
+        self._score .restore(score)
+        self._maze  .restore(maze)
+        self._pacman.restore(pacman)
+        self._ghosts.restore(ghosts)
+        self._random.setstate(random_state)
+
+
+    def run(self, n_ticks):
+        """Advances the simulation by up to n_ticks, stopping early if step returns anything other than False.
+        Returns the value returned by the last call to step."""
+        retval = False
+        for _ in range(n_ticks):
+            retval = self.step()
+
+            if retval is not False:
+                break
+
+        return retval
+
+
+    def step(self):
+        """Advances the simulation by one tick. Returns False while the game goes on, True when the game is over,
+        or the level just completed if it is followed by an intermission or ends the game."""
+
+        # Update level state, without updating graphics.
+        match self._level_state:
+            case LevelStates.PLAYING:
+                self._update_game_not_graphics()
+
+            case LevelStates.PAUSE_AFTER_EATING:
+                self._ghosts.update(level_profile(self._level), True, self._maze, self._pacman, update_only_transparent = True)
+
+        # Update graphics states.
+        match self._level_state:
+            case LevelStates.FIRST_WELCOME | LevelStates.READY:
+                ui_elements = UpdatableUIElements.UI | UpdatableUIElements.SCORE
+            case LevelStates.PLAYING:
+                ui_elements = UpdatableUIElements.PACMAN | UpdatableUIElements.GHOSTS | UpdatableUIElements.MAZE | UpdatableUIElements.UI | UpdatableUIElements.SCORE
+            case LevelStates.DEATH | LevelStates.COMPLETED | LevelStates.PAUSE_BEFORE_COMPLETED:
+                ui_elements = UpdatableUIElements.PACMAN | UpdatableUIElements.MAZE | UpdatableUIElements.UI | UpdatableUIElements.SCORE
+            case LevelStates.PAUSE_AFTER_EATING:
+                ui_elements = UpdatableUIElements.MAZE | UpdatableUIElements.UI | UpdatableUIElements.SCORE
+            case LevelStates.PAUSE_BEFORE_DEATH:
+                ui_elements = UpdatableUIElements.GHOSTS | UpdatableUIElements.MAZE | UpdatableUIElements.UI | UpdatableUIElements.SCORE
+            case LevelStates.GAME_OVER:
+                ui_elements = UpdatableUIElements.UI | UpdatableUIElements.SCORE
+            case LevelStates.INTERMISSION:
+                ui_elements = None
+        self._graphics.update(self._pacman, ui_elements)
+
+        # Transition to new level state if needed.
+        change_state = self._level_state_counter <= 0
+        self._level_state_counter -= 1
+
+        match self._level_state:
+            case LevelStates.PLAYING:
+                self._calculate_new_game_state()
+
+            case LevelStates.FIRST_WELCOME:
+                if change_state:
+                    self._set_level_state(LevelStates.READY)
+                    self._lives -= 1
+
+            case LevelStates.READY:
+                if change_state:
+                    self._set_level_state(LevelStates.PLAYING)
+                    self._pacman.state_set_moving()
+
+            case LevelStates.DEATH:
+                if change_state:
+                    self._lives -= 1
+                    if self._lives >= 0:
+                        self._set_level_state(LevelStates.READY)
+                        self._reset_level(new = False)
+                    else:
+                        self._set_level_state(LevelStates.GAME_OVER)
+
+            case LevelStates.COMPLETED:
+                if change_state:
+                    if self._level in LEVEL_WITH_INTERMISSIONS:
+                        self._set_level_state(LevelStates.INTERMISSION)
+                    else:
+                        self._set_level_state(LevelStates.READY)
+                        self._reset_level(new = True)
+                        if self._level == GAME_COMPLETED_LEVEL:
+                            return self._level
+
+            case LevelStates.INTERMISSION:
+                old_level = self._level
+                self._set_level_state(LevelStates.READY)
+                self._reset_level(new = True)
+                return old_level
+
+            case LevelStates.GAME_OVER:
+                if change_state:
+                    return True # Tell caller the game is over.
+
+            case LevelStates.PAUSE_AFTER_EATING:
+                if change_state:
+                    self._set_level_state(LevelStates.PLAYING)
+                    self._ghosts.notify_clear_was_just_eaten()
+
+                    # Test if collision with another ghost happened in the same spot. If so, function will autoatically change _level_state again.
+                    self._calculate_new_game_state()
+
+            case LevelStates.PAUSE_BEFORE_DEATH:
+                if change_state:
+                    self._set_level_state(LevelStates.DEATH)
+                    self._pacman.state_set_death()
+                    self._ghosts.notify_life_lost()
+                    self._sounds.notify_life_lost()
+
+            case LevelStates.PAUSE_BEFORE_COMPLETED:
+                if change_state:
+                    self._set_level_state(LevelStates.COMPLETED)
+                    self._graphics.notify_level_end()
+
+        return False
+
+
+
+    def _update_game_not_graphics(self):
+        fright = False
+        if self._fright_counter > 0:
+            self._fright_counter -= 1
+            fright = True
+
+        if self._fruit_visible_counter > 0:
+            self._fruit_visible_counter -= 1
+
+        profile = level_profile(self._level)
+        self._pacman.update(profile, fright, self._maze)
+        self._ghosts.update(profile, fright, self._maze, self._pacman, update_only_transparent = False)
+
+        self._sounds.queue_correct_siren(self._maze.n_pellets_remaining, fright, self._ghosts.any_ghost_retreating)
+
+
+    def _calculate_new_game_state(self):
+        pacman_new_position = self._pacman.position
+
+        # Check if eaten a fruit.
+        if self._fruit_visible_counter:
+            pacman_old_position = self._pacman.old_position
+
+            was_on_fruit = (pacman_old_position.y == pacman_new_position.y == FRUIT_SPAWN_POSITION.y) and \
+                           ((pacman_old_position.x <= FRUIT_SPAWN_POSITION.x <= pacman_new_position.x) or \
+                            (pacman_new_position.x <= FRUIT_SPAWN_POSITION.x <= pacman_old_position.x))
+            if was_on_fruit:
+                self._fruit_eaten()
+
+        # Check if eaten a pellet.
+        pellet_type = self._maze.eat_check_pellet(pacman_new_position)
+        if pellet_type is not None:
+            self._pellet_eaten(pellet_type)
+
+        # End level if completed.
+        if self._maze.completed:
+            self._set_level_state(LevelStates.PAUSE_BEFORE_COMPLETED)
+            self._pacman.state_become_round()
+            self._sounds.stop()
+
+        # Check if collided with any ghosts.
+        life_lost, any_eaten, position = self._ghosts.check_collision(self._maze, self._pacman)
+        if any_eaten:
+            score = self._score.add_to_score(ScoreActions.EAT_GHOST)
+            self._set_level_state(LevelStates.PAUSE_AFTER_EATING)
+            self._graphics.notify_ghost_eaten(score, position)
+            self._sounds  .notify_ghost_eaten()
+        if life_lost:
+            self._set_level_state(LevelStates.PAUSE_BEFORE_DEATH)
+            self._sounds.stop()
+
+        # Update lives if score high enough.
+        if not self._extra_life_awarded and self._score.score >= EXTRA_LIFE_POINTS_REQUIREMENT:
+            self._lives += 1
+            self._extra_life_awarded = True
+            self._sounds.notify_extra_life()
+
+
+    def _pellet_eaten(self, pellet_type):
+        self._pacman.add_penalty(pellet_type)
+        self._ghosts.notify_pellet_eaten()
+        self._score.add_to_score(ScoreActions.EAT_PELLET if pellet_type == MazeTiles.PELLET else ScoreActions.EAT_POWER_PELLET)
+        self._sounds.notify_pellet_eaten()
+
+        if pellet_type == MazeTiles.POWER_PELLET:
+            profile = level_profile(self._level)
+            fright_duration, fright_flashes = profile.fright_duration, profile.fright_flashes
+
+            self._fright_counter = fright_duration
+            self._score.notify_fright_on()
+            self._ghosts.notify_fright_on(fright_duration)
+            self._graphics.notify_fright_on(fright_duration, fright_flashes)
+
+        if self._maze.n_pellets_remaining in FRUIT_SPAWN_THRESHOLDS:
+            self._fruit_visible_counter = self._random.randint(*FRUIT_TIME_ACTIVE_RANGE)
+
+
+    def _fruit_eaten(self):
+        self._fruit_visible_counter = 0
+        score = self._score.add_to_score(ScoreActions.EAT_FRUIT, self._level)
+        self._graphics.notify_fruit_eaten(score)
+        self._sounds  .notify_fruit_eaten()
+
+
+    def _set_level_state(self, new_state):
+        if new_state not in LevelStates:
+            raise ValueError('Invalid state provided to Simulation._set_level_state')
+
+        self._level_state = new_state
+        self._level_state_counter = LEVEL_STATES_DURATION[new_state]
+
+
+    # Defining properties for some private attributes.
+    level                = property(lambda self: self._level)
+    lives                = property(lambda self: self._lives)
+    level_state          = property(lambda self: self._level_state)
+    score                = property(lambda self: self._score)
+    maze                 = property(lambda self: self._maze)
+    pacman               = property(lambda self: self._pacman)
+    ghosts               = property(lambda self: self._ghosts)
+    fruit_visible        = property(lambda self: self._fruit_visible_counter > 0)
+    fixed_point_movement = property(lambda self: self._fixed_point_movement)
+    seed                 = property(lambda self: self._seed)
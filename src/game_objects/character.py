@@ -4,16 +4,43 @@ from abc import ABC
 from math import floor, ceil
 
 from src.directions import Vector2
+from src.game_objects import tile_graph
+from src.game_objects.fixed_point import (UNITS_SHIFT,
+                                          UNITS_PER_TILE,
+                                          UNITS_OFFSET_MASK,
+                                          UNITS_TILE_CENTER,
+                                          to_units,
+                                          from_units)
 from src.constants import (MAZE_TILES_COLS,
                            WARP_TUNNEL_TELEPORT_MARGIN)
 
 
 class Character(ABC):
 
-    def __init__(self, position, direction):
-        self._position  = position
+    def __init__(self, position, direction, fixed_point = False):
         self._direction = direction
 
+        # When fixed_point is True, movement is computed by the integer core on self._units, holding [x, y] in fixed_point units,
+        # and self._position is only derived from it for the rest of the game, once per move.
+        self._fixed_point = fixed_point
+        self._set_position(position)
+
+
+    def _set_position(self, position):
+        self._position = position
+        if self._fixed_point:
+            self._units = [to_units(position.x), to_units(position.y)]
+
+    def _sync_position_from_units(self):
+        self._position = Vector2(from_units(self._units[0]), from_units(self._units[1]))
+
+    def _current_position(self):
+        # Position to take decisions from while moving. With the fixed_point core, self._position is only synced once per move,
+        # so it is derived from self._units here. This is only done when a decision needs it, not at every step of the move.
+        if self._fixed_point:
+            return Vector2(from_units(self._units[0]), from_units(self._units[1]))
+        return self._position
+
 
     def _update_position_within_tile(self, distance, maze, collide_with_door = True):
         
@@ -73,4 +100,63 @@ class Character(ABC):
         # Set new position.
         self._position = new_position
 
-        return residual_distance, is_stuck, is_at_tile_center, is_at_tile_edge
\ No newline at end of file
+        return residual_distance, is_stuck, is_at_tile_center, is_at_tile_edge
+
+
+    def _update_position_within_tile_fixed(self, distance, collide_with_door = True):
+        # Integer counterpart of Character._update_position_within_tile, with distance and coordinates in fixed_point units.
+        # A coordinate belongs to tile (coordinate >> UNITS_SHIFT), so when travelling towards negative coordinates
+        # the tile edge is the last unit of the previous tile. This way no epsilon is needed to be clearly in one tile.
+        units = self._units
+        axis = 0 if self._direction.x else 1
+        sign = self._direction.x or self._direction.y
+
+        # Clip distance so that it won't go past the next tile center or edge.
+        coord = units[axis]
+        offset = coord & UNITS_OFFSET_MASK
+        if sign > 0:
+            max_distance = UNITS_TILE_CENTER - offset if offset < UNITS_TILE_CENTER else UNITS_PER_TILE - offset
+        else:
+            max_distance = offset - UNITS_TILE_CENTER if offset > UNITS_TILE_CENTER else offset + 1
+        new_distance = min(max_distance, distance)
+        residual_distance = distance - new_distance
+        coord += sign * new_distance
+
+        # Check if movement will cause a collision, looking at the tile half a tile ahead. If so, clip instead of moving into wall.
+        # Walls and door never change, so they are looked up by row and column in the tables of tile_graph rather than through maze.
+        other_tile = units[1 - axis] >> UNITS_SHIFT
+        collision_coord = coord + UNITS_TILE_CENTER if sign > 0 else coord - UNITS_TILE_CENTER - 1
+        if axis == 0:
+            tile_blocked      = tile_graph.tile_is_not_walkable_at(other_tile, coord >> UNITS_SHIFT, collide_with_door)
+            collision_blocked = tile_graph.tile_is_not_walkable_at(other_tile, collision_coord >> UNITS_SHIFT, collide_with_door)
+        else:
+            tile_blocked      = tile_graph.tile_is_not_walkable_at(coord >> UNITS_SHIFT, other_tile, collide_with_door)
+            collision_blocked = tile_graph.tile_is_not_walkable_at(collision_coord >> UNITS_SHIFT, other_tile, collide_with_door)
+
+        is_stuck = True
+        if tile_blocked:
+            coord -= sign * UNITS_TILE_CENTER
+        elif collision_blocked:
+            coord = (coord & ~UNITS_OFFSET_MASK) + UNITS_TILE_CENTER
+        else:
+            is_stuck = False
+
+        # Perform warping if needed.
+        if axis == 0 and tile_graph.tile_is_warp_tunnel_at(other_tile, coord >> UNITS_SHIFT):
+            right_warp_edge = (MAZE_TILES_COLS + WARP_TUNNEL_TELEPORT_MARGIN) * UNITS_PER_TILE
+            left_warp_edge  = -WARP_TUNNEL_TELEPORT_MARGIN * UNITS_PER_TILE
+
+            if coord > right_warp_edge:
+                coord = left_warp_edge + (coord - right_warp_edge)
+            elif coord < left_warp_edge:
+                coord = right_warp_edge - (left_warp_edge - coord)
+
+        # Calculate if at new position we are at a tile center or edge.
+        offset = coord & UNITS_OFFSET_MASK
+        is_at_tile_center = offset == UNITS_TILE_CENTER
+        is_at_tile_edge   = offset == (0 if sign > 0 else UNITS_OFFSET_MASK)
+
+        # Set new position. self._position is synced by the caller once the whole move is done.
+        units[axis] = coord
+
+        return residual_distance, is_stuck, is_at_tile_center, is_at_tile_edge
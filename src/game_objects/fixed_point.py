@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+from functools import lru_cache
+
+from src.constants import (GAME_ORIGINAL_UPDATES_INTERVAL,
+                           PACMAN_SPEED,
+                           GHOSTS_SPEED)
+
+
+# Integer coordinates used by the fixed-point movement core of Character, as done by the arcade.
+# Each tile is split in UNITS_PER_TILE units, so that tile index, offset within the tile and distances travelled
+# are all exact integer operations, giving the same results on every platform.
+UNITS_SHIFT        = 8
+UNITS_PER_TILE     = 1 << UNITS_SHIFT
+UNITS_OFFSET_MASK  = UNITS_PER_TILE - 1
+UNITS_TILE_CENTER  = UNITS_PER_TILE // 2
+
+
+def to_units(coordinate):
+    """Converts a coordinate in tiles to the closest integer number of units."""
+    return round(coordinate * UNITS_PER_TILE)
+
+
+def from_units(units):
+    """Converts an integer number of units to a coordinate in tiles. Exact, as UNITS_PER_TILE is a power of two."""
+    return units / UNITS_PER_TILE
+
+
+# Distances travelled at each game tick, in units, precomputed once per combination of arguments.
+# With the arcade reference speed, every speed multiplier used by the game is a whole number of units per tick (e.g. 0.80 -> 32 units),
+# so the speed pattern of each level is simply constant and movement doesn't accumulate rounding errors.
+@lru_cache(maxsize = None)
+def pacman_speed_units(level, fright):
+    return to_units(PACMAN_SPEED(level, fright) * GAME_ORIGINAL_UPDATES_INTERVAL)
+
+
+@lru_cache(maxsize = None)
+def ghosts_speed_units(level, fright, in_warp_tunnel, going_to_house, in_or_exiting_house, cruise_elroy):
+    return to_units(GHOSTS_SPEED(level, fright, in_warp_tunnel, going_to_house, in_or_exiting_house, cruise_elroy) * GAME_ORIGINAL_UPDATES_INTERVAL)
@@ -4,6 +4,8 @@
 from abc import ABC, abstractmethod
 
 from src.game_objects.character import Character
+from src.game_objects import tile_graph
+from src.game_objects.fixed_point import UNITS_SHIFT
 
 from src.directions import Vector2
 from src.constants import (Ghost,
@@ -13,8 +15,6 @@ from src.constants import (Ghost,
                            GHOSTS_START_BEHAVIOUR,
                            GhostBehaviour,
                            CruiseElroyLevel,
-                           GHOSTS_SPEED,
-                           GHOSTS_FORBIDDEN_TURNING_UP_TILES,
                            GHOSTS_SCATTER_MODE_TARGET_TILES,
                            GHOSTS_EATEN_TARGET_TILE,
                            GHOSTS_EATEN_TARGET_Y_IN_HOUSE)
@@ -24,9 +24,10 @@ from src.constants import (Ghost,
 
 
 class GhostAbstract(Character, ABC):
-    def __init__(self, name, prng):
-        super().__init__(position  = GHOSTS_START_POSITIONS [name],
-                         direction = GHOSTS_START_DIRECTIONS[name])
+    def __init__(self, name, prng, fixed_point = False):
+        super().__init__(position    = GHOSTS_START_POSITIONS [name],
+                         direction   = GHOSTS_START_DIRECTIONS[name],
+                         fixed_point = fixed_point)
 
         self._name = name
         self._prng = prng
@@ -48,49 +49,87 @@ class GhostAbstract(Character, ABC):
         self._was_just_eaten = False
 
 
-    def update(self, level, fright, maze, pacman, clyde_in_house, died_this_level):
+    def update(self, profile, fright, maze, pacman, clyde_in_house, died_this_level):
+        # profile is the LevelProfile of the current level.
+
+        if self._fixed_point:
+            self._update_fixed(profile, fright, maze, pacman, clyde_in_house, died_this_level)
+            return
+
+        speeds = profile.ghosts_speed[fright]
 
         dt = GAME_ORIGINAL_UPDATES_INTERVAL
 
         while dt > 0:
             # Distance that can still be travelled depends on the tile (whether in warp tunnel or not).
-            in_warp_tunnel = maze.tile_is_warp_tunnel(self._position)
+            in_warp_tunnel = tile_graph.tile_is_warp_tunnel(self._position)
             going_to_house = GhostBehaviour.GOING_TO_HOUSE in self._behaviour
             in_or_exiting_house = (GhostBehaviour.IN_HOUSE in self._behaviour) or (GhostBehaviour.EXITING_HOUSE in self._behaviour)
-            self._update_cruise_elroy_level(level, maze.n_pellets_remaining, clyde_in_house, died_this_level)
-            speed = GHOSTS_SPEED(level, fright, in_warp_tunnel, going_to_house, in_or_exiting_house, self._cruise_elroy_level)
+            self._update_cruise_elroy_level(profile, maze.n_pellets_remaining, clyde_in_house, died_this_level)
+            speed = speeds[in_warp_tunnel][going_to_house][in_or_exiting_house][self._cruise_elroy_level]
             residual_distance = speed * dt
             
             # Update position clipping to closest half-tile.
             collide_with_door = (GhostBehaviour.EXITING_HOUSE not in self._behaviour) and (GhostBehaviour.ENTERING_HOUSE not in self._behaviour)
             residual_distance, _, is_at_tile_center, is_at_tile_edge = super()._update_position_within_tile(residual_distance, maze, collide_with_door)
 
-            # Update direction attributes based on behaviours.
-            if GhostBehaviour.IN_HOUSE         in self._behaviour:
-                self._behaviour_in_house         (is_at_tile_center, is_at_tile_edge, maze, pacman)
-            elif GhostBehaviour.EXITING_HOUSE  in self._behaviour:
-                self._behaviour_exiting_house    (is_at_tile_center, is_at_tile_edge, maze, pacman)
-            elif GhostBehaviour.GOING_TO_HOUSE in self._behaviour:
-                self._behaviour_going_to_house   (is_at_tile_center, is_at_tile_edge, maze, pacman)
-            elif GhostBehaviour.ENTERING_HOUSE in self._behaviour:
-                self._behaviour_entering_house   (is_at_tile_center, is_at_tile_edge, maze, pacman)
-            elif GhostBehaviour.FRIGHTENED     in self._behaviour:
-                self._behaviour_frightened       (is_at_tile_center, is_at_tile_edge, maze, pacman)
-            elif GhostBehaviour.CHASE          in self._behaviour:
-                self._behaviour_reach_target_tile(is_at_tile_center, is_at_tile_edge, maze, pacman)
-            elif GhostBehaviour.SCATTER        in self._behaviour:
-                self._behaviour_reach_target_tile(is_at_tile_center, is_at_tile_edge, maze, pacman)
-                
-            # Update variable describing whether going from edge to center of a tile.
-            if is_at_tile_center:
-                self._going_from_tile_edge_to_center = False
-            elif is_at_tile_edge:
-                self._going_from_tile_edge_to_center = True
+            self._update_behaviour(is_at_tile_center, is_at_tile_edge, maze, pacman)
 
             # Calculate residual dt not used by movement at this speed, if any.
             dt = residual_distance / speed
 
 
+    def _update_fixed(self, profile, fright, maze, pacman, clyde_in_house, died_this_level):
+        # Same as GhostAbstract.update, with distances and coordinates in fixed_point units. Instead of going through dt,
+        # the distance left when speed changes (entering or leaving the warp tunnel) is rescaled with an integer division.
+        residual_distance = previous_speed = None
+        speeds = profile.ghosts_speed_units[fright]
+
+        units = self._units
+        while residual_distance != 0:
+            in_warp_tunnel = tile_graph.tile_is_warp_tunnel_at(units[1] >> UNITS_SHIFT, units[0] >> UNITS_SHIFT)
+            going_to_house = GhostBehaviour.GOING_TO_HOUSE in self._behaviour
+            in_or_exiting_house = (GhostBehaviour.IN_HOUSE in self._behaviour) or (GhostBehaviour.EXITING_HOUSE in self._behaviour)
+            self._update_cruise_elroy_level(profile, maze.n_pellets_remaining, clyde_in_house, died_this_level)
+            speed = speeds[in_warp_tunnel][going_to_house][in_or_exiting_house][self._cruise_elroy_level]
+
+            residual_distance = speed if previous_speed is None else residual_distance * speed // previous_speed
+            previous_speed = speed
+            if residual_distance == 0:
+                break
+
+            collide_with_door = (GhostBehaviour.EXITING_HOUSE not in self._behaviour) and (GhostBehaviour.ENTERING_HOUSE not in self._behaviour)
+            residual_distance, _, is_at_tile_center, is_at_tile_edge = super()._update_position_within_tile_fixed(residual_distance, collide_with_door)
+
+            self._update_behaviour(is_at_tile_center, is_at_tile_edge, maze, pacman)
+
+        self._sync_position_from_units()
+
+
+    def _update_behaviour(self, is_at_tile_center, is_at_tile_edge, maze, pacman):
+        # Update direction attributes based on behaviours.
+        if GhostBehaviour.IN_HOUSE         in self._behaviour:
+            self._behaviour_in_house         (is_at_tile_center, is_at_tile_edge, maze, pacman)
+        elif GhostBehaviour.EXITING_HOUSE  in self._behaviour:
+            self._behaviour_exiting_house    (is_at_tile_center, is_at_tile_edge, maze, pacman)
+        elif GhostBehaviour.GOING_TO_HOUSE in self._behaviour:
+            self._behaviour_going_to_house   (is_at_tile_center, is_at_tile_edge, maze, pacman)
+        elif GhostBehaviour.ENTERING_HOUSE in self._behaviour:
+            self._behaviour_entering_house   (is_at_tile_center, is_at_tile_edge, maze, pacman)
+        elif GhostBehaviour.FRIGHTENED     in self._behaviour:
+            self._behaviour_frightened       (is_at_tile_center, is_at_tile_edge, maze, pacman)
+        elif GhostBehaviour.CHASE          in self._behaviour:
+            self._behaviour_reach_target_tile(is_at_tile_center, is_at_tile_edge, maze, pacman)
+        elif GhostBehaviour.SCATTER        in self._behaviour:
+            self._behaviour_reach_target_tile(is_at_tile_center, is_at_tile_edge, maze, pacman)
+                
+        # Update variable describing whether going from edge to center of a tile.
+        if is_at_tile_center:
+            self._going_from_tile_edge_to_center = False
+        elif is_at_tile_edge:
+            self._going_from_tile_edge_to_center = True
+
+
     def _behaviour_in_house(self, is_at_tile_center, is_at_tile_edge, maze, pacman):
         self._direction_next = self._direction_next_next = None
 
@@ -101,7 +140,7 @@ class GhostAbstract(Character, ABC):
 
     def _behaviour_exiting_house(self, is_at_tile_center, is_at_tile_edge, maze, pacman):
         self._direction_next = self._direction_next_next = None
-        round_position = self._position.round_to_nearest_half()
+        round_position = self._current_position().round_to_nearest_half()
 
         if round_position.x > GHOSTS_START_POSITIONS[Ghost.PINKY].x:
             self._direction = Vector2.LEFT
@@ -118,7 +157,7 @@ class GhostAbstract(Character, ABC):
 
 
     def _behaviour_going_to_house(self, is_at_tile_center, is_at_tile_edge, maze, pacman):
-        round_position = self._position.round_to_nearest_half()
+        round_position = self._current_position().round_to_nearest_half()
 
         if round_position == GHOSTS_START_POSITIONS[Ghost.BLINKY] and is_at_tile_edge:
             self._add_behaviour(GhostBehaviour.ENTERING_HOUSE)
@@ -133,7 +172,7 @@ class GhostAbstract(Character, ABC):
 
     def _behaviour_entering_house(self, is_at_tile_center, is_at_tile_edge, maze, pacman):
         self._direction_next = self._direction_next_next = None
-        round_position = self._position.round_to_nearest_half()
+        round_position = self._current_position().round_to_nearest_half()
 
         if not is_at_tile_edge or round_position.y != GHOSTS_EATEN_TARGET_Y_IN_HOUSE:
             return
@@ -216,33 +255,21 @@ class GhostAbstract(Character, ABC):
 
     def _calculate_direction_at_tile_center(self, maze, pacman, direction_from_current_tile):
         target_tile = self._calculate_target_tile(pacman, maze)
+        target_x = target_tile.x
+        target_y = target_tile.y
         
         # Ghost has just entered a new tile. Hence it did not switch yet his current direction of travel with the
         # one calculated for this tile (switch will only happen once he reaches the center of the current tile). 
-        current_tile = maze.get_tile_center(self._position)
-        next_tile = current_tile + direction_from_current_tile
+        # Legal directions at next tile exclude flipping direction and going into walls. Ghosts are also not allowed to turn
+        # upwards on certain tiles when in chase or scatter mode. They can, however, when returning to house (and in frightened mode).
+        exits = tile_graph.ghost_exits(self._current_position(), direction_from_current_tile, GhostBehaviour.GOING_TO_HOUSE in self._behaviour)
 
         # Direction is chosen so that euclidean distance between next next tile and target tile is minimized.
         # In case of equivalency, preference is in this order (from most preferred to least): up, left, down, right.
         min_distance   = float('inf')
         best_direction = None
-        for direction in (Vector2.UP, Vector2.LEFT, Vector2.DOWN, Vector2.RIGHT):
-            # Ghosts are not allowed to willingly flip direction.
-            if direction == -direction_from_current_tile:
-                continue
-
-            # Ghosts are not allowed to turn upwards on certain tiles when in chase or scatter mode.
-            # They can, however, when returning to house (and in frightened mode).
-            if next_tile in GHOSTS_FORBIDDEN_TURNING_UP_TILES and direction == Vector2.UP and GhostBehaviour.GOING_TO_HOUSE not in self._behaviour:
-                continue
-
-            next_next_tile = next_tile + direction
-
-            # Ghosts can't go in a wall.
-            if maze.tile_is_not_walkable(next_next_tile):
-                continue
-
-            distance = Vector2.distance_squared(target_tile, next_next_tile)
+        for direction, next_next_x, next_next_y in exits:
+            distance = (target_x - next_next_x) ** 2 + (target_y - next_next_y) ** 2
 
             if distance < min_distance:
                 min_distance = distance
@@ -266,14 +293,10 @@ class GhostAbstract(Character, ABC):
 
 
     def _frightened_ghost_random_direction(self, maze):
-        current_tile = maze.get_tile_center(self._position)
-        directions_clockwise = [Vector2.UP, Vector2.RIGHT, Vector2.DOWN, Vector2.LEFT]
-
-        direction = self._prng.get_random_direction()
-        starting_idx = directions_clockwise.index(direction)
+        current_tile = maze.get_tile_center(self._current_position())
 
-        for offset in range(0, len(directions_clockwise)):
-            direction =  directions_clockwise[(starting_idx + offset) % len(directions_clockwise)]
+        # The random direction, then the following ones clockwise.
+        for direction in self._prng.get_random_clockwise_directions():
             next_tile = current_tile + direction
 
             if not maze.tile_is_not_walkable(next_tile) and direction != -self._direction:
@@ -282,6 +305,20 @@ class GhostAbstract(Character, ABC):
         raise RuntimeError("No valid direction found in GhostAbstract._frightened_ghost_random_direction")
 
 
+    def snapshot(self):
+        """Returns the state of the ghost as a flat tuple of immutable values."""
+        return (self._position.x, self._position.y, self._direction, self._direction_next, self._direction_next_next,
+                self._behaviour, self._reverse_direction_signal, self._going_from_tile_edge_to_center,
+                self._cruise_elroy_level, self._was_just_eaten)
+
+    def restore(self, state):
+        """Restores the state of the ghost from a tuple returned by GhostAbstract.snapshot."""
+        x, y, self._direction, self._direction_next, self._direction_next_next, \
+            self._behaviour, self._reverse_direction_signal, self._going_from_tile_edge_to_center, \
+            self._cruise_elroy_level, self._was_just_eaten = state
+        self._set_position(Vector2(x, y))
+
+
     def _add_behaviour(self, behaviour):
         if behaviour not in GhostBehaviour:
             raise ValueError('Invalid behaviour provided to Ghost._add_behaviour')
@@ -345,6 +382,6 @@ class GhostAbstract(Character, ABC):
     def _calculate_personal_target_tile(self):
         raise NotImplementedError
 
-    def _update_cruise_elroy_level(self, level, pellets_remaining, clyde_in_house, died_this_level):
+    def _update_cruise_elroy_level(self, profile, pellets_remaining, clyde_in_house, died_this_level):
         return
         
\ No newline at end of file
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+import math
+
 from src.game_objects.prng import PRNG
 from src.game_objects.ghosts.ghost_personalities import (Blinky,
                                                          Pinky,
@@ -8,16 +10,14 @@ from src.game_objects.ghosts.ghost_personalities import (Blinky,
 
 from src.constants import (Ghost,
                            GhostBehaviour,
-                           SCATTER_CHASE_ALTERNATIONS,
-                           DOT_COUNTER_LIMIT,
-                           DOT_GLOBAL_COUNTER_LIMIT,
-                           DOTS_NOT_EATEN_TIMER_THR)
+                           DOT_GLOBAL_COUNTER_LIMIT)
 
 
 # New instance is created at each level.
 class GhostsCoordinator:
 
-    def __init__(self):
+    def __init__(self, fixed_point = False):
+        self._fixed_point = fixed_point
         self._died_this_level = False
         self._reset_level(level_start = True)
 
@@ -34,49 +34,90 @@ class GhostsCoordinator:
         self._mode_timer = 0
         self._prng = PRNG()
 
+        # Scatter and chase modes are only requested to the ghosts when they switch: the mode timer is compared at each tick with the tick
+        # at which the current mode ends, taken from the LevelProfile it was computed from (None for the new ghosts to be sent their mode).
+        # Fright is cleared from all ghosts once, at the first tick it is off.
+        self._mode_profile = None
+        self._mode_end_tick = 0
+        self._fright_to_clear = False
+
         self._time_since_dot_eaten = 0
 
         # Instanciate ghosts.
-        blinky = Blinky(self._prng)
-        self._ghosts = (blinky, Pinky(self._prng), Inky(self._prng, blinky), Clyde(self._prng))
+        blinky = Blinky(self._prng, self._fixed_point)
+        self._ghosts = (blinky, Pinky(self._prng, self._fixed_point), Inky(self._prng, blinky, self._fixed_point), Clyde(self._prng, self._fixed_point))
 
 
     def __iter__(self):
         return iter(self._ghosts)
 
 
-    def _update_movement_mode(self, level, fright):
+    def snapshot(self):
+        """Returns the state of the coordinator, its PRNG and all ghosts as a tuple of immutable values."""
+        return (self._died_this_level, self._mode_timer, self._prng.rng_index, self._time_since_dot_eaten,
+                tuple(self._dot_counter_ghosts), self._dot_counter_global, self._dot_counter_global_enable,
+                tuple(ghost.snapshot() for ghost in self._ghosts))
+
+    def restore(self, state):
+        """Restores the state of the coordinator from a tuple returned by GhostsCoordinator.snapshot."""
+        self._died_this_level, self._mode_timer, self._prng.rng_index, self._time_since_dot_eaten, \
+            dot_counter_ghosts, self._dot_counter_global, self._dot_counter_global_enable, ghosts_states = state
+
+        self._dot_counter_ghosts[:] = dot_counter_ghosts
+        for ghost, ghost_state in zip(self._ghosts, ghosts_states):
+            ghost.restore(ghost_state)
+
+        # Mode and fright are requested again at the next tick, as done after each switch.
+        self._mode_profile = None
+        self._fright_to_clear = True
+
+
+    def _update_movement_mode(self, profile, fright):
         
         # If fright is on, we can't change mode and must not update timer. 
         if fright:
+            self._fright_to_clear = True
             return
 
-        # If fright is off, remove it from all ghosts.
-        self._clear_fright_from_all()
+        # If fright just turned off, remove it from all ghosts.
+        if self._fright_to_clear:
+            self._clear_fright_from_all()
+            self._fright_to_clear = False
 
         # Update timer.
         self._mode_timer += 1
 
-        # Calculate current mode based on timer value.
-        mode_durations = SCATTER_CHASE_ALTERNATIONS(level)
-        
-        cumtime = 0
-        for mode, duration in mode_durations:
-            cumtime += duration
+        # Switch mode once the current one ends (or the level, and so its modes, changed).
+        if self._mode_timer > self._mode_end_tick or profile is not self._mode_profile:
+            mode_idx = profile.mode_index_at(self._mode_timer)
+            self._mode_profile = profile
+            self._mode_end_tick = profile.mode_end_ticks[mode_idx]
+            self._request_behaviour_to_all(profile.modes[mode_idx])
 
-            if self._mode_timer <= cumtime:
-                self._request_behaviour_to_all(mode)
-                return
 
-        raise RuntimeError('Reached end of GhostCoordinator._update_mode without finding a behaviour for current timer')
+    def mode_schedule(self):
+        """Returns the upcoming switches between scatter and chase modes as (number of ticks until the switch, mode switched to) pairs,
+        in order. Ticks are only counted while fright is off, as the mode timer is paused during fright. Empty until the first update."""
+        if self._mode_profile is None:
+            return ()
+
+        schedule = []
+        for mode_end_tick, next_mode in zip(self._mode_profile.mode_end_ticks, self._mode_profile.modes[1:]):
+            # The next mode starts at the first tick after the end of the current one.
+            ticks_to_switch = math.floor(mode_end_tick) + 1 - self._mode_timer
+            if ticks_to_switch > 0:
+                schedule.append((ticks_to_switch, next_mode))
+
+        return tuple(schedule)
 
-    def update(self, level, fright, maze, pacman, update_only_transparent):
+    def update(self, profile, fright, maze, pacman, update_only_transparent):
+        # profile is the LevelProfile of the current level.
         if not update_only_transparent:
-            self._update_movement_mode(level, fright)
+            self._update_movement_mode(profile, fright)
             self._time_since_dot_eaten += 1
 
             # Check if ghost needs to leave house.
-            self._check_leave_house(level)
+            self._check_leave_house(profile)
 
         # Update all ghosts.
         clyde_in_house = self._ghosts[Ghost.CLYDE].is_in_house
@@ -84,7 +125,7 @@ class GhostsCoordinator:
             if update_only_transparent and (not ghost.transparent or ghost.was_just_eaten):
                 continue
 
-            ghost.update(level, fright, maze, pacman, clyde_in_house, self._died_this_level)
+            ghost.update(profile, fright, maze, pacman, clyde_in_house, self._died_this_level)
 
 
     def notify_pellet_eaten(self):
@@ -131,6 +172,7 @@ class GhostsCoordinator:
 
     def notify_fright_on(self, fright_duration):
         self._request_behaviour_to_all(GhostBehaviour.FRIGHTENED)
+        self._fright_to_clear = True
 
         if fright_duration <= 0:
             self._clear_fright_from_all()
@@ -154,14 +196,14 @@ class GhostsCoordinator:
             ghost.clear_fright()
 
 
-    def _check_leave_house(self, level):
+    def _check_leave_house(self, profile):
         for name in Ghost:
             ghost = self._ghosts[name]
 
             if not ghost.is_in_house:
                 continue
 
-            if self._time_since_dot_eaten >= DOTS_NOT_EATEN_TIMER_THR(level):
+            if self._time_since_dot_eaten >= profile.dots_not_eaten_timer_thr:
                 self._time_since_dot_eaten = 0
                 ghost.request_behaviour(GhostBehaviour.EXITING_HOUSE)
                 continue
@@ -174,7 +216,7 @@ class GhostsCoordinator:
                 # If global dot counter enabled, don't perform the check with regular dot counters. 
                 continue 
 
-            if self._dot_counter_ghosts[name] >= DOT_COUNTER_LIMIT(name, level):
+            if self._dot_counter_ghosts[name] >= profile.dot_counter_limits[name]:
                 ghost.request_behaviour(GhostBehaviour.EXITING_HOUSE)
 
 
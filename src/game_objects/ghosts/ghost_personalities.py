@@ -4,15 +4,14 @@
 from src.game_objects.ghosts.ghost_abstract import GhostAbstract
 
 from src.constants import (Ghost,
-                           CruiseElroyLevel,
-                           CRUISE_ELROY_PELLETS_THR)
+                           CruiseElroyLevel)
 from src.directions import Vector2
 
 
 class Blinky(GhostAbstract):
 
-    def __init__(self, prng):
-        super().__init__(Ghost.BLINKY, prng)
+    def __init__(self, prng, fixed_point = False):
+        super().__init__(Ghost.BLINKY, prng, fixed_point)
         self._direction_next      = Vector2.LEFT
         self._direction_next_next = Vector2.LEFT
 
@@ -20,12 +19,12 @@ class Blinky(GhostAbstract):
         pacman_tile = maze.get_tile_center(pacman.position)
         return pacman_tile
 
-    def _update_cruise_elroy_level(self, level, pellets_remaining, clyde_in_house, died_this_level):
+    def _update_cruise_elroy_level(self, profile, pellets_remaining, clyde_in_house, died_this_level):
         if died_this_level and clyde_in_house:
             self._cruise_elroy_level = CruiseElroyLevel.NULL
             return
 
-        first_thr, second_thr = CRUISE_ELROY_PELLETS_THR(level)
+        first_thr, second_thr = profile.cruise_elroy_pellets_thr
 
         if pellets_remaining <= second_thr:
             self._cruise_elroy_level = CruiseElroyLevel.SECOND
@@ -37,8 +36,8 @@ class Blinky(GhostAbstract):
 
 class Pinky(GhostAbstract):
 
-    def __init__(self, prng):
-        super().__init__(Ghost.PINKY, prng)
+    def __init__(self, prng, fixed_point = False):
+        super().__init__(Ghost.PINKY, prng, fixed_point)
 
     def _calculate_personal_target_tile(self, pacman, maze):
         in_front_tile = maze.get_tile_center(pacman.position)
@@ -52,8 +51,8 @@ class Pinky(GhostAbstract):
 
 class Inky(GhostAbstract):
 
-    def __init__(self, prng, blinky):
-        super().__init__(Ghost.INKY, prng)
+    def __init__(self, prng, blinky, fixed_point = False):
+        super().__init__(Ghost.INKY, prng, fixed_point)
         self._blinky = blinky
 
 
@@ -73,12 +72,12 @@ class Inky(GhostAbstract):
 
 class Clyde(GhostAbstract):
 
-    def __init__(self, prng):
-        super().__init__(Ghost.CLYDE, prng)
+    def __init__(self, prng, fixed_point = False):
+        super().__init__(Ghost.CLYDE, prng, fixed_point)
 
 
     def _calculate_personal_target_tile(self, pacman, maze):
-        distance_squared = Vector2.distance_squared(self._position, pacman.position)
+        distance_squared = Vector2.distance_squared(self._current_position(), pacman.position)
 
         # If distance from Pac-Man is larger than 8 tiles.
         if distance_squared > 64:
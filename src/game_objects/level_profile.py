@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+from functools import lru_cache
+from itertools import accumulate
+
+from src.game_objects.fixed_point import (pacman_speed_units,
+                                          ghosts_speed_units)
+from src.constants import (Ghost,
+                           CruiseElroyLevel,
+                           GAME_ORIGINAL_UPDATES_INTERVAL,
+                           PACMAN_SPEED,
+                           GHOSTS_SPEED,
+                           CRUISE_ELROY_PELLETS_THR,
+                           FRIGHT_TIME_AND_FLASHES,
+                           SCATTER_CHASE_ALTERNATIONS,
+                           DOT_COUNTER_LIMIT,
+                           DOTS_NOT_EATEN_TIMER_THR)
+
+
+# Number of levels whose profile is kept once built. The level counter of the arcade wraps after 256 levels.
+_N_PROFILES_CACHED = 256
+
+
+
+def _tabulate_ghosts_speed(speed_function, level):
+    # Nested tuples indexed by [fright][in_warp_tunnel][going_to_house][in_or_exiting_house][cruise_elroy], booleans indexing as 0 or 1.
+    return tuple(tuple(tuple(tuple(tuple(speed_function(level, fright, in_warp_tunnel, going_to_house, in_or_exiting_house, cruise_elroy)
+                                         for cruise_elroy in CruiseElroyLevel)
+                                   for in_or_exiting_house in (False, True))
+                             for going_to_house in (False, True))
+                       for in_warp_tunnel in (False, True))
+                 for fright in (False, True))
+
+
+
+
+class LevelProfile:
+    """Class LevelProfile. Values of the level-dependent functions of src/constants.py for a single level, computed once when the level
+    starts, so that Pac-Man, the ghosts and the ghosts coordinator only look them up at each tick. Profiles are obtained with
+    level_profile, which keeps them once built."""
+
+    __slots__ = ('_level', '_pacman_speed', '_pacman_speed_units', '_ghosts_speed', '_ghosts_speed_units', '_cruise_elroy_pellets_thr',
+                 '_fright_duration', '_fright_flashes', '_modes', '_mode_end_ticks', '_dot_counter_limits', '_dots_not_eaten_timer_thr')
+
+    def __init__(self, level):
+        """Constructor for the class LevelProfile. Raises ValueError for invalid levels, as the functions of src/constants.py."""
+        self._level = level
+
+        # Speeds of Pac-Man in tiles per tick and of the ghosts in tiles per second, as used by their movement, and both in fixed-point units
+        # per tick. Pac-Man speeds are indexed by fright.
+        self._pacman_speed       = tuple(PACMAN_SPEED(level, fright) * GAME_ORIGINAL_UPDATES_INTERVAL for fright in (False, True))
+        self._pacman_speed_units = tuple(pacman_speed_units(level, fright) for fright in (False, True))
+        self._ghosts_speed       = _tabulate_ghosts_speed(GHOSTS_SPEED, level)
+        self._ghosts_speed_units = _tabulate_ghosts_speed(ghosts_speed_units, level)
+
+        self._cruise_elroy_pellets_thr = CRUISE_ELROY_PELLETS_THR(level)
+        self._fright_duration, self._fright_flashes = FRIGHT_TIME_AND_FLASHES(level)
+
+        # Scatter and chase modes, and tick of the mode timer at which each of them ends (included).
+        mode_durations = SCATTER_CHASE_ALTERNATIONS(level)
+        self._modes          = tuple(mode for mode, _ in mode_durations)
+        self._mode_end_ticks = tuple(accumulate(duration for _, duration in mode_durations))
+
+        self._dot_counter_limits = tuple(DOT_COUNTER_LIMIT(name, level) for name in Ghost)
+        self._dots_not_eaten_timer_thr = DOTS_NOT_EATEN_TIMER_THR(level)
+
+
+    def mode_index_at(self, mode_timer):
+        """Returns the index in modes and mode_end_ticks of the scatter or chase mode of the ghosts when the mode timer reaches mode_timer."""
+        return bisect.bisect_left(self._mode_end_ticks, mode_timer)
+
+
+    # Defining properties for some private attributes.
+    # Speeds of the ghosts are nested tuples, indexed by [fright][in_warp_tunnel][going_to_house][in_or_exiting_house][cruise_elroy].
+    level                    = property(lambda self: self._level)
+    pacman_speed             = property(lambda self: self._pacman_speed)
+    pacman_speed_units       = property(lambda self: self._pacman_speed_units)
+    ghosts_speed             = property(lambda self: self._ghosts_speed)
+    ghosts_speed_units       = property(lambda self: self._ghosts_speed_units)
+    cruise_elroy_pellets_thr = property(lambda self: self._cruise_elroy_pellets_thr)
+    fright_duration          = property(lambda self: self._fright_duration)
+    fright_flashes           = property(lambda self: self._fright_flashes)
+    modes                    = property(lambda self: self._modes)
+    mode_end_ticks           = property(lambda self: self._mode_end_ticks)
+    dot_counter_limits       = property(lambda self: self._dot_counter_limits)
+    dots_not_eaten_timer_thr = property(lambda self: self._dots_not_eaten_timer_thr)
+
+
+
+
+@lru_cache(maxsize = _N_PROFILES_CACHED)
+def level_profile(level):
+    """Returns the LevelProfile of level, built on the first call for it."""
+    return LevelProfile(level)
+
+
+def clear_level_caches():
+    """Forgets the profiles built by level_profile, and the speeds in fixed-point units they are built from, so that they are built again
+    from the current values of src/constants.py (e.g. after changing REFERENCE_SPEED)."""
+    level_profile.cache_clear()
+    pacman_speed_units.cache_clear()
+    ghosts_speed_units.cache_clear()
@@ -13,30 +13,53 @@ from src.constants import (MazeTiles,
                            MAZE_START_NUM_PELLET)
 
 
+# Sanity check
+if len(MAZE_START_TILES) != MAZE_TILES_ROWS * MAZE_TILES_COLS:
+    raise RuntimeError('There is an error in the maze constants: lenght of initial tile array is not as expected.')
+
+# Static layout of the maze shared by all instances: one byte per tile, holding the MazeTiles value of the tile once all pellets are eaten.
+_LAYOUT = bytes(MazeTiles.EMPTY if tile in (MazeTiles.PELLET, MazeTiles.POWER_PELLET) else tile for tile in MAZE_START_TILES)
+_LAYOUT_WALL = int(MazeTiles.WALL)
+_LAYOUT_DOOR = int(MazeTiles.DOOR)
+
+# MazeTiles member corresponding to each value stored in _LAYOUT.
+_TILE_OF_VALUE = {int(tile): tile for tile in MazeTiles}
+
+# Pellets are stored as a bitmap, with one bit per tile starting with a pellet, ordered as in MAZE_START_TILES.
+# For each tile, index of its bit in the bitmap (or None if the tile never holds a pellet) and, for each bit, (row, col) of its tile.
+_PELLET_TILES_INDICES = tuple(index for index, tile in enumerate(MAZE_START_TILES) if tile in (MazeTiles.PELLET, MazeTiles.POWER_PELLET))
+_PELLET_BIT_OF_TILE   = tuple(_PELLET_TILES_INDICES.index(index) if index in _PELLET_TILES_INDICES else None for index in range(len(MAZE_START_TILES)))
+_PELLET_ROW_COL       = tuple(divmod(index, MAZE_TILES_COLS) for index in _PELLET_TILES_INDICES)
+_PELLETS_START_BITMAP = (1 << MAZE_START_NUM_PELLET) - 1
+
+
 class Maze:
     """Class Maze. Class storing the current state of the maze.
     Coordinate system chosen: (0,0) is at the top left, first coordinate is row and
-    second coordinate is column."""
+    second coordinate is column.
+    Walls and door never change and are shared by all instances, while the pellets
+    remaining are stored as a bitmap in an integer."""
     
     def __init__(self):
         """Constructor for the class Maze."""
-        self._tiles = list(MAZE_START_TILES)
+        # Integers are immutable, so the bitmap of the initial state doesn't need to be copied.
+        self._pellets   = _PELLETS_START_BITMAP
         self._n_pellets = MAZE_START_NUM_PELLET
 
-        # Sanity check
-        if len(self._tiles) != MAZE_TILES_ROWS * MAZE_TILES_COLS:
-            raise RuntimeError('There is an error in the maze constants: lenght of initial tile array is not as expected.')
-
 
     def __getitem__(self, index):
-        """Special function that allows to get items of attribute _tiles from the exterior."""
+        """Special function that allows to get the type of tiles from the exterior."""
         index, row, col = self._index_convert(index)
 
         # If out of maze bounds, all tiles are walls except for warp tunnel.
         if index is None:
             return MazeTiles.EMPTY if row == WARP_TUNNEL_ROW else MazeTiles.WALL
 
-        return self._tiles[index]
+        bit = _PELLET_BIT_OF_TILE[index]
+        if bit is not None and (self._pellets >> bit) & 1:
+            return MAZE_START_TILES[index]
+
+        return _TILE_OF_VALUE[_LAYOUT[index]]
 
     @staticmethod
     @lru_cache(len(MAZE_START_TILES) + 200)   # Useful mostly to cache the results when called with index a tuple of 2 ints. Speeds up on_draw a lot.
@@ -60,6 +83,15 @@ class Maze:
         return index, row, col
 
 
+    def snapshot(self):
+        """Returns the state of the maze as a tuple of immutable values."""
+        return (self._pellets, self._n_pellets)
+
+    def restore(self, state):
+        """Restores the state of the maze from a tuple returned by Maze.snapshot."""
+        self._pellets, self._n_pellets = state
+
+
     def tile_is_warp_tunnel(self, index):
         """Function that returns True if the tile at desired index is in the warp tunnel."""
         _, row, col = self._index_convert(index)
@@ -69,8 +101,14 @@ class Maze:
 
     def tile_is_not_walkable(self, index, collide_with_door = True):
         """Function that returns True if the tile at desired index is not walkable."""
-        tile_type = self[index]
-        return tile_type == MazeTiles.WALL or (tile_type == MazeTiles.DOOR and collide_with_door)
+        index, row, _ = self._index_convert(index)
+
+        # If out of maze bounds, all tiles are walls except for warp tunnel.
+        if index is None:
+            return row != WARP_TUNNEL_ROW
+
+        tile_value = _LAYOUT[index]
+        return tile_value == _LAYOUT_WALL or (tile_value == _LAYOUT_DOOR and collide_with_door)
     
 
     @staticmethod
@@ -79,18 +117,35 @@ class Maze:
         return Vector2(x = col + 0.5, y = row + 0.5)
 
     def eat_check_pellet(self, pacman_position):
-        """Updates maze if needed by replacing a pellet with an empty tile. Returns the (row, col) coordinates of
-        the tile in the array if such a replacement was performed and the type, None otherwise."""
+        """Updates maze if needed by removing the pellet on the tile where Pac-Man is.
+        Returns the type of pellet eaten if such a removal was performed, None otherwise."""
         index, _, _ = self._index_convert(pacman_position)
-        tile = self[pacman_position]
-
-        if tile in (MazeTiles.PELLET, MazeTiles.POWER_PELLET):
-            self._tiles[index] = MazeTiles.EMPTY
-            self._n_pellets -= 1
-            return tile
-        
-        return None
+        if index is None:
+            return None
+
+        bit = _PELLET_BIT_OF_TILE[index]
+        if bit is None or not (self._pellets >> bit) & 1:
+            return None
+
+        self._pellets ^= 1 << bit
+        self._n_pellets -= 1
+        return MAZE_START_TILES[index]
+
+
+    def pellets_changed(self, previous_bitmap):
+        """Returns a list with the (row, col) coordinates of all tiles whose pellet was eaten (or restored)
+        since the maze had the pellets bitmap provided, as obtained from the property pellets_bitmap."""
+        changed = []
+
+        diff = previous_bitmap ^ self._pellets
+        while diff:
+            lowest_bit = diff & -diff
+            changed.append(_PELLET_ROW_COL[lowest_bit.bit_length() - 1])
+            diff ^= lowest_bit
+
+        return changed
     
 
     n_pellets_remaining = property(lambda self: self._n_pellets)
-    completed           = property(lambda self: self._n_pellets == 0)
\ No newline at end of file
+    completed           = property(lambda self: self._n_pellets == 0)
+    pellets_bitmap      = property(lambda self: self._pellets)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+import os
+import math
+import hashlib
+import functools
+from collections import deque
+
+import numpy as np
+
+from src.directions import Vector2
+from src.game_objects.maze import Maze
+from src.constants import (MAZE_TILES_COLS,
+                           MAZE_TILES_ROWS,
+                           WARP_TUNNEL_TELEPORT_MARGIN,
+                           MAZE_DISTANCES_CACHE_DIR_PATH)
+
+
+# Tiles are those of the maze and those of the warp tunnel outside it, where characters go up to WARP_TUNNEL_TELEPORT_MARGIN tiles
+# before teleporting to the other side: columns of the grid are the ones of the maze shifted by the margin, and wrap around.
+_GRID_ROWS = MAZE_TILES_ROWS
+_GRID_COLS = MAZE_TILES_COLS + 2 * WARP_TUNNEL_TELEPORT_MARGIN
+
+# Next steps are stored as integer codes indexing _DIRECTIONS, ordered by preference of ghosts in case of paths of equal lengths.
+# Code _NO_STEP is used from a tile to itself and to tiles which can't be reached.
+_DIRECTIONS = (Vector2.UP, Vector2.LEFT, Vector2.DOWN, Vector2.RIGHT)
+_NO_STEP = 255
+
+# Version of the tables cached, part of the name of their file along with a hash of the tiles walkable.
+_CACHE_FORMAT_VERSION = 1
+
+
+
+
+def _walkable_grid(collide_with_door):
+    maze = Maze()
+    return np.array([[not maze.tile_is_not_walkable((row, col - WARP_TUNNEL_TELEPORT_MARGIN), collide_with_door) for col in range(_GRID_COLS)]
+                     for row in range(_GRID_ROWS)])
+
+
+def _node_of_tile(walkable):
+    node_of_tile = np.full(walkable.shape, -1, dtype = np.int16)
+    node_of_tile[walkable] = np.arange(np.count_nonzero(walkable))
+    return node_of_tile
+
+
+def _compute_tables(walkable):
+    # Breadth-first search from every tile. Returns the distances between all pairs of tiles and the next steps from one to the other,
+    # with rows indexed by the starting tile and columns by the tile reached.
+    node_of_tile = _node_of_tile(walkable)
+    tiles = np.argwhere(walkable)
+    n_tiles = len(tiles)
+
+    # Neighbour of each tile along each direction, or -1.
+    neighbours = np.full((n_tiles, len(_DIRECTIONS)), -1, dtype = np.int16)
+    for code, direction in enumerate(_DIRECTIONS):
+        rows = tiles[:, 0] + int(direction.y)
+        cols = (tiles[:, 1] + int(direction.x)) % _GRID_COLS
+        inside = (rows >= 0) & (rows < _GRID_ROWS)
+        neighbours[inside, code] = node_of_tile[rows[inside], cols[inside]]
+
+    adjacency = [[neighbour for neighbour in row if neighbour >= 0] for row in neighbours.tolist()]
+    distances = np.empty((n_tiles, n_tiles), dtype = np.int32)
+    for source in range(n_tiles):
+        source_distances = [-1] * n_tiles
+        source_distances[source] = 0
+        queue = deque((source,))
+        while queue:
+            node = queue.popleft()
+            for neighbour in adjacency[node]:
+                if source_distances[neighbour] < 0:
+                    source_distances[neighbour] = source_distances[node] + 1
+                    queue.append(neighbour)
+        distances[source] = source_distances
+
+    # The next step from a tile is the first direction, by preference, leading to a neighbour one step closer to the tile reached.
+    next_steps = np.full((n_tiles, n_tiles), _NO_STEP, dtype = np.uint8)
+    for code in range(len(_DIRECTIONS)):
+        starts = np.flatnonzero(neighbours[:, code] >= 0)
+        closer = (distances[neighbours[starts, code]] == distances[starts] - 1) & (distances[starts] > 0) & (next_steps[starts] == _NO_STEP)
+        steps = next_steps[starts]
+        steps[closer] = code
+        next_steps[starts] = steps
+
+    # Distances are stored in the smallest unsigned type holding them, its maximum value standing for no path.
+    dtype = np.uint8 if distances.max() < np.iinfo(np.uint8).max else np.uint16
+    distances = np.where(distances < 0, np.iinfo(dtype).max, distances).astype(dtype)
+
+    return distances, next_steps
+
+
+def _cache_path(walkable):
+    key = hashlib.sha256(np.array([_CACHE_FORMAT_VERSION, *walkable.shape], dtype = np.int32).tobytes() + np.packbits(walkable).tobytes())
+    return os.path.join(MAZE_DISTANCES_CACHE_DIR_PATH, f'maze_distances_{key.hexdigest()[:16]}.npz')
+
+
+
+
+class MazeDistances:
+    """Class MazeDistances. Lengths, in tiles, of the shortest paths along the corridors between all pairs of walkable tiles of the maze,
+    warp tunnel included, and first step along one of them. Both are looked up in tables computed once by breadth-first searches, so that
+    bots, heatmaps and statistics need no search of their own. Tiles are given as to Maze: as positions (Vector2), or (row, col) tuples.
+    Instances are obtained with maze_distances."""
+
+    def __init__(self, walkable, distances, next_steps):
+        """Constructor for the class MazeDistances. Tables are indexed by [starting tile, tile reached], tiles being numbered in the order
+        of the cells of walkable, a grid of the tiles of the maze whose columns are shifted by WARP_TUNNEL_TELEPORT_MARGIN."""
+        self._node_of_tile = _node_of_tile(walkable)
+        self._distances = distances
+        self._next_steps = next_steps
+        self._unreachable = np.iinfo(distances.dtype).max
+
+        n_tiles = np.count_nonzero(walkable)
+        if distances.shape != (n_tiles, n_tiles) or next_steps.shape != (n_tiles, n_tiles):
+            raise ValueError('Tables of MazeDistances do not match the walkable tiles')
+
+
+    def _node(self, index):
+        if isinstance(index, Vector2):
+            # Positions in the warp tunnel left of the maze are negative: their tile is the one below them.
+            row = math.floor(index.y)
+            col = math.floor(index.x)
+        elif isinstance(index, tuple) and len(index) == 2 and all(isinstance(elem, int) for elem in index):
+            row, col = index
+        else:
+            raise IndexError(f"Unsupported indexing value for class MazeDistances: {index}")
+
+        col += WARP_TUNNEL_TELEPORT_MARGIN
+        node = self._node_of_tile[row, col] if 0 <= row < _GRID_ROWS and 0 <= col < _GRID_COLS else -1
+        if node < 0:
+            raise ValueError(f"Tile of {index} is not walkable")
+
+        return node
+
+
+    def distance(self, start, end):
+        """Returns the number of steps from tile to tile along the shortest path from start to end, or None if end can't be reached."""
+        distance = self._distances[self._node(start), self._node(end)]
+        return None if distance == self._unreachable else int(distance)
+
+
+    def next_step(self, start, end):
+        """Returns the direction of the first step along the shortest path from start to end (the first one in the order of preference of
+        ghosts, up, left, down and right, if several are), or None if start and end are the same tile or end can't be reached."""
+        code = self._next_steps[self._node(start), self._node(end)]
+        return None if code == _NO_STEP else _DIRECTIONS[code]
+
+
+    # Defining properties for some private attributes.
+    # Tables indexed by [starting tile, tile reached], and number of each tile (-1 if not walkable), indexed by [row, column + WARP_TUNNEL_TELEPORT_MARGIN].
+    node_of_tile = property(lambda self: self._node_of_tile)
+    distances    = property(lambda self: self._distances)
+    next_steps   = property(lambda self: self._next_steps)
+    unreachable  = property(lambda self: self._unreachable)
+
+
+
+
+@functools.cache
+def maze_distances(collide_with_door = True):
+    """Returns the MazeDistances of the tiles walkable by characters colliding with the door of the ghost house or not. Tables are
+    loaded from MAZE_DISTANCES_CACHE_DIR_PATH, where they are saved once computed for the current layout of the maze."""
+    walkable = _walkable_grid(collide_with_door)
+    path = _cache_path(walkable)
+
+    try:
+        with np.load(path) as tables:
+            return MazeDistances(walkable, tables['distances'], tables['next_steps'])
+    except Exception:
+        # Missing or invalid: computed again and saved over.
+        pass
+
+    distances, next_steps = _compute_tables(walkable)
+
+    try:
+        os.makedirs(MAZE_DISTANCES_CACHE_DIR_PATH, exist_ok = True)
+        # Written under a temporary name first, so that an interrupted write never leaves a truncated file under the final one.
+        with open(path + '.tmp', 'wb') as file:
+            np.savez(file, distances = distances, next_steps = next_steps)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        # The tables are then computed again the next time, which only costs some time.
+        pass
+
+    return MazeDistances(walkable, distances, next_steps)
@@ -4,10 +4,10 @@ from enum import IntEnum
 
 from src.directions import Vector2
 from src.game_objects.character import Character
+from src.game_objects.fixed_point import (UNITS_SHIFT,
+                                          UNITS_TILE_CENTER)
 
-from src.constants import (GAME_ORIGINAL_UPDATES_INTERVAL,
-                           PACMAN_SPEED,
-                           PACMAN_START_POSITION,
+from src.constants import (PACMAN_START_POSITION,
                            PacManStates,
                            PACMAN_PELLET_PENALTIES)
 
@@ -17,9 +17,10 @@ from src.constants import (GAME_ORIGINAL_UPDATES_INTERVAL,
 
 class PacMan(Character):
 
-    def __init__(self):
-        super().__init__(position  = PACMAN_START_POSITION,
-                         direction = Vector2.LEFT)
+    def __init__(self, fixed_point = False):
+        super().__init__(position    = PACMAN_START_POSITION,
+                         direction   = Vector2.LEFT,
+                         fixed_point = fixed_point)
 
         self._old_position = self._position
         self._state     = PacManStates.SPAWNING
@@ -27,7 +28,8 @@ class PacMan(Character):
 
         self._direction_input = None
 
-    def update(self, level, fright, maze):
+    def update(self, profile, fright, maze):
+        # profile is the LevelProfile of the current level.
 
         if self._state in (PacManStates.SPAWNING, PacManStates.DEAD):
             # Ignore any request to change direction.
@@ -47,7 +49,7 @@ class PacMan(Character):
                     self._state = PacManStates.TURNING
             
             # Try to move.
-            is_stuck, turning = self._update_position(level, fright, maze)
+            is_stuck, turning = self._update_position(profile, fright, maze)
 
             # Update state based on if Pac-Man stuck or not, only if not still turning.
             if not turning:
@@ -78,6 +80,18 @@ class PacMan(Character):
         return False
 
 
+    def snapshot(self):
+        """Returns the state of Pac-Man as a flat tuple of immutable values."""
+        return (self._position.x, self._position.y, self._old_position.x, self._old_position.y,
+                self._direction, self._direction_input, self._state, self._penalty)
+
+    def restore(self, state):
+        """Restores the state of Pac-Man from a tuple returned by PacMan.snapshot."""
+        x, y, old_x, old_y, self._direction, self._direction_input, self._state, self._penalty = state
+        self._set_position(Vector2(x, y))
+        self._old_position = Vector2(old_x, old_y)
+
+
     def add_penalty(self, pellet_type):
         self._penalty += PACMAN_PELLET_PENALTIES[pellet_type]
 
@@ -90,16 +104,19 @@ class PacMan(Character):
     def state_set_death(self):
         self._state = PacManStates.DEAD
 
-    def _update_position(self, level, fright, maze):
+    def _update_position(self, profile, fright, maze):
         self._old_position = self._position
         
         # Update penalty to movement speed.
         if self._penalty > 0:
             self._penalty -= 1
             return self._state == PacManStates.STUCK, self._state == PacManStates.TURNING # No change in state
+
+        if self._fixed_point:
+            return self._update_position_fixed(profile, fright)
         
         # Calculate how far Pac-Man has theoretically moved.
-        distance = PACMAN_SPEED(level, fright) * GAME_ORIGINAL_UPDATES_INTERVAL
+        distance = profile.pacman_speed[fright]
 
         # When turning, specific movement logic needed to bring Pac-Man back to center of corridor.
         # No collision detection because this was already checked by PacMan._update_direction method.
@@ -134,6 +151,36 @@ class PacMan(Character):
 
         return is_stuck, False # If he wasn't turning, he is not turning due to this function.
 
+    def _update_position_fixed(self, profile, fright):
+        # Same as PacMan._update_position after the penalty check, with distances and coordinates in fixed_point units.
+        distance = profile.pacman_speed_units[fright]
+
+        if self._state == PacManStates.TURNING:
+            units = self._units
+            axis = 0 if self._direction.x else 1
+            units[axis] += (self._direction.x or self._direction.y) * distance
+
+            coord = units[1 - axis]
+            offset = ((coord >> UNITS_SHIFT) << UNITS_SHIFT) + UNITS_TILE_CENTER - coord
+
+            if abs(offset) <= distance:
+                units[1 - axis] += offset
+                turning = False # Not stuck, not turning anymore.
+            else:
+                units[1 - axis] += distance if offset >= 0 else -distance
+                turning = True  # Not stuck, still turning.
+
+            self._sync_position_from_units()
+            return False, turning
+
+        residual_distance = distance
+        is_stuck = False
+        while residual_distance > 0 and not is_stuck:
+            residual_distance, is_stuck, _, _ = super()._update_position_within_tile_fixed(residual_distance)
+
+        self._sync_position_from_units()
+        return is_stuck, False
+
 
 
     # Defining properties for some private attributes.
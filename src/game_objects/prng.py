@@ -1,5 +1,28 @@
+import functools
+from array import array
+from itertools import accumulate
+
 from src.constants import (PRNG_ROM_MEM,
-                           PRNG_BITS_TO_DIRECTION)
+                           PRNG_ROM_DIRECTION_BITS,
+                           PRNG_BITS_TO_DIRECTION,
+                           PRNG_BITS_TO_CLOCKWISE_DIRECTIONS)
+
+
+# Implemented as described in https://www.youtube.com/watch?v=eFP0_rkjwlY and https://www.reddit.com/r/Pacman/comments/14qu2vy/how_do_i_copy_this_thing_used_in_the_rng/
+# The index following each index of the PRNG is tabulated. The generator goes through every index once before repeating.
+_N_INDICES = len(PRNG_ROM_MEM)
+_NEXT_INDEX = array('H', [((rng_index * 5) + 1) % _N_INDICES for rng_index in range(_N_INDICES)])
+
+
+
+@functools.cache
+def _cycle_tables():
+    # Index of the PRNG after each number of calls since reset, and number of calls since reset of each index (both modulo _N_INDICES).
+    # Built on first use, as only needed to jump within the sequence.
+    index_after_calls = array('H', accumulate(range(_N_INDICES - 1), lambda rng_index, _: _NEXT_INDEX[rng_index], initial = 0))
+    calls_of_index    = array('H', sorted(range(_N_INDICES), key = index_after_calls.__getitem__))
+    return index_after_calls, calls_of_index
+
 
 
 class PRNG:
@@ -12,12 +35,21 @@ class PRNG:
         self.rng_index = 0
 
 
+    def seek(self, n_calls):
+        """Jumps to the state of the PRNG after n_calls calls since reset, without going through them (e.g. to replay from that point)."""
+        self.rng_index = _cycle_tables()[0][n_calls % _N_INDICES]
+
+
     def get_random_direction(self):
-        # Implemented as described in https://www.youtube.com/watch?v=eFP0_rkjwlY and https://www.reddit.com/r/Pacman/comments/14qu2vy/how_do_i_copy_this_thing_used_in_the_rng/
+        self.rng_index = _NEXT_INDEX[self.rng_index]
+        return PRNG_BITS_TO_DIRECTION[PRNG_ROM_DIRECTION_BITS[self.rng_index]]
+
 
-        self.rng_index = ((self.rng_index * 5) + 1) % 8192
+    def get_random_clockwise_directions(self):
+        """Same as get_random_direction, but returns the random direction followed by the 3 others, clockwise from it."""
+        self.rng_index = _NEXT_INDEX[self.rng_index]
+        return PRNG_BITS_TO_CLOCKWISE_DIRECTIONS[PRNG_ROM_DIRECTION_BITS[self.rng_index]]
 
-        mem_byte = PRNG_ROM_MEM[self.rng_index]
-        lsb = int(mem_byte, base = 16) & 0b00000011
 
-        return PRNG_BITS_TO_DIRECTION[lsb]
\ No newline at end of file
+    # Number of calls since reset, modulo the number of calls after which the PRNG repeats.
+    n_calls = property(lambda self: _cycle_tables()[1][self.rng_index])
@@ -21,9 +21,9 @@ class _ScoreValues:
 
     _BYTES_INT_CONVERSION_KWARGS = {'byteorder': 'big', 'signed': False}
 
-    def __init__(self):
+    def __init__(self, persistent):
         self.score = 0
-        self.high_score = self._high_score_load()
+        self.high_score = self._high_score_load() if persistent else 0
 
     def _high_score_load(self):
         high_score = 0
@@ -40,11 +40,12 @@ class _ScoreValues:
 class Score:
     """Class Score. Class dealing with updating of the score."""
 
-    def __init__(self):
-        """Constructor for the class Score."""
-        self._scores = _ScoreValues()
+    def __init__(self, persistent = True):
+        """Constructor for the class Score. If persistent is False, the high-score is neither loaded from nor saved to disk."""
+        self._scores = _ScoreValues(persistent)
         
-        weakref.finalize(self, self._scores._high_score_save)
+        if persistent:
+            weakref.finalize(self, self._scores._high_score_save)
 
         self._ghost_eaten_same_fright = None
         
@@ -85,5 +86,14 @@ class Score:
         return increment
 
 
+    def snapshot(self):
+        """Returns the state of the score as a tuple of immutable values."""
+        return (self._scores.score, self._scores.high_score, self._ghost_eaten_same_fright)
+
+    def restore(self, state):
+        """Restores the state of the score from a tuple returned by Score.snapshot."""
+        self._scores.score, self._scores.high_score, self._ghost_eaten_same_fright = state
+
+
     def notify_fright_on(self):
         self._ghost_eaten_same_fright = 0
\ No newline at end of file
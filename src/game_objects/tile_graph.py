@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+from src.directions import Vector2
+from src.constants import (MazeTiles,
+                           MAZE_START_TILES,
+                           MAZE_TILES_COLS,
+                           MAZE_TILES_ROWS,
+                           WARP_TUNNEL_ROW,
+                           WARP_TUNNEL_COL_LEFT,
+                           WARP_TUNNEL_COL_RIGHT,
+                           GHOSTS_FORBIDDEN_TURNING_UP_TILES)
+
+
+# Static table describing, for every tile, the directions a ghost can take when it reaches the tile center.
+# It is computed once at import, so that ghost decisions only consist of integer lookups and distance comparisons.
+
+# Tiles are identified by an integer key. The grid is padded on all sides so that characters in the warp tunnel,
+# which can be up to WARP_TUNNEL_TELEPORT_MARGIN tiles outside the maze, and the two tiles ahead of them are all part of it.
+_PAD_ROWS = 2
+_PAD_COLS = 5
+_GRID_ROWS = MAZE_TILES_ROWS + 2 * _PAD_ROWS
+_GRID_COLS = MAZE_TILES_COLS + 2 * _PAD_COLS
+
+# Directions, ordered by preference of ghosts in case of equal distances: up, left, down, right. Zero is used for the current tile.
+_DIRECTIONS = (Vector2.UP, Vector2.LEFT, Vector2.DOWN, Vector2.RIGHT, Vector2.ZERO)
+_DIRECTION_INDEX = {direction: idx for idx, direction in enumerate(_DIRECTIONS)}
+_N_DIRECTIONS = len(_DIRECTIONS)
+_DIRECTION_KEY_OFFSET = tuple(direction.y * _GRID_COLS + direction.x for direction in _DIRECTIONS)
+
+
+def _tile_key(row, col):
+    return (row + _PAD_ROWS) * _GRID_COLS + col + _PAD_COLS
+
+
+def _tile_is_walkable(row, col):
+    # Same as not Maze.tile_is_not_walkable: walls and door can't be walked through, and outside the maze only the warp tunnel can.
+    if row < 0 or row >= MAZE_TILES_ROWS or col < 0 or col >= MAZE_TILES_COLS:
+        return row == WARP_TUNNEL_ROW
+
+    return MAZE_START_TILES[row * MAZE_TILES_COLS + col] not in (MazeTiles.WALL, MazeTiles.DOOR)
+
+
+def _build_tables():
+    forbidden_up_keys = {_tile_key(int(tile.y), int(tile.x)) for tile in GHOSTS_FORBIDDEN_TURNING_UP_TILES}
+
+    # For each tile key and incoming direction: tuple of (direction, x, y) with the center of the tile reached by taking each legal direction.
+    exits         = [()] * (_GRID_ROWS * _GRID_COLS * _N_DIRECTIONS)
+    exits_no_up   = [()] * (_GRID_ROWS * _GRID_COLS * _N_DIRECTIONS)
+    warp_tunnel   = [False] * (_GRID_ROWS * _GRID_COLS)
+
+    for row in range(-_PAD_ROWS, MAZE_TILES_ROWS + _PAD_ROWS):
+        for col in range(-_PAD_COLS, MAZE_TILES_COLS + _PAD_COLS):
+            key = _tile_key(row, col)
+            warp_tunnel[key] = (row == WARP_TUNNEL_ROW) and (col <= WARP_TUNNEL_COL_LEFT or col >= WARP_TUNNEL_COL_RIGHT)
+
+            for incoming_idx, incoming in enumerate(_DIRECTIONS):
+                legal = []
+                for direction in _DIRECTIONS[:-1]:
+                    # Ghosts are not allowed to willingly flip direction.
+                    if direction == -incoming:
+                        continue
+
+                    next_row = row + direction.y
+                    next_col = col + direction.x
+
+                    # Ghosts can't go in a wall.
+                    if not _tile_is_walkable(next_row, next_col):
+                        continue
+
+                    legal.append((direction, next_col + 0.5, next_row + 0.5))
+
+                exits[key * _N_DIRECTIONS + incoming_idx] = tuple(legal)
+
+                # Ghosts are not allowed to turn upwards on certain tiles when in chase or scatter mode.
+                if key in forbidden_up_keys:
+                    legal = [legal_exit for legal_exit in legal if legal_exit[0] != Vector2.UP]
+                exits_no_up[key * _N_DIRECTIONS + incoming_idx] = tuple(legal)
+
+    return tuple(exits), tuple(exits_no_up), tuple(warp_tunnel)
+
+_EXITS, _EXITS_NO_UP_ON_FORBIDDEN_TILES, _WARP_TUNNEL = _build_tables()
+
+
+def _build_walls_tables():
+    # For every tile key: whether the tile is not walkable, same as Maze.tile_is_not_walkable, with and without the door being a wall.
+    not_walkable      = [False] * (_GRID_ROWS * _GRID_COLS)
+    not_walkable_door = [False] * (_GRID_ROWS * _GRID_COLS)
+
+    for row in range(-_PAD_ROWS, MAZE_TILES_ROWS + _PAD_ROWS):
+        for col in range(-_PAD_COLS, MAZE_TILES_COLS + _PAD_COLS):
+            key = _tile_key(row, col)
+            if row < 0 or row >= MAZE_TILES_ROWS or col < 0 or col >= MAZE_TILES_COLS:
+                not_walkable[key] = not_walkable_door[key] = row != WARP_TUNNEL_ROW
+            else:
+                tile = MAZE_START_TILES[row * MAZE_TILES_COLS + col]
+                not_walkable[key]      = tile == MazeTiles.WALL
+                not_walkable_door[key] = tile in (MazeTiles.WALL, MazeTiles.DOOR)
+
+    return tuple(not_walkable_door), tuple(not_walkable)
+
+_NOT_WALKABLE, _NOT_WALKABLE_EXCEPT_DOOR = _build_walls_tables()
+
+
+def ghost_exits(position, direction_from_current_tile, can_turn_up_anywhere):
+    """Returns the directions a ghost at position can take at the center of the next tile along direction_from_current_tile
+    (or of the current tile if Vector2.ZERO), ordered by preference. Each direction is returned as a tuple (direction, x, y)
+    where x and y are the coordinates of the center of the tile the direction leads to."""
+    incoming_idx = _DIRECTION_INDEX[direction_from_current_tile]
+    key = _tile_key(int(position.y), int(position.x)) + _DIRECTION_KEY_OFFSET[incoming_idx]
+
+    if can_turn_up_anywhere:
+        return _EXITS[key * _N_DIRECTIONS + incoming_idx]
+
+    return _EXITS_NO_UP_ON_FORBIDDEN_TILES[key * _N_DIRECTIONS + incoming_idx]
+
+
+def tile_is_warp_tunnel(position):
+    """Returns True if position is in the warp tunnel. Same as Maze.tile_is_warp_tunnel, restricted to positions a ghost can reach."""
+    return _WARP_TUNNEL[_tile_key(int(position.y), int(position.x))]
+
+
+def tile_is_warp_tunnel_at(row, col):
+    """Same as tile_graph.tile_is_warp_tunnel, for the tile at row and col."""
+    return _WARP_TUNNEL[_tile_key(row, col)]
+
+
+def tile_is_not_walkable_at(row, col, collide_with_door = True):
+    """Returns True if the tile at row and col is not walkable. Same as Maze.tile_is_not_walkable, restricted to tiles a character
+    can reach, which is enough as walls and door never change."""
+    return (_NOT_WALKABLE if collide_with_door else _NOT_WALKABLE_EXCEPT_DOOR)[_tile_key(row, col)]
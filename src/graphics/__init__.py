@@ -4,9 +4,13 @@
 from src.constants import (DynamicUIElements,
                            UpdatableUIElements,
                            LAYOUT_RECORDINS_COORDS,
-                           Z_COORD_RECORDING)
-from src.graphics import utils
+                           Z_COORD_RECORDING,
+                           RECORDING_CACHE_BUDGET_BYTES)
 from src.graphics.painter import Painter
+from src.graphics.recording_stream import RecordingStream
+from src.graphics.recording_cache import (RecordingCache,
+                                          DecodedRecording,
+                                          CachedRecording)
 from src.graphics.sprites.ghost_sprite import GhostSprite
 from src.graphics.sprites.maze_sprite import MazeSprite
 from src.graphics.sprites.pacman_sprite import PacManSprite
@@ -17,19 +21,17 @@ from src.graphics.sprites.ui_sprite import UiSprite
 
 class Graphics:
     
-    def __init__(self):
+    def __init__(self, painter = None):
 
-        # Enable transparency for sprites.
-        utils.enable_transparency_blit()
-
-        # Enable depth testing to draw stuff on top of each other.
-        utils.enable_depth_testing()
-
-        # Variable holding the recording currently being displayed on screen.
+        # Variable holding the recording currently being displayed on screen, and the arguments it was loaded with.
         self._active_recording = None
+        self._active_recording_details = None
 
-        # Instanciate object to render using shaders.
-        self._painter = Painter()
+        # Recordings kept decoded across activities.
+        self._recording_cache = RecordingCache(RECORDING_CACHE_BUDGET_BYTES)
+
+        # Instanciate object to render using shaders, unless another painter is provided (e.g. a SoftwarePainter, rendering without OpenGL).
+        self._painter = painter if painter is not None else Painter()
 
         # Load sprite coordinators.
         self._pacman_sprite = PacManSprite(self._painter)
@@ -62,7 +64,8 @@ class Graphics:
                 sprite.update()
 
 
-    def draw_game(self, maze, pacman, ghosts, score, lives, level, ui_elements):
+    def draw_game(self, maze, pacman, ghosts, score, lives, level, ui_elements, pacman_position = None, ghosts_positions = None):
+        # Pac-Man and ghosts are drawn at pacman_position and ghosts_positions if given, instead of their current positions.
 
         self._maze_sprite.send_vertex_data(maze)
         self._ui_sprite  .send_vertex_data(DynamicUIElements.READY_TEXT          in ui_elements,
@@ -76,13 +79,13 @@ class Graphics:
                                            level)
 
         if DynamicUIElements.GHOSTS in ui_elements:
-            self._ghost_sprite .send_vertex_data(ghosts)
+            self._ghost_sprite .send_vertex_data(ghosts, ghosts_positions)
 
         if DynamicUIElements.ACTION_SCORES in ui_elements:
             self._score_sprite .send_vertex_data()
             
         if DynamicUIElements.PACMAN in ui_elements:
-            self._pacman_sprite.send_vertex_data(pacman)
+            self._pacman_sprite.send_vertex_data(pacman, pacman_position)
 
         self._painter.draw()
 
@@ -116,10 +119,18 @@ class Graphics:
 
 
     def recording_load(self, path, width, height):
-        self._active_recording = utils.load_recording(path, width, height)
+        decoded = self._recording_cache.get(path)
+        if decoded is not None:
+            self._active_recording = CachedRecording(decoded)
+        else:
+            self._active_recording = RecordingStream(path, width, height, max_kept_bytes = self._recording_cache.budget_bytes)
+        self._active_recording_details = (path, width, height)
 
         return len(self._active_recording)
 
+    def recording_prefetch(self, path, width, height):
+        self._recording_cache.prefetch(path, width, height)
+
     def recording_draw(self, idx, level_to_draw_fruits = None):
         frame = self._active_recording[idx]
 
@@ -133,5 +144,14 @@ class Graphics:
             self._painter.draw()
 
     def recording_free(self):
+        # Recordings streamed to their end are cached with the frames decoded while streaming them, to be played from memory the next times.
+        # Recordings left before their end are not decoded again here, as this would compete with the activity that follows (e.g. a game).
+        decoded = self._active_recording.decoded_frames() if isinstance(self._active_recording, RecordingStream) else None
+        if decoded is not None:
+            path, width, height = self._active_recording_details
+            self._recording_cache.add(path, DecodedRecording(width, height, *decoded))
+
+        self._active_recording.close()
         self._active_recording = None
+        self._active_recording_details = None
         self._painter.set_texture()
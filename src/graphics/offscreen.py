@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+import ctypes
+from collections import deque
+
+import numpy as np
+import pyglet
+from pyglet.image.buffer import (Framebuffer,
+                                 Renderbuffer)
+from pyglet.graphics.vertexbuffer import BufferObject
+
+from src.constants import (BACKGROUND_COLOR,
+                           LAYOUT_N_ROWS_TILES,
+                           LAYOUT_N_COLS_TILES,
+                           LAYOUT_PX_PER_UNIT_LENGHT)
+
+
+# Number of pixel buffers frames are read back into. With two, reading back a frame overlaps with drawing the next one.
+_N_PIXEL_BUFFERS = 2
+
+
+
+class OffscreenRenderer:
+    """Class OffscreenRenderer. Draws frames into an offscreen framebuffer instead of a window, and reads them back as
+    contiguous NumPy arrays of shape (height, width, 3), with BGR channels and rows from top to bottom as expected by OpenCV.
+    A hidden window is only created to hold the OpenGL context: when pyglet.options['headless'] is set before pyglet.window
+    is first imported, pyglet creates it through EGL and no display is needed at all.
+    Graphics instances drawing the frames must be created after the OffscreenRenderer, so that they use its context."""
+
+    def __init__(self, width = LAYOUT_N_COLS_TILES * LAYOUT_PX_PER_UNIT_LENGHT, height = LAYOUT_N_ROWS_TILES * LAYOUT_PX_PER_UNIT_LENGHT,
+                 background_color = BACKGROUND_COLOR):
+        """Constructor for the class OffscreenRenderer. Frames are width x height pixels, with the game drawn at its original resolution by default."""
+        self._width  = width
+        self._height = height
+        self._background_color = background_color
+        self._frame_size = width * height * 3
+
+        self._window = pyglet.window.Window(width = width, height = height, visible = False)
+        self._window.switch_to()
+
+        self._framebuffer  = Framebuffer()
+        self._color_buffer = Renderbuffer(width, height, pyglet.gl.GL_RGBA8)
+        self._depth_buffer = Renderbuffer(width, height, pyglet.gl.GL_DEPTH_COMPONENT24)
+        self._framebuffer.attach_renderbuffer(self._color_buffer, attachment = pyglet.gl.GL_COLOR_ATTACHMENT0)
+        self._framebuffer.attach_renderbuffer(self._depth_buffer, attachment = pyglet.gl.GL_DEPTH_ATTACHMENT)
+
+        # OpenGL stores rows from bottom to top: frames are flipped on the GPU into this framebuffer before being read back.
+        self._flipped_framebuffer  = Framebuffer()
+        self._flipped_color_buffer = Renderbuffer(width, height, pyglet.gl.GL_RGBA8)
+        self._flipped_framebuffer.attach_renderbuffer(self._flipped_color_buffer, attachment = pyglet.gl.GL_COLOR_ATTACHMENT0)
+
+        self._pixel_buffers = [BufferObject(self._frame_size, pyglet.gl.GL_STREAM_READ) for _ in range(_N_PIXEL_BUFFERS)]
+        self._next_pixel_buffer = 0
+        self._pending_pixel_buffers = deque()   # Pixel buffers with a readback in progress, oldest first.
+
+
+    def render(self, draw):
+        """Calls draw, which must draw a frame using OpenGL, and returns the frame drawn."""
+        return next(self.render_frames([draw]))
+
+
+    def render_frames(self, draws):
+        """Generator calling each draw of the iterable draws in turn, and yielding the frames drawn in the same order.
+        Each frame is only read back once the next one has been drawn, so that the GPU never waits for the readback.
+        draws can be a generator updating the game before yielding each draw."""
+        try:
+            for draw in draws:
+                self._draw_frame(draw)
+
+                if len(self._pending_pixel_buffers) == _N_PIXEL_BUFFERS:
+                    yield self._read_frame()
+
+            while self._pending_pixel_buffers:
+                yield self._read_frame()
+
+        finally:
+            # Frames not read back when the generator is closed early are dropped.
+            self._pending_pixel_buffers.clear()
+
+
+    def _draw_frame(self, draw):
+        self._window.switch_to()
+        self._framebuffer.bind()
+
+        pyglet.gl.glViewport(0, 0, self._width, self._height)
+        pyglet.gl.glClearColor(*self._background_color, 1)
+        pyglet.gl.glClear(pyglet.gl.GL_COLOR_BUFFER_BIT | pyglet.gl.GL_DEPTH_BUFFER_BIT)
+
+        draw()
+
+        pyglet.gl.glBindFramebuffer(pyglet.gl.GL_READ_FRAMEBUFFER, self._framebuffer.id)
+        pyglet.gl.glBindFramebuffer(pyglet.gl.GL_DRAW_FRAMEBUFFER, self._flipped_framebuffer.id)
+        pyglet.gl.glBlitFramebuffer(0, 0, self._width, self._height, 0, self._height, self._width, 0,
+                                    pyglet.gl.GL_COLOR_BUFFER_BIT, pyglet.gl.GL_NEAREST)
+
+        # Start an asynchronous readback into the next pixel buffer. OpenGL can directly provide BGR channels.
+        pixel_buffer = self._pixel_buffers[self._next_pixel_buffer]
+        self._next_pixel_buffer = (self._next_pixel_buffer + 1) % _N_PIXEL_BUFFERS
+
+        pyglet.gl.glBindFramebuffer(pyglet.gl.GL_READ_FRAMEBUFFER, self._flipped_framebuffer.id)
+        pixel_buffer.bind(pyglet.gl.GL_PIXEL_PACK_BUFFER)
+        pyglet.gl.glPixelStorei(pyglet.gl.GL_PACK_ALIGNMENT, 1)
+        pyglet.gl.glReadPixels(0, 0, self._width, self._height, pyglet.gl.GL_BGR, pyglet.gl.GL_UNSIGNED_BYTE, 0)
+        pyglet.gl.glBindBuffer(pyglet.gl.GL_PIXEL_PACK_BUFFER, 0)
+
+        pyglet.gl.glBindFramebuffer(pyglet.gl.GL_FRAMEBUFFER, 0)
+        self._pending_pixel_buffers.append(pixel_buffer)
+
+
+    def _read_frame(self):
+        pixel_buffer = self._pending_pixel_buffers.popleft()
+        self._window.switch_to()
+
+        # The only copy made, from the memory of the pixel buffer into the returned array.
+        frame = np.empty((self._height, self._width, 3), dtype = np.uint8)
+
+        pixel_buffer.bind(pyglet.gl.GL_PIXEL_PACK_BUFFER)
+        pointer = pyglet.gl.glMapBufferRange(pyglet.gl.GL_PIXEL_PACK_BUFFER, 0, self._frame_size, pyglet.gl.GL_MAP_READ_BIT)
+        ctypes.memmove(frame.ctypes.data, pointer, self._frame_size)
+        pyglet.gl.glUnmapBuffer(pyglet.gl.GL_PIXEL_PACK_BUFFER)
+        pyglet.gl.glBindBuffer(pyglet.gl.GL_PIXEL_PACK_BUFFER, 0)
+
+        return frame
+
+
+    # Defining properties for some private attributes.
+    width  = property(lambda self: self._width)
+    height = property(lambda self: self._height)
@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 
-import array
+import ctypes
+import struct
 
 import pyglet
+from pyglet.graphics.vertexarray import VertexArray
+from pyglet.graphics.vertexbuffer import BufferObject
 
-
+from src import asset_pack
 from src.graphics import utils
 from src.constants import (GRAPHICS_ATLAS_PATH, 
                            SHADERS_VERT_PATH,
@@ -17,14 +20,131 @@ from src.constants import (GRAPHICS_ATLAS_PATH,
                            LAYOUT_PX_PER_UNIT_LENGHT)
 
 
+# Attributes of each quad, in the order in which they are interleaved in the vertex buffer. Each quad is drawn from a single point.
+_QUAD_ATTRIBUTES = ('x_pos_center', 'y_pos_center', 'x_tex_left_px', 'y_tex_bottom_px', 'width_px', 'height_px', 'z_coord')
+_QUAD = struct.Struct(f'<{len(_QUAD_ATTRIBUTES)}f')
+
+
+
+
+
+
+class _QuadBuffer:
+    """Class _QuadBuffer. Interleaved vertex data of up to n_quads quads, kept in a buffer in system memory allocated once,
+    and in a vertex buffer on the GPU to which ranges of quads are uploaded."""
+
+    def __init__(self, shader_program, n_quads):
+        self._n_quads = n_quads
+
+        self._data = bytearray(n_quads * _QUAD.size)
+        self._data_pointer = (ctypes.c_byte * len(self._data)).from_buffer(self._data)
+
+        self._vertex_array  = VertexArray()
+        self._vertex_buffer = BufferObject(len(self._data), pyglet.gl.GL_STREAM_DRAW)
+
+        self._vertex_array.bind()
+        self._vertex_buffer.bind()
+        for offset, name in enumerate(_QUAD_ATTRIBUTES):
+            location = shader_program.attributes[name]['location']
+            pyglet.gl.glEnableVertexAttribArray(location)
+            pyglet.gl.glVertexAttribPointer(location, 1, pyglet.gl.GL_FLOAT, False, _QUAD.size, offset * ctypes.sizeof(ctypes.c_float))
+        self._vertex_array.unbind()
+
+
+    def set_quad(self, idx, *quad):
+        if not 0 <= idx < self._n_quads:
+            raise IndexError('Quad index out of range of the buffer')
+
+        _QUAD.pack_into(self._data, idx * _QUAD.size, *quad)
+
+
+    def set_quads(self, idx, packed_quads):
+        # Copies quads packed by Painter.pack_quads to the slots starting at idx, as a single block.
+        if idx < 0 or idx * _QUAD.size + len(packed_quads) > len(self._data):
+            raise IndexError('Quad indices out of range of the buffer')
+
+        self._data[idx * _QUAD.size:idx * _QUAD.size + len(packed_quads)] = packed_quads
+
+
+    def upload(self, start, stop, orphan = False):
+        # Orphaning the buffer first avoids waiting for previous draws using it to complete, but discards all quads not uploaded.
+        self._vertex_buffer.bind()
+        if orphan:
+            self._vertex_buffer.invalidate()
+
+        pointer = ctypes.byref(self._data_pointer, start * _QUAD.size)
+        self._vertex_buffer.set_data_region(pointer, start * _QUAD.size, (stop - start) * _QUAD.size)
+
+
+    def draw(self, n_quads):
+        self._vertex_array.bind()
+        pyglet.gl.glDrawArrays(pyglet.gl.GL_POINTS, 0, n_quads)
+        self._vertex_array.unbind()
+
+
+    n_quads = property(lambda self: self._n_quads)
+
+
 
 
+class PainterLayer:
+    """Class PainterLayer. Set of quads kept on the GPU across frames, for parts of the screen which rarely change.
+    Each quad has a fixed slot, and only the slots changed since the last draw are uploaded again.
+    Layers are created with Painter.create_layer, and drawn when passed to Painter.add_layer before Painter.draw."""
+
+    def __init__(self, quad_buffer):
+        self._quad_buffer = quad_buffer
+
+        # Range of slots changed since the last upload.
+        self._changed_start = None
+        self._changed_stop  = None
+
+        # Slots are all hidden at the start.
+        for idx in range(quad_buffer.n_quads):
+            self.hide_quad(idx)
+
+
+    def set_quad(self, idx, x_pos_center, y_pos_center, x_tex_left_px, y_tex_bottom_px, width_px, height_px, z_coord):
+        self._quad_buffer.set_quad(idx, x_pos_center, y_pos_center, x_tex_left_px, y_tex_bottom_px, width_px, height_px, z_coord)
+        self._mark_changed(idx)
+
+
+    def hide_quad(self, idx):
+        # A quad of null size covers no pixel.
+        self._quad_buffer.set_quad(idx, 0, 0, 0, 0, 0, 0, 0)
+        self._mark_changed(idx)
+
+
+    def _mark_changed(self, idx):
+        if self._changed_start is None:
+            self._changed_start, self._changed_stop = idx, idx + 1
+        else:
+            self._changed_start = min(self._changed_start, idx)
+            self._changed_stop  = max(self._changed_stop , idx + 1)
+
+
+    def _draw(self):
+        if self._changed_start is not None:
+            self._quad_buffer.upload(self._changed_start, self._changed_stop)
+            self._changed_start = self._changed_stop = None
+
+        self._quad_buffer.draw(self._quad_buffer.n_quads)
+
+
+    n_quads = property(lambda self: self._quad_buffer.n_quads)
+
 
 
 
 class Painter:
 
     def __init__(self):
+        # Enable transparency for sprites.
+        utils.enable_transparency_blit()
+
+        # Enable depth testing to draw stuff on top of each other.
+        utils.enable_depth_testing()
+
         self._default_atlas = utils.load_image(GRAPHICS_ATLAS_PATH)
 
         self._texture = None
@@ -32,12 +152,12 @@ class Painter:
         self._texture_height_px = None
 
         self._shader_program = None
-        self._vertex_list = None
-        self._attributes_tmp_buffer = None
-        self._attributes_tmp_buffer_idx = None
+        self._quad_buffer = None
+        self._n_quads = 0
+        self._layers = []   # (layer, texture offset) of the layers to draw with the next draw.
 
         self._create_shader()
-        self._allocate_vertex_list()
+        self._quad_buffer = _QuadBuffer(self._shader_program, SHADERS_MAX_QUADS)
         self.set_texture()
         
 
@@ -47,8 +167,8 @@ class Painter:
                                   (SHADERS_GEOM_PATH, 'geometry'),
                                   (SHADERS_FRAG_PATH, 'fragment')]:
 
-            with open(path, 'r') as file:
-                source = file.read()
+            with asset_pack.open_binary(path) as file:
+                source = file.read().decode()
 
             shader = pyglet.graphics.shader.Shader(source, shader_type)
             shaders.append(shader)
@@ -87,34 +207,42 @@ class Painter:
         self._shader_program['height_whole_tex_px'] = self._texture_height_px
         self._shader_program['tex_padding']         = SHADERS_TEX_PADDING
         self._shader_program['projection']          = self._get_projection_matrix()
+        self._shader_program['tex_offset_px']       = (0, 0)
 
         self._shader_program.stop()
 
 
-    def _allocate_vertex_list(self):
-        self._vertex_list = self._shader_program.vertex_list(SHADERS_MAX_QUADS, pyglet.gl.GL_POINTS)
-        self._reset_attributes_tmp_buffer()
+    def create_layer(self, n_quads):
+        """Returns a new PainterLayer of n_quads quads, all hidden."""
+        return PainterLayer(_QuadBuffer(self._shader_program, n_quads))
 
 
-    def _reset_attributes_tmp_buffer(self):
-        nan_list = [+float('inf')] * SHADERS_MAX_QUADS
+    def add_quad(self, x_pos_center, y_pos_center, x_tex_left_px, y_tex_bottom_px, width_px, height_px, z_coord):
+        if self._n_quads == SHADERS_MAX_QUADS:
+            raise IndexError('Too many quads added to Painter before drawing them')
 
-        # Initialize local buffers to allow providing entire buffers to Pyglet's ShaderProgram.
-        self._attributes_tmp_buffer = {name: array.array('f', nan_list) for name in self._shader_program.attributes.keys()}
-        self._attributes_tmp_buffer_idx = 0
+        self._quad_buffer.set_quad(self._n_quads, x_pos_center, y_pos_center, x_tex_left_px, y_tex_bottom_px, width_px, height_px, z_coord)
+        self._n_quads += 1
 
 
-    def add_quad(self, x_pos_center, y_pos_center, x_tex_left_px, y_tex_bottom_px, width_px, height_px, z_coord):
-        idx = self._attributes_tmp_buffer_idx
-        self._attributes_tmp_buffer_idx += 1
+    def pack_quads(self, quads):
+        """Returns quads, an iterable of tuples of the arguments of add_quad, packed as vertex data to be added all at once
+        with add_quads. Quads drawn every frame the same way (e.g. texts) can be packed once and added again each frame."""
+        return b''.join(_QUAD.pack(*quad) for quad in quads)
+
 
-        self._attributes_tmp_buffer['x_pos_center']   [idx] = x_pos_center
-        self._attributes_tmp_buffer['y_pos_center']   [idx] = y_pos_center
-        self._attributes_tmp_buffer['x_tex_left_px']  [idx] = x_tex_left_px
-        self._attributes_tmp_buffer['y_tex_bottom_px'][idx] = y_tex_bottom_px
-        self._attributes_tmp_buffer['width_px']       [idx] = width_px
-        self._attributes_tmp_buffer['height_px']      [idx] = height_px
-        self._attributes_tmp_buffer['z_coord']        [idx] = z_coord
+    def add_quads(self, packed_quads):
+        n_quads = len(packed_quads) // _QUAD.size
+        if self._n_quads + n_quads > SHADERS_MAX_QUADS:
+            raise IndexError('Too many quads added to Painter before drawing them')
+
+        self._quad_buffer.set_quads(self._n_quads, packed_quads)
+        self._n_quads += n_quads
+
+
+    def add_layer(self, layer, tex_offset_px = (0, 0)):
+        # The texture coordinates of all quads of the layer are shifted by tex_offset_px, to switch all of them to another region of the texture at once.
+        self._layers.append((layer, tex_offset_px))
 
 
     def draw(self):
@@ -122,15 +250,28 @@ class Painter:
         # Fortunately, by using only fully transparent or fully opaque pixels, this can be avoided and dealth with in fragment shader.
         
 
-        # Push buffers into ShaderProgram and reset them.
-        for name, data in self._attributes_tmp_buffer.items():
-            getattr(self._vertex_list, name)[:] = data
-        self._reset_attributes_tmp_buffer()
+        n_quads = self._n_quads
+        self._n_quads = 0
+        layers = self._layers
+        self._layers = []
+        if not n_quads and not layers:
+            return
+
+        # Upload only the quads added since the last draw.
+        if n_quads:
+            self._quad_buffer.upload(0, n_quads, orphan = True)
 
         # Draw.
         self._shader_program.use()
 
         self._texture.bind()
-        self._vertex_list.draw(pyglet.gl.GL_POINTS)
+        if n_quads:
+            self._quad_buffer.draw(n_quads)
+
+        for layer, tex_offset_px in layers:
+            self._shader_program['tex_offset_px'] = tex_offset_px
+            layer._draw()
+        if layers:
+            self._shader_program['tex_offset_px'] = (0, 0)
 
-        self._shader_program.stop()
\ No newline at end of file
+        self._shader_program.stop()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from collections import OrderedDict
+
+import pyglet
+
+from src.graphics import utils
+from src.graphics.recording_stream import decode_recording
+
+
+
+class DecodedRecording:
+    """Class DecodedRecording. All frames of a recording decoded, as kept by a RecordingCache. Identical frames share the same
+    bytes object, so that the memory used only counts distinct frames. Frames are stored from the top of the image to its bottom."""
+
+    def __init__(self, frame_width_px, frame_height_px, pixels_format, frames):
+        """Constructor for the class DecodedRecording."""
+        self._frame_width_px  = frame_width_px
+        self._frame_height_px = frame_height_px
+        self._format = pixels_format
+        self._frames = frames
+        self._n_bytes = sum(len(frame) for frame in {id(frame): frame for frame in frames}.values())
+
+
+    # Defining properties for some private attributes.
+    frame_width_px  = property(lambda self: self._frame_width_px)
+    frame_height_px = property(lambda self: self._frame_height_px)
+    format          = property(lambda self: self._format)
+    frames          = property(lambda self: self._frames)
+    n_bytes         = property(lambda self: self._n_bytes)
+
+
+
+
+class CachedRecording:
+    """Class CachedRecording. Plays a DecodedRecording, with the same interface as RecordingStream. Frames are uploaded into
+    a single texture when displayed, unless it already holds the same pixels (as often in recordings, where frames repeat)."""
+
+    def __init__(self, decoded):
+        """Constructor for the class CachedRecording."""
+        self._decoded = decoded
+
+        self._texture = pyglet.image.Texture.create(decoded.frame_width_px, decoded.frame_height_px)
+        utils.set_texture_interp_mode(self._texture)
+        self._uploaded_frame = None
+
+
+    def close(self):
+        """Nothing to release: the frames belong to the cache, and the texture is released once the instance is deleted."""
+        self._uploaded_frame = None
+
+
+    def __len__(self):
+        return len(self._decoded.frames)
+
+
+    def __getitem__(self, idx):
+        """Returns a texture holding frame idx. It remains valid until another frame is requested."""
+        n_frames = len(self._decoded.frames)
+        if idx < 0:
+            idx += n_frames
+        if not 0 <= idx < n_frames:
+            raise IndexError('Recording frame index out of range')
+
+        # As in an ImageGrid, frames are indexed from the bottom of the image.
+        data = self._decoded.frames[n_frames - 1 - idx]
+        if data is not self._uploaded_frame:
+            frame = pyglet.image.ImageData(self._texture.width, self._texture.height, self._decoded.format, data)
+            self._texture.blit_into(frame, 0, 0, 0)
+            self._uploaded_frame = data
+
+        return self._texture
+
+
+
+
+class RecordingCache:
+    """Class RecordingCache. Keeps recordings decoded in memory across activities, so that playing them again (e.g. the intro,
+    each time the menu is shown) neither decompresses nor decodes them again. Recordings are decoded in background threads,
+    when prefetched ahead of being played, or are added once streamed to their end, with the frames decoded while streaming them. The total size of the recordings
+    kept is bounded by budget_bytes, the least recently played being dropped first."""
+
+    def __init__(self, budget_bytes):
+        """Constructor for the class RecordingCache."""
+        self._budget_bytes = budget_bytes
+
+        self._recordings = OrderedDict()   # DecodedRecording of each path, from the least to the most recently used.
+        self._n_bytes = 0
+        self._decoding = set()             # Paths being decoded in background.
+        self._lock = threading.Lock()
+
+
+    def get(self, path):
+        """Returns the DecodedRecording of the recording at path, or None if not cached (yet)."""
+        with self._lock:
+            decoded = self._recordings.get(path)
+            if decoded is not None:
+                self._recordings.move_to_end(path)
+            return decoded
+
+
+    def prefetch(self, path, frame_width_px, frame_height_px):
+        """Starts decoding the recording at path in a background thread, to cache it, unless already cached or being decoded."""
+        if self._budget_bytes <= 0:
+            return
+
+        with self._lock:
+            if path in self._recordings or path in self._decoding:
+                return
+            self._decoding.add(path)
+
+        threading.Thread(target = self._decode, args = (path, frame_width_px, frame_height_px), daemon = True).start()
+
+
+    def add(self, path, decoded):
+        """Caches decoded, the DecodedRecording of the recording at path (e.g. decoded while streamed), unless already cached."""
+        if decoded.n_bytes > self._budget_bytes:
+            return
+
+        with self._lock:
+            if path not in self._recordings:
+                self._insert(path, decoded)
+
+
+    def _decode(self, path, frame_width_px, frame_height_px):
+        try:
+            decoded = DecodedRecording(frame_width_px, frame_height_px, *decode_recording(path, frame_width_px, frame_height_px))
+        except Exception:
+            # The recording is then streamed each time it is played, which reports the error.
+            decoded = None
+
+        with self._lock:
+            self._decoding.discard(path)
+
+        if decoded is not None:
+            self.add(path, decoded)
+
+
+    def _insert(self, path, decoded):
+        self._recordings[path] = decoded
+        self._n_bytes += decoded.n_bytes
+
+        while self._n_bytes > self._budget_bytes:
+            _, evicted = self._recordings.popitem(last = False)
+            self._n_bytes -= evicted.n_bytes
+
+
+    # Defining properties for some private attributes.
+    # n_bytes is the total size of the recordings currently cached.
+    budget_bytes = property(lambda self: self._budget_bytes)
+    n_bytes      = property(lambda self: self._n_bytes)
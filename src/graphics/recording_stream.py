@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+import lzma
+import queue
+import threading
+
+import pyglet
+from pyglet.extlibs import png
+
+from src import asset_pack
+from src.graphics import utils
+from src.constants import (RECORDING_STREAM_N_DECODED,
+                           RECORDING_STREAM_N_TEXTURES)
+
+
+# Format of the pixels of decoded images, for each combination of (greyscale, alpha) of the PNG image.
+_PNG_FORMATS = {(False, False): 'RGB',
+                (False, True) : 'RGBA',
+                (True , False): 'L',
+                (True , True) : 'LA'}
+
+# Seconds the decoding thread waits at most before checking if it must stop, when enough frames are decoded ahead.
+_STOP_CHECK_INTERVAL = 0.1
+
+
+
+def _open_image(path):
+    # Returns the file of the image, its decompressed stream, and a PNG reader over it, once the header is read.
+    file = asset_pack.open_binary(path)
+    xz_file = lzma.open(file, 'r')
+    reader = png.Reader(file = xz_file)
+    reader.preamble()
+    return file, xz_file, reader
+
+
+def _check_image(reader, frame_width_px):
+    if reader.width != frame_width_px or reader.bitdepth != 8:
+        raise ValueError('Recordings must be 8 bits images with a single column of frames')
+
+
+def _iter_frames(reader, frame_height_px):
+    # Yields the pixels of each frame, from the top of the image to its bottom.
+    _, _, rows, _ = reader.read()
+
+    frame_rows = []
+    for row in rows:
+        frame_rows.append(row)
+        if len(frame_rows) < frame_height_px:
+            continue
+
+        # Rows are stored from top to bottom in PNG images, and from bottom to top in textures.
+        frame_rows.reverse()
+        yield b''.join(frame_rows)
+        frame_rows = []
+
+
+def _decode_frames(reader, frame_height_px, decoded_frames, stop):
+    # Body of the decoding thread: puts in decoded_frames the pixels of each frame, from the top of the image to its bottom,
+    # or the exception raised while decoding it. Blocks while decoded_frames is full.
+    def put(item):
+        while not stop.is_set():
+            try:
+                decoded_frames.put(item, timeout = _STOP_CHECK_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        for frame in _iter_frames(reader, frame_height_px):
+            if not put(frame):
+                return
+
+    except Exception as exception:
+        put(exception)
+
+
+def decode_recording(path, frame_width_px, frame_height_px):
+    """Decodes all frames of the recording at path at once. Returns the format of their pixels, and the list of their pixels
+    from the top of the image to its bottom, in which identical frames are the same bytes object."""
+    file, xz_file, reader = _open_image(path)
+    with file, xz_file:
+        _check_image(reader, frame_width_px)
+
+        unique_frames = {}
+        frames = [unique_frames.setdefault(frame, frame) for frame in _iter_frames(reader, frame_height_px)]
+
+    return _PNG_FORMATS[(reader.greyscale, reader.alpha)], frames
+
+
+
+
+class RecordingStream:
+    """Class RecordingStream. Frames of a recording, stored one above the other in an image compressed as .png.xz, decoded while
+    the recording is played rather than all at once when it starts. A background thread decompresses and decodes the image
+    row by row from its top, keeping up to n_decoded frames ahead of the one displayed. These are uploaded into a ring of
+    n_textures textures just before being displayed, overwriting the frames already played: memory used is bounded whatever
+    the length of the recording.
+    The pixels of the frames can also be kept, within max_kept_bytes, so that once the recording is streamed to its end they
+    are available from decoded_frames without decoding the recording again (e.g. to cache them in a RecordingCache).
+    As in an ImageGrid, frames are indexed from the bottom of the image: recordings are played from the last frame to the first."""
+
+    def __init__(self, path, frame_width_px, frame_height_px, n_decoded = RECORDING_STREAM_N_DECODED, n_textures = RECORDING_STREAM_N_TEXTURES,
+                 max_kept_bytes = 0):
+        """Constructor for the class RecordingStream. Only the header of the image is read before returning."""
+        self._path = path
+        self._frame_height_px = frame_height_px
+        self._n_decoded = n_decoded
+
+        # Pixels of the frames taken from the decoding thread, identical frames being the same bytes object as in decode_recording,
+        # until they exceed max_kept_bytes. All the frames of the recording, once they have all been kept.
+        self._max_kept_bytes = max_kept_bytes
+        self._kept_frames = None
+        self._unique_frames = None
+        self._n_kept_bytes = 0
+        self._all_frames = None
+
+        self._file = None
+        self._xz_file = None
+        self._decoded_frames = None
+        self._stop = None
+        self._thread = None
+        reader = self._start()
+
+        try:
+            _check_image(reader, frame_width_px)
+        except ValueError:
+            self.close()
+            raise
+
+        self._n_frames = reader.height // frame_height_px
+        self._format = _PNG_FORMATS[(reader.greyscale, reader.alpha)]
+
+        self._textures = [pyglet.image.Texture.create(frame_width_px, frame_height_px) for _ in range(n_textures)]
+        for texture in self._textures:
+            utils.set_texture_interp_mode(texture)
+
+
+    def _start(self):
+        # Opens the image and starts decoding it from its top, in a new thread. Returns the PNG reader, once the header is read.
+        self._file, self._xz_file, reader = _open_image(self._path)
+
+        # Number of frames taken from the decoding thread so far, whose position from the top of the image is the index in the stream.
+        self._n_streamed = 0
+
+        # Frames are kept again from the top of the image, unless all of them already were.
+        if self._max_kept_bytes > 0 and self._all_frames is None:
+            self._kept_frames = []
+            self._unique_frames = {}
+            self._n_kept_bytes = 0
+
+        self._decoded_frames = queue.Queue(maxsize = self._n_decoded)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target = _decode_frames, args = (reader, self._frame_height_px, self._decoded_frames, self._stop),
+                                        daemon = True)
+        self._thread.start()
+
+        return reader
+
+
+    def close(self):
+        """Stops decoding frames, and releases the image. The textures are released once the instance is deleted."""
+        if self._thread is not None:
+            # Making room in the queue of decoded frames avoids waiting for the thread to time out when it is full.
+            self._stop.set()
+            while not self._decoded_frames.empty():
+                self._decoded_frames.get()
+            self._thread.join()
+            self._thread = None
+
+            self._xz_file.close()
+            self._file.close()
+            self._xz_file = self._file = None
+
+
+    def __len__(self):
+        return self._n_frames
+
+
+    def decoded_frames(self):
+        """Returns the format of the pixels of the frames, and the list of their pixels from the top of the image to its bottom,
+        as decode_recording, if all of them were kept while streamed. Returns None otherwise."""
+        if self._all_frames is None:
+            return None
+        return self._format, self._all_frames
+
+
+    def __getitem__(self, idx):
+        """Returns a texture holding frame idx. It remains valid until another frame is requested."""
+        if idx < 0:
+            idx += self._n_frames
+        if not 0 <= idx < self._n_frames:
+            raise IndexError('Recording frame index out of range')
+
+        n_textures = len(self._textures)
+        stream_idx = self._n_frames - 1 - idx
+
+        # Frames already overwritten can only be decoded again from the top of the image.
+        if stream_idx < self._n_streamed - n_textures:
+            self.close()
+            self._start()
+
+        # Frames which would be overwritten before being displayed are not uploaded at all.
+        while self._n_streamed < stream_idx - n_textures + 1:
+            self._next_frame(block = True)
+            self._n_streamed += 1
+
+        # Upload all frames up to the one requested, and the following ones already decoded as long as they overwrite older frames.
+        while self._n_streamed < min(stream_idx + n_textures, self._n_frames):
+            data = self._next_frame(block = self._n_streamed <= stream_idx)
+            if data is None:
+                break
+
+            frame = pyglet.image.ImageData(self._textures[0].width, self._textures[0].height, self._format, data)
+            self._textures[self._n_streamed % n_textures].blit_into(frame, 0, 0, 0)
+            self._n_streamed += 1
+
+        return self._textures[stream_idx % n_textures]
+
+
+    def _next_frame(self, block):
+        # Returns the pixels of the next frame decoded, or None if not decoded yet and block is False.
+        try:
+            data = self._decoded_frames.get(block = block)
+        except queue.Empty:
+            return None
+
+        if isinstance(data, Exception):
+            raise data
+
+        if self._kept_frames is not None:
+            self._keep_frame(data)
+        return data
+
+
+    def _keep_frame(self, data):
+        # Keeps the pixels of the next frame of the stream, counting their size only once for identical frames.
+        frame = self._unique_frames.setdefault(data, data)
+        if frame is data:
+            self._n_kept_bytes += len(data)
+
+        if self._n_kept_bytes > self._max_kept_bytes:
+            # Frames are not kept anymore, even when streamed again, so that memory used remains bounded.
+            self._max_kept_bytes = 0
+            self._kept_frames = self._unique_frames = None
+            return
+
+        self._kept_frames.append(frame)
+        if len(self._kept_frames) == self._n_frames:
+            self._all_frames = self._kept_frames
+            self._kept_frames = self._unique_frames = None
+
+
+    def __del__(self):
+        self.close()
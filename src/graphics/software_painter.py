@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+
+import math
+
+import numpy as np
+
+from src import asset_pack
+from src.constants import (GRAPHICS_ATLAS_PATH,
+                           BACKGROUND_COLOR,
+                           SHADERS_TEX_PADDING,
+                           LAYOUT_N_ROWS_TILES,
+                           LAYOUT_N_COLS_TILES,
+                           LAYOUT_PX_PER_UNIT_LENGHT)
+
+
+# Size in pixels of the frames drawn.
+_FRAME_WIDTH  = LAYOUT_N_COLS_TILES * LAYOUT_PX_PER_UNIT_LENGHT
+_FRAME_HEIGHT = LAYOUT_N_ROWS_TILES * LAYOUT_PX_PER_UNIT_LENGHT
+
+# Number of values describing a quad, as the arguments of add_quad.
+_QUAD_SIZE = 7
+
+# Maximum number of patches of texture kept by a SoftwarePainter for the quads it drew, before forgetting all of them.
+_MAX_PATCHES = 8192
+
+
+
+def _load_texture(image):
+    # Returns the pixels of a pyglet image as an array of BGRA values, with rows from bottom to top as in OpenGL textures.
+    image_data = image.get_image_data()
+    data = image_data.get_data('BGRA', image_data.width * 4)
+    return np.frombuffer(data, dtype = np.uint8).reshape(image_data.height, image_data.width, 4)
+
+
+def _quad_edges(quad):
+    # Returns the left and bottom edges of quad, in pixels from the left and bottom of the frame.
+    # They are computed with the single precision of the vertex buffer, which matters for quads placed nearly half-way between pixels.
+    x_pos_center, y_pos_center, _, _, width_px, height_px, _ = quad
+    x_pos_center, y_pos_center = np.float32(x_pos_center), np.float32(y_pos_center)
+    left_edge   = float(x_pos_center * LAYOUT_PX_PER_UNIT_LENGHT - np.float32(width_px / 2))
+    bottom_edge = float((LAYOUT_N_ROWS_TILES - y_pos_center) * LAYOUT_PX_PER_UNIT_LENGHT - np.float32(height_px / 2))
+    return left_edge, bottom_edge
+
+
+def _quad_rectangle(quad):
+    # Returns the first column and row (from the bottom) of the pixels covered by quad, as OpenGL would rasterize it:
+    # a pixel is covered if its center is inside the quad.
+    left_edge, bottom_edge = _quad_edges(quad)
+    return math.ceil(left_edge - 0.5), math.ceil(bottom_edge - 0.5)
+
+
+def _texel_indices(edge, size_px, start, stop, tex_start, tex_padding_px):
+    # Returns the index of the texel sampled by each pixel from start to stop along an axis, for a quad beginning at edge.
+    # The shaders shrink texture coordinates by tex_padding_px on both sides: when pixel centers do not lie in the middle
+    # of texels, as for quads placed half-way between pixels, some texels are sampled twice and the last one is skipped.
+    # Pixels sampling exactly the boundary between two texels get the second one, while GPUs can pick either depending on rounding.
+    offsets = np.arange(start, stop) + 0.5 - edge
+    return tex_start + np.floor(tex_padding_px + offsets * (size_px - 2 * tex_padding_px) / size_px).astype(np.intp)
+
+
+
+class SoftwarePainter:
+    """Class SoftwarePainter. Draws quads like Painter, but on the CPU with NumPy, without any OpenGL context or display.
+    Quads are copied from the texture into a framebuffer held in memory, discarding fully transparent pixels and keeping
+    the closest quad where they overlap, as done by the shaders of Painter. As quads are never scaled, no interpolation is needed.
+    It also renders frames like OffscreenRenderer, so that both can be used interchangeably: to draw with it, the Graphics
+    instance must be created with it as painter. Recordings, whose textures are loaded into OpenGL by Graphics, are not supported."""
+
+    def __init__(self, background_color = BACKGROUND_COLOR):
+        """Constructor for the class SoftwarePainter."""
+        self._default_atlas = _load_texture(asset_pack.load_image(GRAPHICS_ATLAS_PATH))
+        self._texture_color  = None
+        self._texture_opaque = None
+        self._tex_padding_px = None
+        self._patches = {}   # Texels drawn by quads, by quad and texture offset (see _quad_patch).
+
+        # Pixels are kept as BGRA values packed into 32 bits, so that copying one is a single operation. Their alpha is not used.
+        self._background_color = np.array([*(round(channel * 255) for channel in reversed(background_color)), 255], dtype = np.uint8).view(np.uint32)[0]
+        self._color = np.empty((_FRAME_HEIGHT, _FRAME_WIDTH), dtype = np.uint32)
+        self._depth = np.empty((_FRAME_HEIGHT, _FRAME_WIDTH), dtype = np.float32)
+        self._from_layer = np.zeros((_FRAME_HEIGHT, _FRAME_WIDTH), dtype = bool)   # Pixels drawn by layers during the current draw.
+        self._cleared = False
+
+        self._quads  = []
+        self._layers = []   # (layer, texture offset) of the layers to draw with the next draw.
+
+        # Layers drawn by the last draw composited over the background, with the key identifying them.
+        self._composite_key = None
+        self._composite = None
+
+        self.clear()
+
+        self.set_texture()
+
+
+    def set_texture(self, image = None):
+        texture = self._default_atlas if image is None else _load_texture(image)
+
+        # Color and opacity of texels are kept apart, to copy them packed like pixels and test them without going through the other channels.
+        self._texture_color  = np.ascontiguousarray(texture).view(np.uint32)[..., 0]
+        self._texture_opaque = texture[..., 3] != 0
+
+        # Padding applied by the shaders to texture coordinates, in texels.
+        self._tex_padding_px = (texture.shape[1] * SHADERS_TEX_PADDING, texture.shape[0] * SHADERS_TEX_PADDING)
+        self._patches = {}
+
+
+    def create_layer(self, n_quads):
+        """Returns a new SoftwarePainterLayer of n_quads quads, all hidden."""
+        return SoftwarePainterLayer(self, n_quads)
+
+
+    def add_quad(self, x_pos_center, y_pos_center, x_tex_left_px, y_tex_bottom_px, width_px, height_px, z_coord):
+        self._quads.append((x_pos_center, y_pos_center, x_tex_left_px, y_tex_bottom_px, width_px, height_px, z_coord))
+
+
+    def pack_quads(self, quads):
+        """Returns quads, an iterable of tuples of the arguments of add_quad, to be added all at once with add_quads, as with Painter."""
+        return tuple(tuple(quad) for quad in quads)
+
+
+    def add_quads(self, packed_quads):
+        self._quads.extend(packed_quads)
+
+
+    def add_layer(self, layer, tex_offset_px = (0, 0)):
+        self._layers.append((layer, tex_offset_px))
+
+
+    def draw(self):
+        # Quads are drawn before layers as by Painter: where a layer has a pixel at the same depth as a quad, the quad is kept.
+        quads, layers = self._quads, self._layers
+        self._quads, self._layers = [], []
+
+        if self._cleared:
+            # Start from the layers already composited over the background rather than clearing the framebuffer and drawing them.
+            self._cleared = False
+            color, depth, from_layer, layer_depths = self._composite_layers(layers)
+            np.copyto(self._color, color)
+            np.copyto(self._depth, depth)
+            np.copyto(self._from_layer, from_layer)
+
+            self._rasterize(quads, (0, 0), self._color, self._depth, layer_depths)
+
+        else:
+            self._rasterize(quads, (0, 0), self._color, self._depth)
+
+            if layers:
+                color, depth, _, _ = self._composite_layers(layers)
+                closer = depth < self._depth
+                np.copyto(self._color, color, where = closer)
+                np.copyto(self._depth, depth, where = closer)
+
+
+    def clear(self):
+        """Clears the framebuffer to the background color, as done by the window before drawing each frame.
+        The framebuffer is only filled by the next draw, together with the layers it draws."""
+        self._cleared = True
+
+
+    def render(self, draw):
+        """Calls draw, which must draw a frame using this painter, and returns the frame drawn as an array of shape (height, width, 3),
+        with BGR channels and rows from top to bottom."""
+        self.clear()
+        draw()
+
+        if self._cleared:
+            self.draw()
+
+        # Rows are stored from bottom to top as in OpenGL. Channels are copied one at a time, which is much faster than copying
+        # the three of each pixel together.
+        pixels = self._color[::-1].view(np.uint8).reshape(_FRAME_HEIGHT, _FRAME_WIDTH, 4)
+        frame = np.empty((_FRAME_HEIGHT, _FRAME_WIDTH, 3), dtype = np.uint8)
+        for channel in range(3):
+            frame[..., channel] = pixels[..., channel]
+
+        return frame
+
+
+    def render_frames(self, draws):
+        """Generator calling each draw of the iterable draws in turn, and yielding the frames drawn in the same order."""
+        for draw in draws:
+            yield self.render(draw)
+
+
+    def _composite_layers(self, layers):
+        # Returns the color and depth of layers drawn over the background, where they were drawn and the depths of their quads.
+        # These only change with the layers drawn, their texture offsets and their quads: the last ones are kept until then.
+        key = tuple((layer, tuple(tex_offset_px), layer._version) for layer, tex_offset_px in layers)
+        if key != self._composite_key:
+            color = np.empty_like(self._color)
+            color[...] = self._background_color
+            depth = np.full_like(self._depth, np.inf)
+
+            for layer, tex_offset_px in layers:
+                layer_color, layer_depth = layer._raster(tuple(tex_offset_px))
+                closer = layer_depth < depth
+                np.copyto(color, layer_color, where = closer)
+                np.copyto(depth, layer_depth, where = closer)
+
+            layer_depths = {z_coord for layer, _ in layers for z_coord in np.unique(layer._quads[:, 6]).tolist()}
+
+            self._composite_key = key
+            self._composite = (color, depth, depth != np.inf, layer_depths)
+
+        return self._composite
+
+
+    def _rasterize(self, quads, tex_offset_px, color, depth, layer_depths = ()):
+        # Quads at one of layer_depths are tested against the pixels of layers as if these were drawn after them, like Painter does.
+        for quad in quads:
+            patch = self._quad_patch(quad, tex_offset_px)
+            if patch is None:
+                continue
+            region, patch_color, patch_opaque = patch
+
+            # Depths are compared with the same precision as they are stored.
+            z_coord = np.float32(quad[6])
+            region_depth = depth[region]
+            visible = z_coord < region_depth
+            visible &= patch_opaque
+            if z_coord in layer_depths:
+                visible |= patch_opaque & (z_coord == region_depth) & self._from_layer[region]
+                self._from_layer[region][visible] = False
+
+            np.copyto(color[region], patch_color, where = visible)
+            np.copyto(region_depth, z_coord, where = visible)
+
+
+    def _quad_patch(self, quad, tex_offset_px):
+        # Returns the region of the frame covered by quad, with the color and opacity of the texels drawn on each of its pixels,
+        # or None if it covers no pixel. Most quads are drawn again at the same place with the same texels at the next frames
+        # (texts, fruits, sprites standing still), so patches are kept rather than gathered from the texture at every draw.
+        key = (tuple(quad[:6]), tex_offset_px)
+        if key in self._patches:
+            return self._patches[key]
+
+        _, _, x_tex_left_px, y_tex_bottom_px, width_px, height_px, _ = quad
+        width_px, height_px = int(width_px), int(height_px)
+        left_edge, bottom_edge = _quad_edges(quad)
+        left, bottom = math.ceil(left_edge - 0.5), math.ceil(bottom_edge - 0.5)
+
+        # Clip quads partly out of the frame.
+        x_start, x_stop = max(left  , 0), min(left   + width_px , _FRAME_WIDTH )
+        y_start, y_stop = max(bottom, 0), min(bottom + height_px, _FRAME_HEIGHT)
+
+        if width_px <= 0 or height_px <= 0 or x_start >= x_stop or y_start >= y_stop:
+            patch = None
+        else:
+            tex_left   = int(x_tex_left_px)   + tex_offset_px[0]
+            tex_bottom = int(y_tex_bottom_px) + tex_offset_px[1]
+            if left_edge == left and bottom_edge == bottom:
+                # Quads aligned with pixels sample each texel once, and their texels are copied as they are.
+                tex_x = tex_left   + x_start - left
+                tex_y = tex_bottom + y_start - bottom
+                texels = np.s_[tex_y:tex_y + y_stop - y_start, tex_x:tex_x + x_stop - x_start]
+            else:
+                tex_xs = _texel_indices(left_edge  , width_px , x_start, x_stop, tex_left  , self._tex_padding_px[0])
+                tex_ys = _texel_indices(bottom_edge, height_px, y_start, y_stop, tex_bottom, self._tex_padding_px[1])
+                texels = np.ix_(tex_ys, tex_xs)
+
+            patch = (np.s_[y_start:y_stop, x_start:x_stop],
+                     np.ascontiguousarray(self._texture_color[texels]), np.ascontiguousarray(self._texture_opaque[texels]))
+
+        if len(self._patches) >= _MAX_PATCHES:
+            self._patches.clear()
+        self._patches[key] = patch
+
+        return patch
+
+
+    # Defining properties for some private attributes.
+    width  = property(lambda self: _FRAME_WIDTH)
+    height = property(lambda self: _FRAME_HEIGHT)
+
+
+
+
+class SoftwarePainterLayer:
+    """Class SoftwarePainterLayer. Set of quads drawn by a SoftwarePainter, like PainterLayer. The layer is kept rasterized
+    in its own framebuffer, and only the pixels covered by changed quads are rasterized again."""
+
+    def __init__(self, painter, n_quads):
+        self._painter = painter
+        self._quads = np.zeros((n_quads, _QUAD_SIZE), dtype = np.float32)   # Same precision as the vertex buffer of a PainterLayer.
+
+        # Rasterized layer for each texture offset it was drawn with: color and depth of each pixel.
+        self._rasters = {}
+        self._version = 0   # Incremented whenever a quad changes.
+
+
+    def set_quad(self, idx, x_pos_center, y_pos_center, x_tex_left_px, y_tex_bottom_px, width_px, height_px, z_coord):
+        self._update_quad(idx, (x_pos_center, y_pos_center, x_tex_left_px, y_tex_bottom_px, width_px, height_px, z_coord))
+
+
+    def hide_quad(self, idx):
+        # A quad of null size covers no pixel.
+        self._update_quad(idx, (0, 0, 0, 0, 0, 0, 0))
+
+
+    def _update_quad(self, idx, quad):
+        old_quad = tuple(self._quads[idx])
+        self._quads[idx] = quad
+        self._version += 1
+
+        if not self._rasters:
+            return
+
+        # Clear the pixels covered by the old quad, and rasterize again all quads covering them, and the new quad.
+        old_left, old_bottom = _quad_rectangle(old_quad)
+        old_right, old_top = old_left + int(old_quad[4]), old_bottom + int(old_quad[5])
+
+        lefts, bottoms = self._rectangles()
+        widths, heights = self._quads[:, 4], self._quads[:, 5]
+        overlapping = (lefts < old_right) & (lefts + widths > old_left) & (bottoms < old_top) & (bottoms + heights > old_bottom)
+        overlapping[idx] = True
+
+        quads = [tuple(quad) for quad in self._quads[overlapping]]
+        for tex_offset_px, (color, depth) in self._rasters.items():
+            y_start, x_start = max(old_bottom, 0), max(old_left, 0)
+            color[y_start:max(old_top, 0), x_start:max(old_right, 0)] = 0
+            depth[y_start:max(old_top, 0), x_start:max(old_right, 0)] = np.inf
+            self._painter._rasterize(quads, tex_offset_px, color, depth)
+
+
+    def _rectangles(self):
+        # Vectorised version of _quad_rectangle for all quads of the layer.
+        left_edges   = self._quads[:, 0] * LAYOUT_PX_PER_UNIT_LENGHT - self._quads[:, 4] / 2
+        bottom_edges = (LAYOUT_N_ROWS_TILES - self._quads[:, 1]) * LAYOUT_PX_PER_UNIT_LENGHT - self._quads[:, 5] / 2
+        return np.ceil(left_edges.astype(np.float64) - 0.5), np.ceil(bottom_edges.astype(np.float64) - 0.5)
+
+
+    def _raster(self, tex_offset_px):
+        if tex_offset_px not in self._rasters:
+            color = np.zeros((_FRAME_HEIGHT, _FRAME_WIDTH), dtype = np.uint32)
+            depth = np.full((_FRAME_HEIGHT, _FRAME_WIDTH), np.inf, dtype = np.float32)
+            self._painter._rasterize([tuple(quad) for quad in self._quads], tex_offset_px, color, depth)
+            self._rasters[tex_offset_px] = (color, depth)
+
+        return self._rasters[tex_offset_px]
+
+
+    n_quads = property(lambda self: len(self._quads))
@@ -3,7 +3,10 @@
 from src.graphics.sprites.sprite import AbstractSprite
 from src.constants import (GHOSTS_MOVE_ANIMATION_PERIOD_FRAMES,
                            GHOSTS_FRIGHT_FLASH_ANIMATION_PERIOD_FRAMES,
-                           GHOST_SPRITE_TEX_REGION,
+                           GhostAppearances,
+                           SPRITE_DIRECTION_INDEX,
+                           GHOST_SPRITE_TEX_INDEX,
+                           GHOST_SPRITE_TEX_REGIONS,
                            Z_COORD_GHOSTS)
 from src.graphics.utils import convert_maze_coord_to_layout_coord
 
@@ -21,8 +24,8 @@ class GhostSprite(AbstractSprite):
         self._fright_flash_counter += 1
 
 
-    def send_vertex_data(self, ghosts):
-        for ghost in ghosts:
+    def send_vertex_data(self, ghosts, positions = None):
+        for idx, ghost in enumerate(ghosts):
             if ghost.was_just_eaten:
                 continue
 
@@ -30,7 +33,7 @@ class GhostSprite(AbstractSprite):
             z_coord = Z_COORD_GHOSTS[name]
 
             tex_region = self._get_tex_region(name, ghost.frightened, ghost.transparent, ghost.eyes_direction)
-            coords = convert_maze_coord_to_layout_coord(ghost.position)
+            coords = convert_maze_coord_to_layout_coord(positions[idx] if positions is not None else ghost.position)
 
             self._painter.add_quad(coords.x, coords.y, *tex_region, z_coord)
 
@@ -54,11 +57,13 @@ class GhostSprite(AbstractSprite):
     def _get_tex_region(self, name, frightened, transparent, eyes_direction):
         movement_frame_idx = (self._movement_counter // GHOSTS_MOVE_ANIMATION_PERIOD_FRAMES) % 2
 
-        if frightened:
+        if transparent:
+            appearance = GhostAppearances.TRANSPARENT
+        elif frightened:
             frightened_blue = self._fright_flash_counter < 0 or \
                                 (self._fright_flash_counter // GHOSTS_FRIGHT_FLASH_ANIMATION_PERIOD_FRAMES) % 2 == 1
-            frightened_white = not frightened_blue
+            appearance = GhostAppearances.FRIGHTENED_BLUE if frightened_blue else GhostAppearances.FRIGHTENED_WHITE
         else:
-            frightened_blue = frightened_white = False
+            appearance = GhostAppearances.NORMAL
 
-        return GHOST_SPRITE_TEX_REGION(name, frightened_blue, frightened_white, transparent, eyes_direction, movement_frame_idx)
\ No newline at end of file
+        return GHOST_SPRITE_TEX_REGIONS[GHOST_SPRITE_TEX_INDEX(name, appearance, SPRITE_DIRECTION_INDEX(eyes_direction), movement_frame_idx)]
\ No newline at end of file
@@ -2,19 +2,60 @@
 
 from src.graphics.sprites.sprite import AbstractSprite
 from src.constants import (MazeTiles,
-                           MAZE_TILES_ROWS,
+                           MAZE_START_TILES,
                            MAZE_TILES_COLS,
                            LEVEL_COMPLETED_FLASH_ANIMATION_PERIOD_FRAMES,
                            POWER_PELLET_FLASH_ANIMATION_PERIOD_FRAMES,
                            MAZE_SPRITE_TEX_REGION,
-                           Z_COORD_MAZE)
+                           Z_COORD_MAZE,
+                           Z_COORD_MAZE_FOREGROUND)
 from src.graphics.utils import convert_maze_coord_to_layout_coord
 from src.directions import Vector2
 
 
+# The maze is drawn as three layers kept on the GPU, which are only updated when pellets are eaten:
+# - background: every tile of the maze without pellets, whose walls flash at the end of a level by shifting its texture coordinates.
+# - foreground: pellets and door, drawn over the background when walls are not flashing.
+# - power pellets: drawn over the background when neither walls nor power pellets are flashing.
+_TILES_ROW_COL = [divmod(index, MAZE_TILES_COLS) for index in range(len(MAZE_START_TILES))]
+_FOREGROUND_ROW_COL    = [_TILES_ROW_COL[index] for index, tile in enumerate(MAZE_START_TILES) if tile in (MazeTiles.PELLET, MazeTiles.DOOR)]
+_POWER_PELLETS_ROW_COL = [_TILES_ROW_COL[index] for index, tile in enumerate(MAZE_START_TILES) if tile == MazeTiles.POWER_PELLET]
+
+# Walls look the same whether the maze is shown with or without pellets, and when flashing blue. Only flashing white needs other texture coordinates.
+_WHITE_WALLS_TEX_OFFSET = (MAZE_SPRITE_TEX_REGION(0, 0, MazeTiles.EMPTY, False, True)[0] - MAZE_SPRITE_TEX_REGION(0, 0, MazeTiles.EMPTY, False, False)[0], 0)
+
+
 
 class MazeSprite(AbstractSprite):
-        
+
+    def __init__(self, painter):
+        super().__init__(painter)
+
+        origin = convert_maze_coord_to_layout_coord(Vector2.ZERO)
+        self._offset_x = origin.x + 0.5
+        self._offset_y = origin.y + 0.5
+
+        self._background_layer    = painter.create_layer(len(_TILES_ROW_COL))
+        self._foreground_layer    = painter.create_layer(len(_FOREGROUND_ROW_COL))
+        self._power_pellets_layer = painter.create_layer(len(_POWER_PELLETS_ROW_COL))
+
+        for idx, (row, col) in enumerate(_TILES_ROW_COL):
+            self._set_tile(self._background_layer, idx, row, col, MazeTiles.EMPTY, Z_COORD_MAZE)
+
+        # Layer and slot of each tile of the foreground and power pellets layers, and pellets bitmap of the maze they currently show.
+        self._slots = {}
+        for layer, tiles_row_col in [(self._foreground_layer   , _FOREGROUND_ROW_COL),
+                                     (self._power_pellets_layer, _POWER_PELLETS_ROW_COL)]:
+            for idx, row_col in enumerate(tiles_row_col):
+                self._slots[row_col] = (layer, idx)
+
+        for row, col in _FOREGROUND_ROW_COL:
+            if MAZE_START_TILES[row * MAZE_TILES_COLS + col] == MazeTiles.DOOR:
+                self._set_tile(*self._slots[row, col], row, col, MazeTiles.DOOR, Z_COORD_MAZE_FOREGROUND)
+
+        self._pellets_bitmap = 0
+
+
     def reset(self):
         self._flash_counter_power_pellet = 0
         self._flash_counter_walls = None
@@ -27,34 +68,32 @@ class MazeSprite(AbstractSprite):
 
 
     def send_vertex_data(self, maze):
+        # Only update tiles whose pellet was eaten (or restored) since the last call.
+        for row, col in maze.pellets_changed(self._pellets_bitmap):
+            layer, idx = self._slots[row, col]
+            tile = maze[row, col]
+            if tile == MazeTiles.EMPTY:
+                layer.hide_quad(idx)
+            else:
+                self._set_tile(layer, idx, row, col, tile, Z_COORD_MAZE_FOREGROUND)
+        self._pellets_bitmap = maze.pellets_bitmap
 
-        if self._flash_counter_walls is None:
-            flash_blue  = False
-            flash_white = False
-        elif (self._flash_counter_walls // LEVEL_COMPLETED_FLASH_ANIMATION_PERIOD_FRAMES) % 2:
-            flash_blue  = True
-            flash_white = False
-        else:
-            flash_blue  = False
-            flash_white = True
-
-        origin = convert_maze_coord_to_layout_coord(Vector2.ZERO)
-        offset_x = origin.x + 0.5
-        offset_y = origin.y + 0.5
-
-        for row in range(MAZE_TILES_ROWS):
-            y_coord = row + offset_y
+        # While walls flash, pellets and door are hidden.
+        if self._flash_counter_walls is not None:
+            flash_white = not (self._flash_counter_walls // LEVEL_COMPLETED_FLASH_ANIMATION_PERIOD_FRAMES) % 2
+            self._painter.add_layer(self._background_layer, _WHITE_WALLS_TEX_OFFSET if flash_white else (0, 0))
+            return
 
-            for col in range(MAZE_TILES_COLS):
-                x_coord = col + offset_x
+        self._painter.add_layer(self._background_layer)
+        self._painter.add_layer(self._foreground_layer)
+        if not (self._flash_counter_power_pellet // POWER_PELLET_FLASH_ANIMATION_PERIOD_FRAMES) % 2:
+            self._painter.add_layer(self._power_pellets_layer)
 
-                tile = maze[row, col]
-                if tile == MazeTiles.POWER_PELLET and (self._flash_counter_power_pellet // POWER_PELLET_FLASH_ANIMATION_PERIOD_FRAMES) % 2:
-                    continue
 
-                tex_region = MAZE_SPRITE_TEX_REGION(row, col, tile, flash_blue, flash_white)
-                self._painter.add_quad(x_coord, y_coord, *tex_region, Z_COORD_MAZE)
+    def _set_tile(self, layer, idx, row, col, tile, z_coord):
+        tex_region = MAZE_SPRITE_TEX_REGION(row, col, tile, False, False)
+        layer.set_quad(idx, col + self._offset_x, row + self._offset_y, *tex_region, z_coord)
  
 
     def notify_level_end(self):
-        self._flash_counter_walls = 0
\ No newline at end of file
+        self._flash_counter_walls = 0
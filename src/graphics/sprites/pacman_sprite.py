@@ -4,7 +4,10 @@ from src.graphics.sprites.sprite import AbstractSprite
 from src.constants import (PACMAN_MOVE_ANIMATION_PERIOD_FRAMES,
                            PACMAN_DEATH_ANIMATION_PERIOD_FRAMES,
                            PacManStates,
-                           PACMAN_SPRITE_TEX_REGION,
+                           SPRITE_DIRECTION_INDEX,
+                           PACMAN_SPAWNING_SPRITE_TEX_REGION,
+                           PACMAN_MOVING_SPRITE_TEX_REGIONS,
+                           PACMAN_DEATH_SPRITE_TEX_REGIONS,
                            Z_COORD_PACMAN)
 from src.graphics.utils import convert_maze_coord_to_layout_coord
 
@@ -42,20 +45,17 @@ class PacManSprite(AbstractSprite):
                 raise ValueError('Unvalid state provided for Pac-Man to PacManSprites.update') 
 
 
-    def send_vertex_data(self, pacman):
+    def send_vertex_data(self, pacman, position = None):
         tex_region, self._valid_stuck_frame = self._get_tex_region(pacman.direction, pacman.state)
-        coords = convert_maze_coord_to_layout_coord(pacman.position)
+        coords = convert_maze_coord_to_layout_coord(position if position is not None else pacman.position)
 
         self._painter.add_quad(coords.x, coords.y, *tex_region, Z_COORD_PACMAN)
 
 
     def _get_tex_region(self, direction, state):
 
-        spawning = state == PacManStates.SPAWNING
-        dead     = state == PacManStates.DEAD
-
         # Calculate index of frame animation for sprite.
-        if dead:
+        if state == PacManStates.DEAD:
             if self._frame_counter >= sum(PACMAN_DEATH_ANIMATION_PERIOD_FRAMES):
                 frame_idx = -1
 
@@ -67,7 +67,10 @@ class PacManSprite(AbstractSprite):
                     if self._frame_counter < cumtime:
                         break
 
-        else:
-            frame_idx = (self._frame_counter // PACMAN_MOVE_ANIMATION_PERIOD_FRAMES) % 4
+            return PACMAN_DEATH_SPRITE_TEX_REGIONS[frame_idx]
+
+        if state == PacManStates.SPAWNING:
+            return PACMAN_SPAWNING_SPRITE_TEX_REGION
 
-        return PACMAN_SPRITE_TEX_REGION(direction, spawning, dead, frame_idx)
\ No newline at end of file
+        frame_idx = (self._frame_counter // PACMAN_MOVE_ANIMATION_PERIOD_FRAMES) % 4
+        return PACMAN_MOVING_SPRITE_TEX_REGIONS[4 * SPRITE_DIRECTION_INDEX(direction) + frame_idx]
\ No newline at end of file
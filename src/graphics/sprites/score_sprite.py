@@ -4,7 +4,7 @@ from src.graphics.sprites.sprite import AbstractSprite
 from src.constants import (FRUIT_SPAWN_POSITION,
                            SCORE_FRUIT_VISIBLE_DURATION_FRAMES,
                            SCORE_GHOST_EATEN_DURATION_FRAMES,
-                           SCORE_SPRITE_TEX_REGION,
+                           SCORE_SPRITE_TEX_REGIONS,
                            Z_COORD_SCORE_FRUIT,
                            Z_COORD_SCORE_GHOST_EAT)
 from src.graphics.utils import convert_maze_coord_to_layout_coord
@@ -31,12 +31,12 @@ class ScoreSprite(AbstractSprite):
 
     def send_vertex_data(self):
         if self._fruit_score_frame_counter > 0:
-            tex_region = SCORE_SPRITE_TEX_REGION(self._fruit_score_value)
+            tex_region = SCORE_SPRITE_TEX_REGIONS[self._fruit_score_value]
             coords = convert_maze_coord_to_layout_coord(FRUIT_SPAWN_POSITION)
             self._painter.add_quad(coords.x, coords.y, *tex_region, Z_COORD_SCORE_FRUIT)
         
         if self._ghost_score_frame_counter > 0:
-            tex_region = SCORE_SPRITE_TEX_REGION(self._ghost_score_value)
+            tex_region = SCORE_SPRITE_TEX_REGIONS[self._ghost_score_value]
             coords = convert_maze_coord_to_layout_coord(self._ghost_score_position)
             self._painter.add_quad(coords.x, coords.y, *tex_region, Z_COORD_SCORE_GHOST_EAT)
 
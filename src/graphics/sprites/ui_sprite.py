@@ -2,8 +2,8 @@
 
 from src.graphics.sprites.sprite import AbstractSprite
 from src.constants import (LIVES_SPRITE_TEX_REGION,
-                           FRUIT_SPRITE_TEX_REGION,
-                           TEXT_SPRITE_TEX_REGION,
+                           FRUIT_SPRITE_TEX_REGIONS,
+                           TEXT_SPRITE_TEX_REGIONS,
                            Z_COORD_UI_AND_TEXT,
                            Z_COORD_FRUIT_IN_MAZE,
                            FRUIT_OF_LEVEL,
@@ -33,6 +33,16 @@ from src.graphics.utils import convert_maze_coord_to_layout_coord
 
 class UiSprite(AbstractSprite):
 
+    def __init__(self, painter):
+        # Quads of each text printed, packed by the painter once and added again as a block every frame it is printed, by (x, y, color, text).
+        self._text_runs = {}
+
+        # Value and packed quads of the score numbers last printed, by coordinates. They are only packed again when the value changes.
+        self._number_runs = {}
+
+        super().__init__(painter)
+
+
     def reset(self):
         self._flash_counter_1up = 0
 
@@ -69,11 +79,18 @@ class UiSprite(AbstractSprite):
             self._print(*LAYOUT_1UP_TEXT_COORDS, UI_DEFAULT_TEXT_COLOR, '1UP')
         
         # Print score and high score numbers.
-        high_score = (''   if high_score == 0 else str(high_score)).rjust(UI_MAX_SCORE_NUM_DIGITS, ' ')[-UI_MAX_SCORE_NUM_DIGITS:]
-        score      = ('00' if score      == 0 else str(score))     .rjust(UI_MAX_SCORE_NUM_DIGITS, ' ')[-UI_MAX_SCORE_NUM_DIGITS:]
-        
-        self._print(*LAYOUT_HIGH_SCORE_NUMBER_COORDS, UI_DEFAULT_TEXT_COLOR, high_score)
-        self._print(*LAYOUT_SCORE_NUMBER_COORDS     , UI_DEFAULT_TEXT_COLOR, score)
+        self._print_number(LAYOUT_HIGH_SCORE_NUMBER_COORDS, high_score, '')
+        self._print_number(LAYOUT_SCORE_NUMBER_COORDS     , score     , '00')
+
+
+    def _print_number(self, coords, value, zero_text):
+        number_run = self._number_runs.get(coords)
+
+        if number_run is None or number_run[0] != value:
+            text = (zero_text if value == 0 else str(value)).rjust(UI_MAX_SCORE_NUM_DIGITS, ' ')[-UI_MAX_SCORE_NUM_DIGITS:]
+            number_run = self._number_runs[coords] = (value, self._painter.pack_quads(self._text_quads(*coords, UI_DEFAULT_TEXT_COLOR, text)))
+
+        self._painter.add_quads(number_run[1])
 
 
     def _draw_lives(self, lives):
@@ -89,13 +106,25 @@ class UiSprite(AbstractSprite):
         fruits = [FRUIT_OF_LEVEL(i) for i in range(level-UI_MAX_FRUIT_ICON_NUMBER+1, level+1) if i >= 1]
         x, y = LAYOUT_RIGHT_FRUIT_ICON_COORDS
         for fruit in fruits:
-            tex_coords = FRUIT_SPRITE_TEX_REGION(fruit)
+            tex_coords = FRUIT_SPRITE_TEX_REGIONS[fruit]
             self._painter.add_quad(x, y, *tex_coords, Z_COORD_UI_AND_TEXT)
             x -= 2
 
 
     def _print(self, x, y, color, text):
+        key = (x, y, color, text)
+        text_run = self._text_runs.get(key)
+
+        if text_run is None:
+            text_run = self._text_runs[key] = self._painter.pack_quads(self._text_quads(x, y, color, text))
+
+        self._painter.add_quads(text_run)
+
+
+    @staticmethod
+    def _text_quads(x, y, color, text):
         x_start = x
+        tex_regions = TEXT_SPRITE_TEX_REGIONS[color]
 
         for char in text:
             if char == '\n':
@@ -103,15 +132,15 @@ class UiSprite(AbstractSprite):
                 x = x_start
                 continue
 
-            tex_coords = TEXT_SPRITE_TEX_REGION(char, color)
-            self._painter.add_quad(x, y, *tex_coords, Z_COORD_UI_AND_TEXT)
+            tex_coords = tex_regions[char]
+            yield (x, y, *tex_coords, Z_COORD_UI_AND_TEXT)
             x += 1
 
 
     def _draw_fruit_in_maze(self, level):
         fruit = FRUIT_OF_LEVEL(level)
 
-        tex_coords = FRUIT_SPRITE_TEX_REGION(fruit)
+        tex_coords = FRUIT_SPRITE_TEX_REGIONS[fruit]
         coords = convert_maze_coord_to_layout_coord(FRUIT_SPAWN_POSITION)
 
         self._painter.add_quad(coords.x, coords.y, *tex_coords, Z_COORD_FRUIT_IN_MAZE)
\ No newline at end of file
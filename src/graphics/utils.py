@@ -1,15 +1,14 @@
 # -*- coding: utf-8 -*-
 
-import lzma
-
 import pyglet
 
+from src import asset_pack
 from src.constants import LAYOUT_MAZE_COORDS
 from src.directions import Vector2
 
 
 def load_image(path):
-    image = pyglet.image.load(path)
+    image = asset_pack.load_image(path)
 
     # Interpolate avoiding blur.
     texture = image.get_texture()
@@ -18,27 +17,6 @@ def load_image(path):
     return image
 
 
-def load_recording(path, frame_width_px, frame_height_px):
-    # This function generates a different texture for every frame.
-    # This would generally impact negatively performance, but drawing when recordings are active is not performance-intensive.
-    # Crucially, doing this bypasses the maximum texture size limit which applies to single textures. 
-
-    with lzma.open(path, 'r') as file:
-        recording = pyglet.image.load(path, file)
-
-    n_rows = recording.height // frame_height_px
-    n_cols = recording.width  // frame_width_px
-
-    frames_grid = pyglet.image.ImageGrid(recording, rows=n_rows, columns=n_cols)
-
-    # Interpolate avoiding blur for every frame of animation.
-    for frame in frames_grid:
-        texture = frame.get_texture()
-        set_texture_interp_mode(texture)
-
-    return frames_grid
-
-
 def set_texture_interp_mode(texture):
     pyglet.gl.glBindTexture(pyglet.gl.GL_TEXTURE_2D, texture.id)
     pyglet.gl.glTexParameteri(pyglet.gl.GL_TEXTURE_2D, pyglet.gl.GL_TEXTURE_MAG_FILTER, pyglet.gl.GL_NEAREST)
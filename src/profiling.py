@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import time
+import pstats
+import cProfile
+import threading
+import functools
+import contextlib
+import importlib
+from datetime import datetime
+
+from src.constants import STARTUP_TARGET_MS
+
+
+# Profiling modes that can be chosen with --profile or with the environment variable PROFILE_MODE_ENV_VAR (see src/constants.py).
+PROFILE_MODES = ('off', 'cprofile', 'timers')
+
+# Methods timed in 'timers' mode, grouped by subsystem: (module, class, method names).
+_TIMED_METHODS = {'pacman update':   [('src.game_objects.pacman', 'PacMan', ['update'])],
+                  'ghosts update':   [('src.game_objects.ghosts.ghost_coordinator', 'GhostsCoordinator', ['update'])],
+                  'collision':       [('src.game_objects.ghosts.ghost_coordinator', 'GhostsCoordinator', ['check_collision']),
+                                      ('src.game_objects.maze', 'Maze', ['eat_check_pellet'])],
+                  'sprite vertices': [('src.graphics.sprites.pacman_sprite', 'PacManSprite', ['send_vertex_data']),
+                                      ('src.graphics.sprites.ghost_sprite',  'GhostSprite',  ['send_vertex_data']),
+                                      ('src.graphics.sprites.maze_sprite',   'MazeSprite',   ['send_vertex_data']),
+                                      ('src.graphics.sprites.score_sprite',  'ScoreSprite',  ['send_vertex_data']),
+                                      ('src.graphics.sprites.ui_sprite',     'UiSprite',     ['send_vertex_data', 'draw_fruits'])],
+                  'painter draw':    [('src.graphics.painter', 'Painter', ['draw'])],
+                  'audio':           [('src.audio_events', 'AudioEventBus', ['stop', 'queue_correct_siren', 'notify_pellet_eaten', 'notify_fruit_eaten',
+                                                                               'notify_ghost_eaten', 'notify_extra_life', 'notify_life_lost',
+                                                                               'notify_first_welcome', 'notify_intermission', 'notify_game_completed']),
+                                      ('src.sounds', 'Sounds', ['play_event'])]}
+
+# Number of functions listed in the summary of 'cprofile' mode.
+_CPROFILE_SUMMARY_N_FUNCTIONS = 20
+
+
+
+
+def create_profiler(mode, output_path = None):
+    """Returns the profiler for mode, one of PROFILE_MODES. Results are written to output_path when the profiler is stopped,
+    or to a file named after the current date in the working directory if output_path is None."""
+    match mode:
+        case 'off':
+            return NullProfiler()
+        case 'cprofile':
+            return CProfileProfiler(output_path)
+        case 'timers':
+            return SubsystemTimersProfiler(output_path)
+
+    raise ValueError(f'Invalid profiling mode {mode!r}, expected one of {", ".join(PROFILE_MODES)}')
+
+
+def _default_output_path(extension):
+    dt = datetime.now().strftime("%Y-%m-%d %Hh%Mm%S")
+    return f'./Profiler Results {dt}{extension}'
+
+
+
+
+class NullProfiler:
+    """Class NullProfiler. Profiler of mode 'off', doing nothing so that the game runs without any overhead."""
+
+    def start(self):
+        return
+
+    def stop(self):
+        """Stops profiling, writes the results and returns a summary of them, or None if there is nothing to report."""
+        return None
+
+
+
+
+class CProfileProfiler:
+    """Class CProfileProfiler. Profiler of mode 'cprofile', recording every function call of the program with cProfile.
+    Results are written in the format of pstats, to be opened with e.g. snakeviz. This slows the whole game down noticeably."""
+
+    def __init__(self, output_path = None):
+        self._output_path = output_path if output_path is not None else _default_output_path('.prof')
+        self._profile = cProfile.Profile()
+
+
+    def start(self):
+        self._profile.enable()
+
+
+    def stop(self):
+        """Stops profiling, writes the results and returns a summary listing the functions with the highest cumulative time."""
+        self._profile.disable()
+        self._profile.dump_stats(self._output_path)
+
+        stream = io.StringIO()
+        pstats.Stats(self._profile, stream = stream).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_CPROFILE_SUMMARY_N_FUNCTIONS)
+        return f"cProfile results written to {self._output_path}\n{stream.getvalue()}"
+
+
+
+
+class SubsystemTimersProfiler:
+    """Class SubsystemTimersProfiler. Profiler of mode 'timers', with a low overhead: only the methods in _TIMED_METHODS are wrapped
+    while profiling, accumulating the number of calls and the time spent in each subsystem. Results are written as JSON."""
+
+    def __init__(self, output_path = None):
+        self._output_path = output_path if output_path is not None else _default_output_path('.json')
+
+        self._calls   = dict.fromkeys(_TIMED_METHODS, 0)
+        self._time_ns = dict.fromkeys(_TIMED_METHODS, 0)
+        self._wrapped = []   # (class, method name, original method) to restore when stopping.
+        self._start_ns = None
+
+
+    def start(self):
+        for subsystem, targets in _TIMED_METHODS.items():
+            for module_name, class_name, method_names in targets:
+                cls = getattr(importlib.import_module(module_name), class_name)
+                for method_name in method_names:
+                    method = cls.__dict__[method_name]
+                    setattr(cls, method_name, self._timed(subsystem, method))
+                    self._wrapped.append((cls, method_name, method))
+
+        self._start_ns = time.perf_counter_ns()
+
+
+    def stop(self):
+        """Stops profiling, restoring the original methods, writes the results and returns a summary table of them."""
+        elapsed_ns = time.perf_counter_ns() - self._start_ns
+
+        for cls, method_name, method in reversed(self._wrapped):
+            setattr(cls, method_name, method)
+        self._wrapped.clear()
+
+        results = {'elapsed_s': elapsed_ns / 1e9,
+                   'subsystems': {subsystem: {'calls': self._calls[subsystem],
+                                              'total_ms': self._time_ns[subsystem] / 1e6,
+                                              'mean_us': self._time_ns[subsystem] / 1e3 / max(self._calls[subsystem], 1)}
+                                  for subsystem in _TIMED_METHODS}}
+
+        with open(self._output_path, 'w') as file:
+            json.dump(results, file, indent = 4)
+
+        lines = [f"Subsystem timers written to {self._output_path}, over {results['elapsed_s']:.1f} s:",
+                 f"{'subsystem':<16} {'calls':>9} {'total ms':>10} {'mean us':>9} {'share':>7}"]
+        for subsystem, result in results['subsystems'].items():
+            share = result['total_ms'] / 1e3 / results['elapsed_s'] if elapsed_ns else 0
+            lines.append(f"{subsystem:<16} {result['calls']:>9} {result['total_ms']:>10.1f} {result['mean_us']:>9.1f} {share:>7.2%}")
+
+        return '\n'.join(lines)
+
+
+    def _timed(self, subsystem, method):
+        calls, time_ns, perf_counter_ns = self._calls, self._time_ns, time.perf_counter_ns
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                time_ns[subsystem] += perf_counter_ns() - start
+                calls[subsystem] += 1
+
+        return wrapper
+
+
+
+
+class StartupTimings:
+    """Class StartupTimings. Durations of the steps taken by the program before its first frame is drawn, each measured from the
+    end of the previous step, or from start (a time.perf_counter value) for the first one. Work done in other threads meanwhile
+    is recorded as spans, and all of it can be written as a trace to be opened with e.g. chrome://tracing or Perfetto."""
+
+    def __init__(self, start = None, target_ms = STARTUP_TARGET_MS):
+        self._start = start if start is not None else time.perf_counter()
+        self._last  = self._start
+        self._target_ms = target_ms
+        self._steps_ms = {}
+        self._spans = []   # (name, thread name, start, end), appended to from any thread.
+
+
+    def step(self, name):
+        """Records the end of step name, which started at the end of the previous step."""
+        now = time.perf_counter()
+        self._steps_ms[name] = self._steps_ms.get(name, 0) + (now - self._last) * 1e3
+        self._spans.append((name, threading.current_thread().name, self._last, now))
+        self._last = now
+
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Context manager recording the time spent in its body as span name, from any thread."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._spans.append((name, threading.current_thread().name, start, time.perf_counter()))
+
+
+    def summary(self):
+        """Returns a table of the duration of each step, and of the total compared to the target."""
+        total_ms = self.total_ms
+        lines = [f"{'startup step':<20} {'ms':>8} {'share':>7}"]
+        for name, duration_ms in self._steps_ms.items():
+            lines.append(f"{name:<20} {duration_ms:>8.1f} {duration_ms / max(total_ms, 1e-9):>7.2%}")
+
+        verdict = 'within' if total_ms <= self._target_ms else 'over'
+        lines.append(f"{'total':<20} {total_ms:>8.1f}   ({verdict} the target of {self._target_ms} ms)")
+        return '\n'.join(lines)
+
+
+    def dump_trace(self, path):
+        """Writes the steps and spans recorded to path, in the JSON format of Chrome traces, with one track per thread."""
+        events = [{'name': name, 'ph': 'X', 'pid': 0, 'tid': thread, 'ts': (start - self._start) * 1e6, 'dur': (end - start) * 1e6}
+                  for name, thread, start, end in list(self._spans)]
+
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file, indent = 4)
+
+
+    steps_ms = property(lambda self: dict(self._steps_ms))
+    total_ms = property(lambda self: (self._last - self._start) * 1e3)
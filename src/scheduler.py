@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+from collections import deque
+
+
+class FixedTimestepScheduler:
+    """Class FixedTimestepScheduler. Converts the irregular intervals at which the window is updated into a whole number of
+    game ticks of fixed duration. After a stall, at most max_catch_up_ticks ticks are run at once: the remaining time is dropped,
+    slowing the game down for an instant instead of running a burst of ticks that would make the next update late as well."""
+
+    def __init__(self, tick_interval, max_catch_up_ticks):
+        """Constructor for the class FixedTimestepScheduler."""
+        self._tick_interval = tick_interval
+        self._max_catch_up_ticks = max_catch_up_ticks
+
+        self._residual_interval = 0
+        self._dropped_ticks = 0
+
+
+    def advance(self, dt):
+        """Accumulates dt seconds, and returns a list with one element per game tick to run now: how late (in seconds) that tick is."""
+        self._residual_interval += dt
+
+        latenesses = []
+        while self._residual_interval >= self._tick_interval:
+            self._residual_interval -= self._tick_interval
+
+            if len(latenesses) < self._max_catch_up_ticks:
+                latenesses.append(self._residual_interval)
+            else:
+                self._dropped_ticks += 1
+
+        return latenesses
+
+
+    # Defining properties for some private attributes.
+    # interpolation is the fraction of tick elapsed since the last tick, to draw characters between their last two positions.
+    interpolation = property(lambda self: self._residual_interval / self._tick_interval)
+    dropped_ticks = property(lambda self: self._dropped_ticks)
+
+
+
+
+class FrameTimings:
+    """Class FrameTimings. Rolling statistics of the time taken by game ticks and by drawing, and of the lateness of game ticks,
+    over the last n_samples samples of each. Times are added in seconds, and reported in milliseconds."""
+
+    METRICS = ('tick', 'draw', 'lateness')
+
+    def __init__(self, n_samples, bin_width_ms, n_bins):
+        """Constructor for the class FrameTimings. Histograms have n_bins bins of bin_width_ms milliseconds, the last one also
+        counting all larger values."""
+        self._samples = {metric: deque(maxlen = n_samples) for metric in FrameTimings.METRICS}
+        self._bin_width_ms = bin_width_ms
+        self._n_bins = n_bins
+
+
+    def add_tick(self, duration, lateness):
+        self._samples['tick']    .append(duration * 1000)
+        self._samples['lateness'].append(lateness * 1000)
+
+    def add_draw(self, duration):
+        self._samples['draw'].append(duration * 1000)
+
+
+    def histogram(self, metric):
+        """Returns the number of samples of metric falling in each bin."""
+        counts = [0] * self._n_bins
+        for value in self._samples[metric]:
+            counts[min(int(value // self._bin_width_ms), self._n_bins - 1)] += 1
+
+        return counts
+
+
+    def summary(self, metric):
+        """Returns a dictionary with the number of samples of metric, their mean, median, 99th percentile and maximum."""
+        values = sorted(self._samples[metric])
+        if not values:
+            return {'samples': 0, 'mean': 0, 'p50': 0, 'p99': 0, 'max': 0}
+
+        percentile = lambda fraction: values[min(int(fraction * len(values)), len(values) - 1)]
+        return {'samples': len(values), 'mean': sum(values) / len(values), 'p50': percentile(0.5), 'p99': percentile(0.99), 'max': values[-1]}
+
+
+    def overlay_text(self, dropped_ticks):
+        """Returns a few lines of text summarising the statistics, to display them on screen."""
+        lines = []
+        for metric in FrameTimings.METRICS:
+            summary = self.summary(metric)
+            lines.append(f"{metric:<8} p50 {summary['p50']:5.2f}  p99 {summary['p99']:5.2f}  max {summary['max']:6.2f} ms")
+        lines.append(f"dropped ticks {dropped_ticks}")
+
+        return '\n'.join(lines)
+
+
+    def dump_json(self, path, dropped_ticks):
+        """Writes summaries and histograms of all metrics to a JSON file."""
+        data = {'bin_width_ms': self._bin_width_ms,
+                'dropped_ticks': dropped_ticks,
+                'metrics': {metric: {**self.summary(metric), 'histogram': self.histogram(metric)} for metric in FrameTimings.METRICS}}
+
+        with open(path, 'w') as file:
+            json.dump(data, file, indent = 4)
+
+
+    def dump_csv(self, path):
+        """Writes the histograms of all metrics to a CSV file, with one row per bin."""
+        histograms = [self.histogram(metric) for metric in FrameTimings.METRICS]
+
+        with open(path, 'w', newline = '') as file:
+            writer = csv.writer(file)
+            writer.writerow(['bin_start_ms', *FrameTimings.METRICS])
+            for idx, counts in enumerate(zip(*histograms)):
+                writer.writerow([idx * self._bin_width_ms, *counts])
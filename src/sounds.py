@@ -1,110 +1,132 @@
 # -*- coding: utf-8 -*-
 
-import pyglet.media
+import wave
+from concurrent.futures import (Future,
+                                ThreadPoolExecutor)
 
-from src.constants import (SoundEffects,
+import pyglet
+
+from src import asset_pack
+from src.audio_mixer import (AudioMixer,
+                             convert_pcm)
+from src.constants import (AudioEvents,
+                           SoundEffects,
                            SOUND_EFFECTS_PATHS,
-                           THR_PELLETS_SIREN_SOUNDS)
+                           SOUNDS_DECODING_THREADS,
+                           SOUNDS_LAZY_EFFECTS,
+                           SOUNDS_SAMPLE_RATE,
+                           SOUNDS_N_VOICES,
+                           SOUNDS_LATENCY_TICKS,
+                           GAME_ORIGINAL_UPDATES_INTERVAL)
+
+
+# Voices of the mixer: one for sirens and other looping effects, one for munch sounds, and the others for all remaining effects.
+_VOICE_LOOP  = 0
+_VOICE_MUNCH = 1
+_VOICES_ONCE = range(2, SOUNDS_N_VOICES)
 
 
 
 class Sounds:
+    """Class Sounds. Plays the audio events of an AudioEventBus (see src/audio_events.py), passed to play_event, by mixing the
+    sound effects into a single stream. When live, the stream is played by a pyglet Player as the game runs. Otherwise, it is
+    only mixed when requested with mix, e.g. to write it to a file with render_wav, and no audio device is used."""
     
-    def __init__(self):
-        self._effects = {k: pyglet.media.load(v, streaming = False) for k, v in SOUND_EFFECTS_PATHS.items()}
+    def __init__(self, startup_timings = None, live = True):
+        # Effects are decoded in background threads, so that the rest of the game starts meanwhile. This includes importing
+        # pyglet.media, which loads the audio libraries and takes longer than decoding. Rarely played effects are decoded when
+        # first played instead. Each effect is either a Future until it is first played, or its samples.
+        self._startup_timings = startup_timings
+        executor = ThreadPoolExecutor(SOUNDS_DECODING_THREADS, thread_name_prefix = 'Sounds')
+        self._effects = {k: executor.submit(self._load_effect, k) for k in SOUND_EFFECTS_PATHS if k not in SOUNDS_LAZY_EFFECTS}
+        executor.shutdown(wait = False)
+
+        # All effects are mixed into a single stream. When not live, the stream is mixed in step with the game ticks, without latency.
+        latency_ticks = SOUNDS_LATENCY_TICKS if live else 0
+        self._mixer = AudioMixer(SOUNDS_N_VOICES, SOUNDS_SAMPLE_RATE, GAME_ORIGINAL_UPDATES_INTERVAL, latency_ticks)
         
-        self._player_single = pyglet.media.Player()
-        self._player_loop   = pyglet.media.Player()
-        self._player_loop.loop = True
+        # The player is created when first needed, as it opens the audio driver.
+        self._live = live
+        self._player = None
 
-        self._munch_counter = 0
-        self._current_player_loop_sound = None
 
-    
-    def stop(self, only_sirens = False):
-        self._current_player_loop_sound = None
+    def _load_effect(self, key):
+        if self._startup_timings is None:
+            return self._decode_effect(key)
 
-        players_to_stop = [self._player_loop]
+        with self._startup_timings.span(f'decode {key.name.lower()}'):
+            return self._decode_effect(key)
 
-        if not only_sirens:
-            players_to_stop.append(self._player_single)
 
-        for player in self._player_single, self._player_loop:
-            player.pause()
+    @staticmethod
+    def _decode_effect(key):
+        sound = asset_pack.load_sound(SOUND_EFFECTS_PATHS[key])
+        return convert_pcm(asset_pack.read_pcm(sound), sound.audio_format, SOUNDS_SAMPLE_RATE)
 
-            # Clear queued sources.
-            source = not None
-            while source is not None:
-                player.next_source()
-                source = player.source
 
+    def _get_effect(self, key):
+        # Waits for the effect to be decoded by the background threads, or decodes it now if it is not decoded in background.
+        effect = self._effects.get(key)
+        if effect is None:
+            effect = self._load_effect(key)
+        elif isinstance(effect, Future):
+            effect = effect.result()
 
-    def _play_once(self, key):
-        if key is SoundEffects.EXTRA_LIFE:
-            self._effects[key].play()
-            return
-        
-        self._player_single.queue(self._effects[key])
-        self._player_single.play()
+        self._effects[key] = effect
+        return effect
 
 
-    def _play_repeat(self, key):
-        # Check if already playing.
-        if key == self._current_player_loop_sound:
+    def _create_player(self):
+        if self._player is not None or not self._live:
             return
 
-        self.stop(only_sirens = True)
-        self._player_loop.queue(self._effects[key])
-        self._player_loop.play()
-        self._current_player_loop_sound = key
-
-
-    def notify_pellet_eaten(self):
-        key = SoundEffects.MUNCH_2 if self._munch_counter % 2 else SoundEffects.MUNCH_1
-        self._munch_counter += 1
+        self._player = pyglet.media.Player()
+        self._player.queue(self._mixer.create_source())
+        self._player.play()
 
-        self._play_once(key)
 
+    def play_event(self, tick, event, effect):
+        """Plays the audio event (tick, event, effect) of an AudioEventBus."""
+        self._create_player()
 
-    def notify_fruit_eaten(self):
-        self._play_once(SoundEffects.EAT_FRUIT)
+        match event:
+            case AudioEvents.PLAY:
+                voices = [_VOICE_MUNCH] if effect in (SoundEffects.MUNCH_1, SoundEffects.MUNCH_2) else _VOICES_ONCE
+                self._mixer.play(self._get_effect(effect), voices, tick)
+            case AudioEvents.PLAY_LOOP:
+                # Replaces the effect played by the voice.
+                self._mixer.play(self._get_effect(effect), [_VOICE_LOOP], tick, loop = True)
+            case AudioEvents.STOP_LOOP:
+                self._mixer.stop([_VOICE_LOOP], tick)
+            case AudioEvents.STOP_ALL:
+                self._mixer.stop(range(SOUNDS_N_VOICES), tick)
 
 
-    def notify_ghost_eaten(self):
-        self._play_once(SoundEffects.EAT_GHOST)
+    def mix(self, n_samples):
+        """Returns the next n_samples samples of the stream, as bytes of mono 16 bits samples at SOUNDS_SAMPLE_RATE. Only for
+        instances which are not live, whose stream is otherwise never mixed."""
+        return self._mixer.mix(n_samples)
 
-    
-    def notify_extra_life(self):
-        self._play_once(SoundEffects.EXTRA_LIFE)
-
-
-    def notify_life_lost(self):
-        self._play_once(SoundEffects.LIFE_LOST)
-
-
-    def notify_first_welcome(self):
-        self._play_once(SoundEffects.GAME_START_MUSIC)
-
-    
-    def notify_intermission(self):
-        self._play_repeat(SoundEffects.INTERMISSION_MUSIC)
 
 
-    def notify_game_completed(self):
-        self._play_once(SoundEffects.GAME_COMPLETED)
 
+def render_wav(path, timeline, n_ticks):
+    """Writes to path as a WAV file the audio of the first n_ticks game ticks of a game, from the timeline of its audio events
+    recorded by an AudioEventBus. Ticks are mixed one after the other as fast as possible, and effects start at the exact sample
+    of the tick playing them."""
+    sounds = Sounds(live = False)
+    samples_per_tick = SOUNDS_SAMPLE_RATE * GAME_ORIGINAL_UPDATES_INTERVAL
 
-    def queue_correct_siren(self, n_pellets, fright_on, any_ghost_retreating):
-        expected_siren = None
+    with wave.open(path, 'wb') as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(SOUNDS_SAMPLE_RATE)
 
-        if any_ghost_retreating:
-            expected_siren = SoundEffects.GHOST_RETREATING
-        elif fright_on:
-            expected_siren = SoundEffects.FRIGHT_ON
-        else:
-            for siren_source, threshold in THR_PELLETS_SIREN_SOUNDS:
-                if n_pellets <= threshold:
-                    expected_siren = siren_source
-                    break
+        events = iter(timeline)
+        event = next(events, None)
+        for tick in range(n_ticks):
+            while event is not None and event[0] <= tick:
+                sounds.play_event(*event)
+                event = next(events, None)
 
-        self._play_repeat(expected_siren)
\ No newline at end of file
+            file.writeframes(sounds.mix(round((tick + 1) * samples_per_tick) - round(tick * samples_per_tick)))
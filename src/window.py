@@ -1,5 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import os
+import time
+import random
+from datetime import datetime
+
 import pyglet
 
 from src.activities.menu import Menu
@@ -7,7 +12,14 @@ from src.activities.game import Game
 from src.activities.game_completed import GameCompleted
 from src.activities.intermission import Intermission
 from src.graphics import Graphics
+from src.graphics import utils
 from src.sounds import Sounds
+from src.audio_events import AudioEventBus
+from src import asset_pack
+from src.engine.replay import ReplayWriter
+from src.profiling import StartupTimings
+from src.scheduler import (FixedTimestepScheduler,
+                           FrameTimings)
 from src.constants import (WINDOW_INIT_KWARGS,
                            WINDOW_MINIMUM_SIZE,
                            GAME_TENTATIVE_UPDATES_INTERVAL,
@@ -17,32 +29,60 @@ from src.constants import (WINDOW_INIT_KWARGS,
                            LAYOUT_PX_PER_UNIT_LENGHT,
                            LAYOUT_N_ROWS_TILES,
                            LAYOUT_N_COLS_TILES,
-                           GAME_COMPLETED_LEVEL)
+                           GAME_COMPLETED_LEVEL,
+                           REPLAYS_DIRECTORY,
+                           REPLAY_FILE_EXTENSION,
+                           GAME_MAX_CATCH_UP_UPDATES,
+                           GAME_RENDER_INTERPOLATION,
+                           FRAME_TIMINGS_N_SAMPLES,
+                           FRAME_TIMINGS_BIN_WIDTH_MS,
+                           FRAME_TIMINGS_N_BINS)
 
 
 class Window(pyglet.window.Window):
-    def __init__(self):
+    def __init__(self, startup_timings = None, record_replays = False):
+        # Steps of startup are timed until the first frame is drawn.
+        self._startup_timings = startup_timings if startup_timings is not None else StartupTimings()
+
         super().__init__(**WINDOW_INIT_KWARGS, visible = False)
+        self._startup_timings.step('window')
 
         self.set_minimum_size(*WINDOW_MINIMUM_SIZE)
 
-        icon = pyglet.image.load(WINDOW_ICON_PATH)
+        icon = asset_pack.load_image(WINDOW_ICON_PATH)
         self.set_icon(icon)
+        self._startup_timings.step('icon')
         
         # Set background color.
         pyglet.gl.glClearColor(*BACKGROUND_COLOR, 1)
         self._first_time_drawing = True
 
+        # Sound effects are decoded in background threads meanwhile the graphics are created and the first frame is drawn,
+        # as the menu only needs the graphics.
+        self._sounds   = Sounds(self._startup_timings)
+        self._startup_timings.step('sounds')
+
+        # Activities emit audio events on a bus, played live by Sounds.
+        self._audio_events = AudioEventBus()
+        self._audio_events.add_listener(self._sounds.play_event)
+
         self._graphics = Graphics()
-        self._sounds   = Sounds()
+        self._startup_timings.step('graphics')
 
-        self._current_activity = Menu(self._graphics, self._sounds)
+        self._current_activity = Menu(self._graphics, self._audio_events)
+        self._startup_timings.step('menu')
         self._backup_activity = None # Used only to store Game activity during intermissions.
+        self._record_replays = record_replays
+        self._replay_writer = None   # Records the game being played, if any.
 
         # FPS locked to screen refresh rate (vsync enabled).
         # Number of updates per second can be freely chosen though.
         pyglet.clock.schedule_interval(self.on_state_update, GAME_TENTATIVE_UPDATES_INTERVAL)
-        self._residual_update_interval = 0
+        self._scheduler = FixedTimestepScheduler(GAME_ORIGINAL_UPDATES_INTERVAL, GAME_MAX_CATCH_UP_UPDATES)
+
+        # Timings of updates and draws, shown on screen with F3 and written to disk with F4.
+        self._frame_timings = FrameTimings(FRAME_TIMINGS_N_SAMPLES, FRAME_TIMINGS_BIN_WIDTH_MS, FRAME_TIMINGS_N_BINS)
+        self._frame_timings_label = None
 
         
     def on_resize(self, width, height):
@@ -57,13 +97,25 @@ class Window(pyglet.window.Window):
         pad_y = (height - viewport_height) / 2
 
         self.viewport = (pad_x, pad_y, viewport_width, viewport_height)
-        
+
+        # Text drawn by pyglet (frame timings overlay) is placed in pixels of the original layout, as the game.
+        self.projection = pyglet.math.Mat4.orthogonal_projection(0, desired_width, 0, desired_height, -255, 255)
+
         return pyglet.event.EVENT_HANDLED   # Don't call the default handler
 
 
     def on_key_press(self, symbol, modifiers):
         self._current_activity.event_key_pressed(symbol, modifiers)
 
+        if symbol == pyglet.window.key.F3:
+            self._toggle_frame_timings_overlay()
+        elif symbol == pyglet.window.key.F4:
+            self._dump_frame_timings()
+
+        # Record directions requested to the game, so that it can be replayed.
+        if self._replay_writer is not None and isinstance(self._current_activity, Game) and symbol in Game.KEY_DIRECTIONS:
+            self._replay_writer.request_direction(Game.KEY_DIRECTIONS[symbol])
+
         # ------------------------------
         # DEBUG: slow down pacman
         # ------------------------------
@@ -75,6 +127,10 @@ class Window(pyglet.window.Window):
                 self._original_speed = float(const.REFERENCE_SPEED)
             const.REFERENCE_SPEED = self._original_speed if const.REFERENCE_SPEED < self._original_speed else self._original_speed * 0.1
 
+            # Speeds are baked in the profile of each level: build them again with the new reference speed.
+            from src.game_objects.level_profile import clear_level_caches
+            clear_level_caches()
+
         # ------------------------------
 
         # --------------------------------------
@@ -97,12 +153,13 @@ class Window(pyglet.window.Window):
         from src.constants import MazeTiles
 
         if isinstance(self._current_activity, Game):
+            simulation = self._current_activity.simulation
             if symbol == key._1:
-                self._current_activity._pellet_eaten(MazeTiles.POWER_PELLET)
+                simulation._pellet_eaten(MazeTiles.POWER_PELLET)
             if symbol == key._2:
-                self._current_activity._level += 1
+                simulation._level += 1
             if symbol == key._3:
-                self._current_activity._maze._n_pellets = 0
+                simulation._maze._n_pellets = 0
 
         # --------------------------------------
 
@@ -121,17 +178,24 @@ class Window(pyglet.window.Window):
 
 
         # Force updates to happen with the same frame-rate as in the original game.
-        self._residual_update_interval += dt
-
-        while self._residual_update_interval >= GAME_ORIGINAL_UPDATES_INTERVAL:
-            self._residual_update_interval -= GAME_ORIGINAL_UPDATES_INTERVAL
-
+        for lateness in self._scheduler.advance(dt):
+            start = time.perf_counter()
             self.on_state_update_step()
+            self._frame_timings.add_tick(time.perf_counter() - start, lateness)
 
 
 
     def on_state_update_step(self):
-        
+        # Audio events emitted during the tick are stamped with it, so the bus moves on to the next tick once the activity is updated,
+        # including for single ticks run from the debug keys.
+        self._update_activity()
+        self._audio_events.notify_tick()
+
+
+    def _update_activity(self):
+        if self._replay_writer is not None and isinstance(self._current_activity, Game):
+            self._replay_writer.tick()
+
         retval = self._current_activity.event_update_state()
 
         if retval is False:
@@ -141,44 +205,103 @@ class Window(pyglet.window.Window):
 
         if isinstance(self._current_activity, Menu):
             # retval is True if we need to change from Menu to Game.
-            self._current_activity = Game(self._graphics, self._sounds)
+            self._current_activity = self._start_game()
 
         elif isinstance(self._current_activity, Game):
             if retval is True:
                 # retval is True if we need to change from Game to Menu.
-                self._current_activity = Menu(self._graphics, self._sounds)
+                self._stop_recording(self._current_activity.simulation)
+                self._current_activity = Menu(self._graphics, self._audio_events)
             # retval is an integer representing the game level.
             elif retval == GAME_COMPLETED_LEVEL:
-                self._current_activity = GameCompleted(self._graphics, self._sounds, **retval_destruction)
+                self._stop_recording(self._current_activity.simulation)
+                self._current_activity = GameCompleted(self._graphics, self._audio_events, **retval_destruction)
             # It must be time for an intermission.
             else:
                 self._backup_activity  = self._current_activity
-                self._current_activity = Intermission(self._graphics, self._sounds, retval)
+                self._current_activity = Intermission(self._graphics, self._audio_events, retval)
 
         elif isinstance(self._current_activity, Intermission):
             self._current_activity = self._backup_activity
             self._backup_activity  = None
 
         elif isinstance(self._current_activity, GameCompleted):
-            self._current_activity = Menu(self._graphics, self._sounds)
+            self._current_activity = Menu(self._graphics, self._audio_events)
+
+
+    def _start_game(self):
+        # Each game gets its own seed, so that it can be recorded and replayed exactly.
+        seed = random.getrandbits(64)
+        game = Game(self._graphics, self._audio_events, seed = seed)
+        if not self._record_replays:
+            return game
+
+        os.makedirs(REPLAYS_DIRECTORY, exist_ok = True)
+        path = os.path.join(REPLAYS_DIRECTORY, datetime.now().strftime("%Y-%m-%d %Hh%Mm%S") + REPLAY_FILE_EXTENSION)
+        self._replay_writer = ReplayWriter(path, seed, game.simulation.level, game.simulation.fixed_point_movement)
+
+        return game
+
+
+    def _stop_recording(self, simulation = None):
+        # The final result is only stored if the game ended, so that replays can be verified against it.
+        if self._replay_writer is None:
+            return
+
+        if simulation is not None:
+            self._replay_writer.close(simulation.score.score, simulation.level)
+        else:
+            self._replay_writer.close()
+        self._replay_writer = None
+
+
+    def on_close(self):
+        self._stop_recording()
+        super().on_close()
 
         
     def on_draw(self):
         if self._first_time_drawing:
             self.set_visible(True)
             self._first_time_drawing = False
-        
+
+        start = time.perf_counter()
+
         self.clear()
-        self._current_activity.event_draw_screen()
+        self._current_activity.event_draw_screen(self._scheduler.interpolation if GAME_RENDER_INTERPOLATION else 1)
+
+        if self._frame_timings_label is not None:
+            self._draw_frame_timings_overlay()
+
+        self._frame_timings.add_draw(time.perf_counter() - start)
+
+        if self._startup_timings is not None:
+            self._startup_timings.step('first frame')
+            self._startup_timings = None
+
+
+    def _toggle_frame_timings_overlay(self):
+        if self._frame_timings_label is not None:
+            self._frame_timings_label = None
+            return
+
+        self._frame_timings_label = pyglet.text.Label('', x = 1, y = LAYOUT_N_ROWS_TILES * LAYOUT_PX_PER_UNIT_LENGHT - 1, anchor_y = 'top',
+                                                      width = LAYOUT_N_COLS_TILES * LAYOUT_PX_PER_UNIT_LENGHT, multiline = True,
+                                                      font_size = 5, color = (255, 0, 0, 255))
+        self._frame_timings_label_age = 0
+
+
+    def _draw_frame_timings_overlay(self):
+        # Refreshing the text is expensive, so it is only done a few times per second.
+        if self._frame_timings_label_age % 15 == 0:
+            self._frame_timings_label.text = self._frame_timings.overlay_text(self._scheduler.dropped_ticks)
+        self._frame_timings_label_age += 1
 
+        self._frame_timings_label.draw()
+        utils.enable_transparency_blit() # Restore blending state changed by pyglet.
 
-        return
-        # -------- DEBUG: FPS DISPLAY ----------
-        if not hasattr(self, 'fps_display'):
-            self.fps_display = pyglet.window.FPSDisplay(window=self)
-            self.fps_display.label = pyglet.text.Label('', x=185, y=285, font_size=12, weight=True, color = (255, 0, 0, 255))
 
-        self.fps_display.draw()
-        from src.graphics import utils
-        utils.enable_transparency_blit()
-        # ---------------------------------------
+    def _dump_frame_timings(self):
+        dt = datetime.now().strftime("%Y-%m-%d %Hh%Mm%S")
+        self._frame_timings.dump_json(f'./Frame Timings {dt}.json', self._scheduler.dropped_ticks)
+        self._frame_timings.dump_csv (f'./Frame Timings {dt}.csv')